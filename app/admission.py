@@ -0,0 +1,186 @@
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import Metrics, metrics
+
+Waiter = Tuple[asyncio.AbstractEventLoop, asyncio.Future]
+
+
+def _grant(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+# Caps how many requests run at once. Up to max_queue more wait in FIFO order, each for at most
+# queue_timeout; anything beyond that is refused straight away. A released slot is handed directly to
+# the oldest waiter, so a newly arriving request cannot overtake the queue.
+class ConcurrencyLimiter:
+    def __init__(
+        self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float, registry: Metrics = metrics
+    ):
+        self.name = name
+        self.registry = registry
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[Waiter] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        # True once the caller holds a slot (it must call release), False if it should be shed
+        with self._lock:
+            if self.active < self.max_concurrent and not self._waiters:
+                self.active += 1
+                return True
+            if len(self._waiters) >= self.max_queue:
+                return False
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        self.registry.increment("admission_queued", self.name)
+
+        try:
+            await asyncio.wait_for(waiter[1], self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            # Still queued means the wait really timed out; otherwise a slot was handed over just now
+            return not self._withdraw(waiter)
+        except asyncio.CancelledError:
+            if not self._withdraw(waiter):
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if not loop.is_closed():
+                    # The slot passes to the waiter as is, so active does not change
+                    loop.call_soon_threadsafe(_grant, future)
+                    return
+            self.active -= 1
+
+    def _withdraw(self, waiter: Waiter) -> bool:
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return True
+            except ValueError:
+                return False
+
+
+# Per-client token buckets: each client may burst up to `burst` requests and then gets `rate` more per
+# second. Only the max_clients most recently seen clients are tracked.
+class TokenBucketLimiter:
+    def __init__(
+        self,
+        rate: float = settings.RATE_LIMIT_PER_SECOND,
+        burst: int = settings.RATE_LIMIT_BURST,
+        max_clients: int = settings.RATE_LIMIT_MAX_CLIENTS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> float:
+        # 0 if the request may proceed, otherwise the seconds until the client's next token
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            self._buckets[client] = (tokens - 1 if not wait else tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            return wait
+
+
+def default_limiters() -> Dict[str, ConcurrencyLimiter]:
+    return {
+        prefix: ConcurrencyLimiter(
+            prefix, max_concurrent, settings.ADMISSION_QUEUE_DEPTH, settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        )
+        for prefix, max_concurrent in (
+            ("/overview", settings.ADMISSION_OVERVIEW_CONCURRENCY),
+            ("/standings", settings.ADMISSION_STANDINGS_CONCURRENCY),
+        )
+    }
+
+
+# Guards the expensive aggregate routes so a spike on them cannot take every database connection from
+# the cheap lookups. Each guarded route prefix has its own ConcurrencyLimiter; a request that cannot get
+# a slot is shed with 503 and Retry-After. With a rate limiter, clients over their budget on those routes
+# get 429. Other routes are not affected.
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: Optional[Dict[str, ConcurrencyLimiter]] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+        retry_after: int = settings.ADMISSION_RETRY_AFTER_SECONDS,
+        registry: Metrics = metrics,
+    ):
+        self.app = app
+        self.limiters = default_limiters() if limiters is None else limiters
+        self.rate_limiter = rate_limiter
+        self.retry_after = retry_after
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = self._limiter_for(scope["path"]) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire(self._client(scope))
+            if wait:
+                self.registry.increment("admission_rate_limited", limiter.name)
+                await self._reject(send, 429, "Rate limit exceeded", math.ceil(wait))
+                return
+
+        if not await limiter.acquire():
+            self.registry.increment("admission_shed", limiter.name)
+            await self._reject(send, 503, "Server is busy, retry later", self.retry_after)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    def _limiter_for(self, path: str) -> Optional[ConcurrencyLimiter]:
+        for prefix, limiter in self.limiters.items():
+            if path == prefix or path.startswith(prefix + "/"):
+                return limiter
+        return None
+
+    @staticmethod
+    def _client(scope: Scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else ""
+
+    @staticmethod
+    async def _reject(send: Send, status: int, detail: str, retry_after: int) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(retry_after, 1)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
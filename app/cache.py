@@ -0,0 +1,134 @@
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from app.config import settings
+
+# A tag is either (table,) for results derived from the whole table or (table, row_id) for a single row
+Tag = Tuple[Hashable, ...]
+
+
+class ResultCache:
+    def __init__(self, ttl: float = settings.CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[Any, float, Tuple[Tag, ...]]] = {}
+        self._tags: Dict[Tag, Set[Hashable]] = {}
+        # Bumped by every invalidation, so a loader that ran across one does not store its stale result.
+        # (table,) counts whole-table changes, (table, "*") changes to any of its rows, (table, row_id)
+        # changes to that row; _epoch counts clears.
+        self._generations: Dict[Tag, int] = {}
+        self._epoch = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._delete(key)
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Tag] = (), ttl: Optional[float] = None) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._delete(key)
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl), tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def get_or_set(
+        self, key: Hashable, loader: Callable[[], Any], tags: Iterable[Tag] = (), ttl: Optional[float] = None
+    ) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            tags = tuple(tags)
+            generation = self.generation(tags)
+            value = loader()
+            self.set_if_current(key, value, tags, generation, ttl)
+        return value
+
+    async def get_or_set_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]], tags: Iterable[Tag] = ()):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            tags = tuple(tags)
+            generation = self.generation(tags)
+            value = await loader()
+            self.set_if_current(key, value, tags, generation)
+        return value
+
+    def generation(self, tags: Iterable[Tag]) -> Tuple[int, ...]:
+        # Everything whose invalidation would drop an entry with these tags; take it before loading a
+        # value and pass it to set_if_current afterwards
+        with self._lock:
+            generation = [self._epoch]
+            for tag in tags:
+                table = tag[0]
+                generation.append(self._generations.get((table,), 0))
+                generation.append(self._generations.get((table, "*") if len(tag) == 1 else tag, 0))
+            return tuple(generation)
+
+    def set_if_current(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[Tag],
+        generation: Tuple[int, ...],
+        ttl: Optional[float] = None,
+    ) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            if self.generation(tags) == generation:
+                self.set(key, value, tags, ttl)
+
+    def invalidate(self, table: str, row_id: Optional[int] = None) -> None:
+        with self._lock:
+            if row_id is None:
+                # Whole-table change: drop every entry tagged with the table or any of its rows
+                tags = [tag for tag in self._tags if tag[0] == table]
+                self._bump((table,))
+            else:
+                tags = [(table,), (table, row_id)]
+                self._bump((table, "*"))
+                self._bump((table, row_id))
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def handle_change(self, change: Dict) -> None:
+        table = change.get("table")
+        if table == "*":
+            self.clear()
+        elif table:
+            self.invalidate(table, change.get("id"))
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    def _bump(self, tag: Tag) -> None:
+        self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def _delete(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+_MISSING = object()
+
+result_cache = ResultCache()
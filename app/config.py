@@ -13,5 +13,91 @@ class Settings:
         "http://127.0.0.1:3000",
     ]
 
+    # Change notifications: "listen" (LISTEN/NOTIFY), "poll" (change_versions polling) or "off"
+    CHANGE_NOTIFICATION_MODE: str = os.getenv("CHANGE_NOTIFICATION_MODE", "listen").lower()
+    CHANGE_POLL_INTERVAL_SECONDS: float = float(os.getenv("CHANGE_POLL_INTERVAL_SECONDS", "2"))
+    CHANGE_RECONNECT_MAX_SECONDS: float = float(os.getenv("CHANGE_RECONNECT_MAX_SECONDS", "30"))
+
+    # In-process result cache; the TTL only bounds staleness when no notifications arrive
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+    # Tournament formats change rarely, so they are kept longer
+    FORMAT_CACHE_TTL_SECONDS: float = float(os.getenv("FORMAT_CACHE_TTL_SECONDS", "3600"))
+
+    # Tournament served when a request does not name one
+    DEFAULT_TOURNAMENT_ID: int = int(os.getenv("DEFAULT_TOURNAMENT_ID", "1"))
+
+    # Read replica (POSTGRES_REPLICA_HOST): reads fall back to the primary while the replica is further
+    # behind than REPLICA_MAX_LAG_SECONDS, and a client is pinned to the primary for REPLICA_PIN_SECONDS
+    # after its own write
+    REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "2"))
+    REPLICA_LAG_CHECK_SECONDS: float = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "1"))
+    REPLICA_PIN_SECONDS: int = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+    REPLICA_POOL_SIZE: int = int(os.getenv("REPLICA_POOL_SIZE", "10"))
+
+    # Response compression (brotli is used when the package is installed and the client accepts it)
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Elo ratings
+    RATING_INITIAL: float = float(os.getenv("RATING_INITIAL", "1500"))
+    RATING_K_FACTOR: float = float(os.getenv("RATING_K_FACTOR", "32"))
+
+    # Match event replay: a snapshot of the replay state is stored every EVENT_SNAPSHOT_INTERVAL events
+    EVENT_SNAPSHOT_INTERVAL: int = int(os.getenv("EVENT_SNAPSHOT_INTERVAL", "1000"))
+    EVENT_STREAM_BATCH_SIZE: int = int(os.getenv("EVENT_STREAM_BATCH_SIZE", "2000"))
+
+    # Idempotency-Key handling for retried writes: how long a stored response is replayed, and how many are kept
+    IDEMPOTENCY_TTL_SECONDS: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_MAX_KEYS: int = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+    # How long a duplicate waits for the first request with its key before getting a 409
+    IDEMPOTENCY_WAIT_SECONDS: float = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+
+    # Admission control for the aggregate endpoints: concurrent requests per route, how many more may queue
+    # and for how long, before requests are shed with 503. RATE_LIMIT_PER_SECOND > 0 also rate limits each
+    # client on those routes with a token bucket of RATE_LIMIT_BURST tokens.
+    ADMISSION_OVERVIEW_CONCURRENCY: int = int(os.getenv("ADMISSION_OVERVIEW_CONCURRENCY", "4"))
+    ADMISSION_STANDINGS_CONCURRENCY: int = int(os.getenv("ADMISSION_STANDINGS_CONCURRENCY", "4"))
+    ADMISSION_QUEUE_DEPTH: int = int(os.getenv("ADMISSION_QUEUE_DEPTH", "16"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2"))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+    RATE_LIMIT_PER_SECOND: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "10"))
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+
+    # Request profiling (needs pyinstrument). With PROFILING_ENABLED, a request with an X-Profile header or
+    # ?profile=1 is sampled every PROFILING_INTERVAL_SECONDS and answered with its speedscope profile, or
+    # with PROFILING_OUTPUT_DIR set, the profile is written there instead. PROFILING_SAMPLE_RATE of all other
+    # requests are profiled too, only into the per-route aggregates served by /metrics/profiles.
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+    PROFILING_INTERVAL_SECONDS: float = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.001"))
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_OUTPUT_DIR: str = os.getenv("PROFILING_OUTPUT_DIR", "")
+    # Sampled requests kept per route for its aggregate profile; older ones are dropped
+    PROFILING_SESSIONS_PER_ROUTE: int = int(os.getenv("PROFILING_SESSIONS_PER_ROUTE", "50"))
+
+    # Player search (/players/search): "trigram" (pg_trgm in the database), "prefix" (the in-process player
+    # directory) or "auto", which uses pg_trgm until a search finds the extension missing
+    PLAYER_SEARCH_BACKEND: str = os.getenv("PLAYER_SEARCH_BACKEND", "auto").lower()
+    PLAYER_SEARCH_LIMIT: int = int(os.getenv("PLAYER_SEARCH_LIMIT", "20"))
+
+    # Most ids one batched lookup (GET /matches?ids=..., GET /players?ids=...) may ask for
+    BATCH_MAX_IDS: int = int(os.getenv("BATCH_MAX_IDS", "100"))
+
+    # Tournament predictions (Monte Carlo)
+    PREDICTION_ITERATIONS: int = int(os.getenv("PREDICTION_ITERATIONS", "20000"))
+    PREDICTION_WORKERS: int = int(os.getenv("PREDICTION_WORKERS", "1"))
+    PREDICTION_QUALIFIERS: int = int(os.getenv("PREDICTION_QUALIFIERS", "4"))
+    # Iterations simulated per batch of arrays; bounds each worker's memory to about this many rows
+    PREDICTION_CHUNK_SIZE: int = int(os.getenv("PREDICTION_CHUNK_SIZE", "1000"))
+
+    # Live updates (Server-Sent Events)
+    LIVE_HEARTBEAT_SECONDS: float = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+    LIVE_QUEUE_SIZE: int = int(os.getenv("LIVE_QUEUE_SIZE", "100"))
+    # Changes arriving within this window are published together, with one standings recompute
+    LIVE_BATCH_SECONDS: float = float(os.getenv("LIVE_BATCH_SECONDS", "0.1"))
+    # A batch touching more matches than this is sent as one matches_changed event instead of one per match
+    LIVE_MAX_MATCH_EVENTS: int = int(os.getenv("LIVE_MAX_MATCH_EVENTS", "20"))
+
 
 settings = Settings()
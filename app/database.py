@@ -1,6 +1,34 @@
+import logging
 import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
 
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+from app.config import settings
+from app.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# True while serving a request that must see the primary's latest data: a write, or a client that wrote
+# recently (see PrimaryPinningMiddleware)
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+# Replay delay in seconds; 0 when the replica has replayed everything it received, and also on a
+# server that is not a standby at all
+REPLICA_LAG_QUERY = """
+    SELECT COALESCE(
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END,
+        0
+    )
+"""
 
 
 def get_connection():
@@ -12,3 +40,125 @@ def get_connection():
         host=os.environ.get("POSTGRES_HOST"),
         port=os.environ.get("POSTGRES_PORT", "5432"),
     )
+
+
+# Repositories close connections when done; for pooled connections that hands them back instead
+class PooledConnection(psycopg2.extensions.connection):
+    pool: Optional[psycopg2.pool.AbstractConnectionPool] = None
+
+    def close(self):
+        pool, self.pool = self.pool, None
+        if pool is None or self.closed:
+            super().close()
+            return
+        try:
+            self.rollback()
+        except psycopg2.Error:
+            pool.putconn(self, close=True)
+            return
+        pool.putconn(self)
+
+
+# Sends heavy read-only queries to a read replica (POSTGRES_REPLICA_HOST) through its own pool, and
+# falls back to the primary when there is no replica, it is unreachable or lagging, the request is
+# pinned to the primary, or a change was seen recently enough that the replica may not have it yet
+# (results read now get cached, so they must not predate the change that invalidated the cache).
+class ReplicaRouter:
+    def __init__(
+        self,
+        host: Optional[str] = os.environ.get("POSTGRES_REPLICA_HOST"),
+        port: str = os.environ.get("POSTGRES_REPLICA_PORT", os.environ.get("POSTGRES_PORT", "5432")),
+        max_lag: float = settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = settings.REPLICA_LAG_CHECK_SECONDS,
+        pool_size: int = settings.REPLICA_POOL_SIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.pool_size = pool_size
+        self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        self._lock = threading.Lock()
+        self._usable = False
+        self._checked_until = 0.0
+        self._recent_change_until = 0.0
+
+    def get_read_connection(self):
+        if self.host and not primary_pinned.get() and self.replica_usable():
+            try:
+                conn = self._checkout()
+                metrics.increment("db_reads", "replica")
+                return conn
+            except psycopg2.Error as e:
+                self._mark_unusable(e)
+        metrics.increment("db_reads", "primary")
+        return get_connection()
+
+    def note_change(self, change) -> None:
+        # Change feed subscriber: the primary just committed something the replica may still be replaying
+        self._recent_change_until = time.monotonic() + self.max_lag
+
+    def replica_usable(self) -> bool:
+        now = time.monotonic()
+        if now < self._recent_change_until:
+            return False
+        if now >= self._checked_until:
+            with self._lock:
+                if now >= self._checked_until:
+                    self._usable = self._lag_within_limit()
+                    self._checked_until = time.monotonic() + self.check_interval
+        return self._usable
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def _lag_within_limit(self) -> bool:
+        try:
+            conn = self._checkout()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(REPLICA_LAG_QUERY)
+                    lag = float(cur.fetchone()[0])
+            finally:
+                conn.close()
+        except psycopg2.Error as e:
+            logger.warning("Read replica unavailable, reading from the primary: %s", e)
+            return False
+        if lag > self.max_lag:
+            logger.warning("Read replica is %.1fs behind, reading from the primary", lag)
+            return False
+        return True
+
+    def _mark_unusable(self, error: Exception) -> None:
+        logger.warning("Read replica connection failed, reading from the primary: %s", error)
+        self._usable = False
+        self._checked_until = time.monotonic() + self.check_interval
+
+    def _checkout(self) -> PooledConnection:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = psycopg2.pool.ThreadedConnectionPool(
+                        0,
+                        self.pool_size,
+                        connection_factory=PooledConnection,
+                        dbname=os.environ.get("POSTGRES_DB"),
+                        user=os.environ.get("POSTGRES_USER"),
+                        password=os.environ.get("POSTGRES_PASSWORD"),
+                        host=self.host,
+                        port=self.port,
+                    )
+        conn = self._pool.getconn()
+        conn.pool = self._pool
+        return conn
+
+
+replica_router = ReplicaRouter()
+
+
+def get_read_connection():
+    # For read-only queries that tolerate replica lag; everything else uses get_connection()
+    return replica_router.get_read_connection()
@@ -0,0 +1,59 @@
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# Batches lookups by key: every load() made in the same event loop iteration is resolved by a single
+# batch_fn call, which returns the values it found keyed by key (missing keys resolve to None). Nothing
+# is cached between batches, so each lookup sees the current row.
+class DataLoader(Generic[K, V]):
+    def __init__(self, batch_fn: Callable[[List[K]], Awaitable[Mapping[K, V]]]):
+        self.batch_fn = batch_fn
+        self._pending: Dict[K, List[asyncio.Future]] = {}
+        self._dispatching: Optional[asyncio.Task] = None
+
+    async def load(self, key: K) -> Optional[V]:
+        return await self._enqueue(key)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self._enqueue(key) for key in keys)))
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            # Runs after the callers already scheduled in this iteration have queued their keys
+            loop.call_soon(self._start_dispatch)
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        return future
+
+    def _start_dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._dispatching = asyncio.ensure_future(self._dispatch(pending))
+
+    async def _dispatch(self, pending: Dict[K, List[asyncio.Future]]) -> None:
+        try:
+            found = await self.batch_fn(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(key))
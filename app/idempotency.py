@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Pattern, Sequence, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import Metrics, metrics
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Writes that accept an Idempotency-Key: creating a match, creating a player and recording a score
+IDEMPOTENT_ROUTES = (
+    ("POST", r"/matches"),
+    ("POST", r"/players"),
+    ("PUT", r"/matches/\d+/score"),
+)
+
+# (status, raw headers, body) of a completed write
+StoredResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class IdempotencyEntry:
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.response: Optional[StoredResponse] = None
+        # Set once the first request with this key has finished, whether or not its response was kept. An
+        # asyncio.Event, since entries are only waited on from the event loop the middleware runs in.
+        self.done = asyncio.Event()
+
+
+# Idempotency keys and the response each one produced, oldest first. Bounded by max_keys (the oldest
+# keys are evicted first) and by ttl; a key whose first request is still running is held as an entry
+# without a response, so concurrent duplicates wait for it instead of writing a second time. Such entries
+# are never evicted, since a duplicate arriving after that would run the write again.
+class IdempotencyStore:
+    def __init__(self, ttl: float = settings.IDEMPOTENCY_TTL_SECONDS, max_keys: int = settings.IDEMPOTENCY_MAX_KEYS):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, IdempotencyEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, key: str, fingerprint: str) -> Tuple[IdempotencyEntry, bool]:
+        # Returns the key's entry and whether the caller created it and so must run the request
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry, False
+            entry = IdempotencyEntry(fingerprint, now + self.ttl)
+            self._entries[key] = entry
+            if len(self._entries) > self.max_keys:
+                self._evict_oldest(len(self._entries) - self.max_keys)
+            return entry, True
+
+    def complete(self, key: str, entry: IdempotencyEntry, response: Optional[StoredResponse]) -> None:
+        # Without a response (a server error or a crash) the key is released, so a retry runs the write again
+        with self._lock:
+            if response is not None:
+                entry.response = response
+            elif self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of keys held, including those whose first request is still running."""
+        return len(self._entries)
+
+    def _evict_expired(self, now: float) -> None:
+        # Entries share one ttl, so insertion order is expiry order
+        for key, entry in list(self._entries.items()):
+            if entry.expires_at >= now:
+                break
+            if entry.done.is_set():
+                del self._entries[key]
+
+    def _evict_oldest(self, count: int) -> None:
+        # Completed entries only; while every held key is in flight the store briefly exceeds max_keys
+        for key in [key for key, entry in self._entries.items() if entry.done.is_set()][:count]:
+            del self._entries[key]
+
+
+idempotency_store = IdempotencyStore()
+
+
+# Replays the stored response for a retried write carrying an Idempotency-Key it has already seen,
+# without running the endpoint again. Reusing a key for a different request is rejected with 422.
+# Responses with a 5xx status are not kept, so the client's retry gets another attempt.
+class IdempotencyMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore = idempotency_store,
+        routes: Sequence[Tuple[str, str]] = IDEMPOTENT_ROUTES,
+        registry: Metrics = metrics,
+        wait_timeout: float = settings.IDEMPOTENCY_WAIT_SECONDS,
+    ):
+        self.app = app
+        self.store = store
+        self.routes: List[Tuple[str, Pattern]] = [(method, re.compile(path)) for method, path in routes]
+        self.registry = registry
+        self.wait_timeout = wait_timeout
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = Headers(scope=scope).get(IDEMPOTENCY_HEADER) if scope["type"] == "http" else None
+        if not key or not self._is_idempotent_route(scope):
+            await self.app(scope, receive, send)
+            return
+        if len(key) > MAX_KEY_LENGTH:
+            await self._send_error(send, 400, f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+            return
+
+        body = await self._read_body(receive)
+        fingerprint = self._fingerprint(scope, body)
+        while True:
+            entry, owner = self.store.begin(key, fingerprint)
+            if owner:
+                break
+            if entry.fingerprint != fingerprint:
+                await self._send_error(send, 422, "Idempotency-Key was already used for a different request")
+                return
+            if entry.response is None:
+                # A duplicate of a request still in flight: wait for it, then replay its response or,
+                # if it failed, try to become the request that runs
+                self.registry.increment("idempotency", "waited")
+                try:
+                    await asyncio.wait_for(entry.done.wait(), self.wait_timeout)
+                except asyncio.TimeoutError:
+                    self.registry.increment("idempotency", "wait_timeout")
+                    await self._send_error(
+                        send, 409, "A request with this Idempotency-Key is still being processed; retry later"
+                    )
+                    return
+                continue
+            self.registry.increment("idempotency", "replayed")
+            await self._replay(send, entry.response)
+            return
+
+        await self._run(scope, self._replay_body(body, receive), send, key, entry)
+
+    async def _run(self, scope: Scope, receive: Receive, send: Send, key: str, entry: IdempotencyEntry) -> None:
+        start: Message = {}
+        chunks: List[bytes] = []
+
+        async def send_and_record(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        response: Optional[StoredResponse] = None
+        try:
+            await self.app(scope, receive, send_and_record)
+            if start and start["status"] < 500:
+                response = (start["status"], list(start.get("headers", [])), b"".join(chunks))
+        finally:
+            self.store.complete(key, entry, response)
+
+    def _is_idempotent_route(self, scope: Scope) -> bool:
+        return any(scope["method"] == method and path.fullmatch(scope["path"]) for method, path in self.routes)
+
+    @staticmethod
+    def _fingerprint(scope: Scope, body: bytes) -> str:
+        digest = hashlib.sha256()
+        for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay_body(body: bytes, receive: Receive) -> Receive:
+        # Hands the already-read body to the app once, then falls back to the real receive (for disconnects)
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return replay
+
+    @staticmethod
+    async def _replay(send: Send, response: StoredResponse) -> None:
+        status, headers, body = response
+        await send({"type": "http.response.start", "status": status, "headers": headers + [(REPLAYED_HEADER, b"true")]})
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _send_error(send: Send, status: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
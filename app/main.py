@@ -1,9 +1,57 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import match_router, overview_router, player_router, standing_router
+from app.admission import AdmissionControlMiddleware, TokenBucketLimiter
+from app.cache import result_cache
+from app.compression import CompressionMiddleware
+from app.config import settings
+from app.database import replica_router
+from app.idempotency import IdempotencyMiddleware
+from app.notifications import change_feed
+from app.player_directory import player_directory
+from app.profiling import ProfilingMiddleware
+from app.read_your_writes import PrimaryPinningMiddleware
+from app.routers import (
+    fixture_router,
+    leaderboard_router,
+    live_router,
+    match_event_router,
+    match_router,
+    metrics_router,
+    overview_router,
+    player_router,
+    prediction_router,
+    rating_router,
+    standing_router,
+    stats_router,
+    tournament_router,
+)
+from app.services.live_service import live_service
+from app.services.prediction_service import shutdown_pools
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if change_feed:
+        change_feed.subscribe(result_cache.handle_change)
+        change_feed.subscribe(player_directory.handle_change)
+        change_feed.subscribe(replica_router.note_change)
+        live_service.attach(asyncio.get_running_loop(), change_feed)
+        change_feed.start()
+    yield
+    if change_feed:
+        change_feed.stop()
+    replica_router.close()
+    shutdown_pools()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
+
+# Added first so it is the innermost middleware and stores responses before compression
+app.add_middleware(IdempotencyMiddleware)
 
 # Enable CORS
 app.add_middleware(
@@ -12,13 +60,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Primary-Pin"],
+)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(PrimaryPinningMiddleware)
+app.add_middleware(
+    AdmissionControlMiddleware,
+    rate_limiter=TokenBucketLimiter() if settings.RATE_LIMIT_PER_SECOND > 0 else None,
 )
+# Outermost, so a profile covers the whole request; left out entirely unless enabled
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 # Include routers
 app.include_router(player_router.router)
 app.include_router(match_router.router)
 app.include_router(standing_router.router)
 app.include_router(overview_router.router)
+app.include_router(live_router.router)
+app.include_router(stats_router.router)
+app.include_router(rating_router.router)
+app.include_router(leaderboard_router.router)
+app.include_router(prediction_router.router)
+app.include_router(fixture_router.router)
+app.include_router(tournament_router.router)
+app.include_router(match_event_router.router)
+app.include_router(metrics_router.router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+import threading
+from typing import Dict
+
+
+# Process-wide counters, grouped by metric name and then by label (e.g. singleflight_executed -> standings)
+class Metrics:
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, label: str = "", value: int = 1) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(name, {})
+            counters[label] = counters.get(label, 0) + value
+
+    def get(self, name: str, label: str = "") -> int:
+        with self._lock:
+            return self._counters.get(name, {}).get(label, 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._counters.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = Metrics()
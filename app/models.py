@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, ValidationInfo, field_validator
 
@@ -17,6 +17,26 @@ class MatchStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+class RatingType(str, Enum):
+    PLAYER = "player"
+    TEAM = "team"
+
+
+class LeaderboardMetric(str, Enum):
+    GOALS = "goals"
+    GOALS_AGAINST = "goals-against"
+    CLEAN_SHEETS = "clean-sheets"
+    WIN_PERCENTAGE = "win-percentage"
+    STREAK = "streak"
+
+
+class MatchEventType(str, Enum):
+    CREATED = "created"
+    RESCORED = "rescored"
+    EDITED = "edited"
+    DELETED = "deleted"
+
+
 class MatchResult(str, Enum):
     TEAM1 = "Team1"
     TEAM2 = "Team2"
@@ -48,6 +68,17 @@ class Player(PlayerBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Batched lookup by id (?ids=...): found players in the requested order plus the ids that were not found
+class PlayerBatch(BaseModel):
+    players: List[Player]
+    missing_ids: List[int]
+
+
+class PlayerSearchResult(BaseModel):
+    player_id: int
+    player_name: str
+
+
 # Match models
 class MatchBase(BaseModel):
     round: str
@@ -151,6 +182,7 @@ class MatchCreate(BaseModel):
 
 class Match(BaseModel):
     id: int
+    tournament_id: Optional[int] = None
     round: str
     match_type: MatchType
     team1_player1_id: int
@@ -169,6 +201,44 @@ class Match(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class MatchBatch(BaseModel):
+    matches: List[Match]
+    missing_ids: List[int]
+
+
+# Tournament models
+class TournamentCreate(BaseModel):
+    name: str
+    format_id: int = 1
+    starts_on: Optional[date] = None
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, v: str) -> str:
+        if not v.strip():
+            raise ValueError("Tournament name cannot be empty")
+        return v.strip()
+
+
+class Tournament(TournamentCreate):
+    tournament_id: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Match event log model
+class MatchEvent(BaseModel):
+    event_id: int
+    match_id: int
+    tournament_id: int
+    event_type: MatchEventType
+    payload: Dict
+    recorded_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # Match Statistics model
 class MatchStats(BaseModel):
     id: int
@@ -193,3 +263,74 @@ class ScoreUpdate(BaseModel):
         if v < 0:
             raise ValueError("Goals cannot be negative")
         return v
+
+
+# Fixture generation models
+class FixtureRequest(BaseModel):
+    round: str
+    match_type: MatchType
+    player_ids: List[int]
+    start_date: datetime
+    slot_minutes: int = 30
+    matches_per_slot: int = 1
+
+    @field_validator("player_ids")
+    @classmethod
+    def validate_player_ids(cls, v: List[int], info: ValidationInfo) -> List[int]:
+        if len(set(v)) != len(v):
+            raise ValueError("Each player can only be listed once")
+        minimum = 4 if info.data.get("match_type") == MatchType.TWO_V_TWO else 2
+        if len(v) < minimum:
+            raise ValueError(f"At least {minimum} players are required")
+        return v
+
+    @field_validator("start_date")
+    @classmethod
+    def validate_start_date(cls, v: datetime) -> datetime:
+        if v < datetime.now():
+            raise ValueError("Fixtures cannot start in the past")
+        return v
+
+    @field_validator("slot_minutes", "matches_per_slot")
+    @classmethod
+    def validate_positive(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("Must be at least 1")
+        return v
+
+
+# Rating models
+class Rating(BaseModel):
+    entity_type: RatingType
+    entity_key: str
+    player_ids: List[int]
+    name: Optional[str] = None
+    rating: float
+    matches_played: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RatingHistoryEntry(BaseModel):
+    match_id: int
+    match_date: datetime
+    rating_before: float
+    rating_after: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Leaderboard models
+class LeaderboardEntry(BaseModel):
+    rank: int
+    player_id: int
+    player_name: str
+    value: float
+    matches_played: int
+    wins: int
+    draws: int
+    losses: int
+    goals_scored: int
+    goals_against: int
+    clean_sheets: int
+    matches: List[Dict] = []
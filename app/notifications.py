@@ -0,0 +1,169 @@
+import json
+import logging
+import select
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from app.config import settings
+from app.database import get_connection
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHANNEL = "table_changes"
+
+# Dispatched when notifications may have been missed (e.g. after a reconnect); subscribers drop everything
+RESYNC_CHANGE = {"table": "*", "id": None, "operation": "RESYNC"}
+
+ChangeHandler = Callable[[Dict], None]
+
+
+class ChangeFeed(ABC):
+    def __init__(self):
+        self._handlers: List[ChangeHandler] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, handler: ChangeHandler) -> None:
+        if handler not in self._handlers:
+            self._handlers.append(handler)
+
+    def unsubscribe(self, handler: ChangeHandler) -> None:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def dispatch(self, change: Dict) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(change)
+            except Exception:
+                logger.exception("Change handler %r failed", handler)
+
+    @abstractmethod
+    def _run(self) -> None:
+        pass
+
+
+# Holds a single LISTEN connection per worker. Handlers run on the listener thread, so anything
+# touching the event loop has to hop over with run_coroutine_threadsafe.
+class ChangeListener(ChangeFeed):
+    def __init__(
+        self,
+        channel: str = CHANGE_CHANNEL,
+        poll_timeout: float = 5.0,
+        max_backoff: float = settings.CHANGE_RECONNECT_MAX_SECONDS,
+    ):
+        super().__init__()
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.max_backoff = max_backoff
+        self.connected = threading.Event()
+
+    def dispatch_payload(self, payload: str) -> None:
+        try:
+            change = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed change payload: %s", payload)
+            return
+        self.dispatch(change)
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            try:
+                conn = get_connection()
+            except Exception as e:
+                logger.warning("Change listener could not connect (%s); retrying in %.1fs", e, backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            try:
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {self.channel}")
+                backoff = 0.5
+                self.connected.set()
+                # Anything written before LISTEN took effect was never delivered to this worker
+                self.dispatch(RESYNC_CHANGE)
+                self._listen(conn)
+            except Exception as e:
+                logger.warning("Change listener lost its connection (%s); reconnecting", e)
+            finally:
+                self.connected.clear()
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _listen(self, conn) -> None:
+        while not self._stop.is_set():
+            if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                self.dispatch_payload(conn.notifies.pop(0).payload)
+
+
+# Fallback for deployments where a long-lived LISTEN connection is not available (e.g. behind a
+# transaction-pooling proxy). Only tells which tables changed, so subscribers drop whole tables.
+class VersionPoller(ChangeFeed):
+    def __init__(self, interval: float = settings.CHANGE_POLL_INTERVAL_SECONDS):
+        super().__init__()
+        self.interval = interval
+        self.versions: Optional[Dict[str, int]] = None
+        self._resync = False
+
+    def poll(self) -> None:
+        conn = get_connection()
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT table_name, version FROM change_versions")
+            versions = dict(cur.fetchall())
+        finally:
+            cur.close()
+            conn.close()
+
+        if self._resync:
+            self.dispatch(RESYNC_CHANGE)
+            self._resync = False
+        elif self.versions is not None:
+            for table, version in versions.items():
+                if self.versions.get(table) != version:
+                    self.dispatch({"table": table, "id": None, "operation": "VERSION"})
+        self.versions = versions
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("Change version poll failed (%s)", e)
+                self._resync = self.versions is not None or self._resync
+            self._stop.wait(self.interval)
+
+
+def create_change_feed(mode: str = settings.CHANGE_NOTIFICATION_MODE) -> Optional[ChangeFeed]:
+    if mode == "listen":
+        return ChangeListener()
+    if mode == "poll":
+        return VersionPoller()
+    return None
+
+
+change_feed = create_change_feed()
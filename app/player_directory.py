@@ -0,0 +1,97 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.repositories.player_repository import PlayerRepository
+
+TEAM_SLOTS = (
+    ("team1_player1_id", "team1_player1_name"),
+    ("team1_player2_id", "team1_player2_name"),
+    ("team2_player1_id", "team2_player1_name"),
+    ("team2_player2_id", "team2_player2_name"),
+)
+
+
+def _load_player_names() -> Mapping[int, str]:
+    return {row["player_id"]: row["player_name"] for row in PlayerRepository().get_player_names()}
+
+
+# Player id -> name for the whole (small) players table, loaded once and kept until a player is created
+# or deleted. Queries over matches return bare player ids and names are filled in from here, instead of
+# joining players up to four times per row.
+class PlayerDirectory:
+    def __init__(self, loader: Callable[[], Mapping[int, str]] = _load_player_names):
+        self.loader = loader
+        self._names: Optional[Dict[int, str]] = None
+        self._lock = threading.Lock()
+        # (names it was built from, sorted (key, rank, player_id)): see search()
+        self._prefixes: Optional[Tuple[Dict[int, str], List[Tuple[str, int, int]]]] = None
+
+    def names(self) -> Dict[int, str]:
+        names = self._names
+        if names is None:
+            with self._lock:
+                if self._names is None:
+                    self._names = dict(self.loader())
+                names = self._names
+        return names
+
+    def get(self, player_id: Optional[int]) -> Optional[str]:
+        if player_id is None:
+            return None
+        name = self.names().get(player_id)
+        if name is None:
+            # Created since the directory was loaded and the change has not reached us yet
+            self.invalidate()
+            name = self.names().get(player_id)
+        return name
+
+    def team_name(self, player_ids: Iterable[Optional[int]]) -> Optional[str]:
+        # "A" for a 1v1 side, "A & B" for a 2v2 side
+        names = [self.get(player_id) for player_id in player_ids if player_id is not None]
+        return " & ".join(name for name in names if name) or None
+
+    def with_names(self, match: Mapping) -> Dict:
+        # A match row plus each participant's name and both sides' display names
+        row = dict(match)
+        for id_column, name_column in TEAM_SLOTS:
+            row[name_column] = self.get(match.get(id_column))
+        row["team1_display_name"] = self.team_name((match.get("team1_player1_id"), match.get("team1_player2_id")))
+        row["team2_display_name"] = self.team_name((match.get("team2_player1_id"), match.get("team2_player2_id")))
+        return row
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        # Prefix search over the loaded names, for when the database cannot do trigram search: names
+        # starting with the query first, then names with a later word starting with it. Case-insensitive.
+        names = self.names()
+        prefixes = self._prefixes
+        if prefixes is None or prefixes[0] is not names:
+            # Rebuilt whenever the names were reloaded
+            keys = []
+            for player_id, name in names.items():
+                words = name.casefold().split()
+                keys.append((" ".join(words), 0, player_id))
+                keys.extend((word, 1, player_id) for word in words[1:])
+            prefixes = self._prefixes = (names, sorted(keys))
+        keys = prefixes[1]
+
+        needle = " ".join(query.casefold().split())
+        ranks: Dict[int, int] = {}
+        for key, rank, player_id in keys[bisect.bisect_left(keys, (needle,)) :]:
+            if not key.startswith(needle):
+                break
+            ranks[player_id] = min(rank, ranks.get(player_id, rank))
+        found = sorted(ranks, key=lambda player_id: (ranks[player_id], names[player_id].casefold(), player_id))
+        return [{"player_id": player_id, "player_name": names[player_id]} for player_id in found[:limit]]
+
+    def invalidate(self) -> None:
+        # Waits for a load in progress, so names read before the change are never kept after it
+        with self._lock:
+            self._names = None
+
+    def handle_change(self, change: Dict) -> None:
+        if change.get("table") in ("players", "*"):
+            self.invalidate()
+
+
+player_directory = PlayerDirectory()
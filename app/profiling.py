@@ -0,0 +1,192 @@
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import Metrics, metrics
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+    from pyinstrument.session import Session
+except ImportError:  # pyinstrument is optional; without it requests are never profiled
+    Profiler = None
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+
+def _route_key(scope: Scope) -> Optional[str]:
+    # "GET /matches/{match_id}": the route template, so every match shares one aggregate. Unmatched paths
+    # have no route and are not aggregated.
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{scope['method']} {path}" if path else None
+
+
+def _render(session: "Session") -> bytes:
+    # speedscope's file format, which https://www.speedscope.app shows as a flame graph
+    return SpeedscopeRenderer().render(session).encode()
+
+
+# Per-route profiles of the most recent sampled requests, a route's sessions merged into one when its flame
+# graph is asked for so it shows where time goes across all of them. Only the last max_sessions of each
+# route are kept, so memory stays bounded however long sampling runs.
+class ProfileStore:
+    def __init__(self, max_sessions: int = settings.PROFILING_SESSIONS_PER_ROUTE):
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, Deque["Session"]] = {}
+        self._requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, session: "Session") -> None:
+        with self._lock:
+            self._sessions.setdefault(route, deque(maxlen=self.max_sessions)).append(session)
+            self._requests[route] = self._requests.get(route, 0) + 1
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                route: {
+                    "requests": self._requests[route],
+                    "profiled": len(sessions),
+                    "samples": sum(session.sample_count for session in sessions),
+                    "duration_ms": round(sum(session.duration for session in sessions) * 1000, 1),
+                }
+                for route, sessions in sorted(self._sessions.items())
+            }
+
+    def speedscope(self, route: str) -> Optional[bytes]:
+        with self._lock:
+            sessions = list(self._sessions.get(route, ()))
+        if not sessions:
+            return None
+        session = sessions[0]
+        for other in sessions[1:]:
+            session = Session.combine(session, other)
+        return _render(session)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._requests.clear()
+
+
+profile_store = ProfileStore()
+
+
+# Samples a request with pyinstrument when it carries an X-Profile header or ?profile=1, or when it falls
+# in the PROFILING_SAMPLE_RATE fraction of all requests. A request that asked for it gets the speedscope
+# profile back in place of its response, or, with PROFILING_OUTPUT_DIR set, its normal response and the
+# profile written to that directory (named in X-Profile-File). Every sampled request is added to its
+# route's aggregate in the profile store.
+#
+# Only added to the app when PROFILING_ENABLED is set, so it costs nothing otherwise. The profiler follows
+# the request's own async context, so concurrent requests do not show up in each other's profiles; work an
+# endpoint hands to the threadpool (sync endpoints) shows up as time awaiting it. Streaming responses such
+# as /live never finish and should not be profiled.
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore = profile_store,
+        interval: float = settings.PROFILING_INTERVAL_SECONDS,
+        sample_rate: float = settings.PROFILING_SAMPLE_RATE,
+        output_dir: Optional[str] = settings.PROFILING_OUTPUT_DIR,
+        registry: Metrics = metrics,
+    ):
+        self.app = app
+        self.store = store
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.metrics = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or Profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        requested = self._requested(scope)
+        if not requested and not (self.sample_rate and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        if requested and not self.output_dir:
+            await self._respond_with_profile(profiler, scope, receive, send)
+            return
+
+        profile_file = self._profile_path(scope) if requested else None
+
+        async def send_with_profile_file(message: Message) -> None:
+            if message["type"] == "http.response.start" and profile_file:
+                message = {**message, "headers": [*message["headers"], (b"x-profile-file", profile_file.encode())]}
+            await send(message)
+
+        session = await self._run(profiler, scope, receive, send_with_profile_file)
+        if profile_file:
+            with open(profile_file, "wb") as f:
+                f.write(_render(session))
+
+    async def _respond_with_profile(self, profiler: "Profiler", scope: Scope, receive: Receive, send: Send) -> None:
+        # The endpoint's own response is dropped; the profile is the answer
+        status = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        session = await self._run(profiler, scope, receive, discard)
+        body = _render(session)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"content-disposition", b'attachment; filename="profile.speedscope.json"'),
+                    (b"x-profiled-status", str(status).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _run(self, profiler: "Profiler", scope: Scope, receive: Receive, send: Send) -> "Session":
+        profiler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session = profiler.stop()
+            route = _route_key(scope)
+            if route:
+                self.store.add(route, session)
+            self.metrics.increment("profiled_requests", route or "")
+        return session
+
+    def _requested(self, scope: Scope) -> bool:
+        if PROFILE_HEADER in Headers(scope=scope):
+            return True
+        query = scope.get("query_string", b"")
+        if PROFILE_QUERY_PARAM.encode() not in query:
+            return False
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM, [])
+        return any(value.lower() in ("1", "true", "yes") for value in values)
+
+    def _profile_path(self, scope: Scope) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9]+", "-", f"{scope['method']} {scope['path']}").strip("-")
+        return os.path.join(
+            self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}-{uuid.uuid4().hex[:6]}.speedscope.json"
+        )
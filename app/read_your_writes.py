@@ -0,0 +1,58 @@
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import primary_pinned
+
+PIN_COOKIE = "pin_primary"
+PIN_HEADER = "x-primary-pin"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+# Read-your-writes for replica routing: write requests run pinned to the primary, and a successful
+# write hands back the pin's expiry time, which keeps the client's following reads on the primary until
+# the replica has had time to catch up. The frontend calls the API cross-site, so the pin is a
+# SameSite=None cookie (sent with credentialed fetches), and is also returned in an X-Primary-Pin header
+# that clients whose browser blocks third-party cookies echo back on their reads.
+class PrimaryPinningMiddleware:
+    def __init__(self, app: ASGIApp, pin_seconds: int = settings.REPLICA_PIN_SECONDS):
+        self.app = app
+        self.pin_seconds = pin_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = scope["method"] not in READ_METHODS
+        token = primary_pinned.set(writes or self._pinned(scope))
+
+        async def send_with_pin(message: Message) -> None:
+            if writes and message["type"] == "http.response.start" and message["status"] < 400:
+                expires = int(time.time()) + self.pin_seconds
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{PIN_COOKIE}={expires}; Max-Age={self.pin_seconds}; Path=/; HttpOnly; Secure; SameSite=None",
+                )
+                headers.append(PIN_HEADER, str(expires))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            primary_pinned.reset(token)
+
+    @staticmethod
+    def _pinned(scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        for value in (headers.get(PIN_HEADER), cookie_parser(headers.get("cookie", "")).get(PIN_COOKIE)):
+            try:
+                if value is not None and int(value) > time.time():
+                    return True
+            except ValueError:
+                pass
+        return False
@@ -0,0 +1,32 @@
+from typing import Dict, List
+
+from app.database import get_connection
+from app.rows import CompactCursor
+
+
+class FormatRepository:
+    def get_format_rounds(self, tournament_id: int) -> List[Dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                SELECT
+                    f.format_id,
+                    f.name,
+                    r.round,
+                    r.phase,
+                    r.position,
+                    r.expected_matches
+                FROM tournaments t
+                JOIN tournament_formats f ON f.format_id = t.format_id
+                JOIN format_rounds r ON r.format_id = f.format_id
+                WHERE t.tournament_id = %s
+                ORDER BY r.position
+            """,
+                (tournament_id,),
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
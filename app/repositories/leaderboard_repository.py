@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+from app.database import get_connection
+from app.rows import CompactCursor
+
+
+class LeaderboardRepository:
+    def get_player_aggregates(
+        self, tournament_id: int, round_name: Optional[str] = None, match_type: Optional[str] = None
+    ) -> List[dict]:
+        # Every leaderboard metric comes from this one pass: per-player totals plus each player's
+        # match log (newest first), from which streaks and per-metric match details are derived. Player and
+        # opponent names are left to the player directory.
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                WITH participant_results AS (
+                    SELECT
+                        s.player_id,
+                        m.id as match_id,
+                        m.match_date,
+                        m.match_type,
+                        s.goals_for,
+                        s.goals_against,
+                        s.opponent1_id,
+                        s.opponent2_id
+                    FROM matches m
+                    CROSS JOIN LATERAL (
+                        VALUES
+                            (m.team1_player1_id, m.team1_goals, m.team2_goals, m.team2_player1_id, m.team2_player2_id),
+                            (m.team1_player2_id, m.team1_goals, m.team2_goals, m.team2_player1_id, m.team2_player2_id),
+                            (m.team2_player1_id, m.team2_goals, m.team1_goals, m.team1_player1_id, m.team1_player2_id),
+                            (m.team2_player2_id, m.team2_goals, m.team1_goals, m.team1_player1_id, m.team1_player2_id)
+                    ) AS s(player_id, goals_for, goals_against, opponent1_id, opponent2_id)
+                    WHERE m.tournament_id = %(tournament_id)s
+                    AND m.status = 'COMPLETED'
+                    AND m.team1_goals IS NOT NULL
+                    AND m.team2_goals IS NOT NULL
+                    AND s.player_id IS NOT NULL
+                    AND (%(round)s::TEXT IS NULL OR m.round = %(round)s)
+                    AND (%(match_type)s::TEXT IS NULL OR m.match_type = %(match_type)s)
+                )
+                SELECT
+                    r.player_id,
+                    COUNT(*) as matches_played,
+                    COUNT(*) FILTER (WHERE r.goals_for > r.goals_against) as wins,
+                    COUNT(*) FILTER (WHERE r.goals_for = r.goals_against) as draws,
+                    COUNT(*) FILTER (WHERE r.goals_for < r.goals_against) as losses,
+                    SUM(r.goals_for) as goals_scored,
+                    SUM(r.goals_against) as goals_against,
+                    COUNT(*) FILTER (WHERE r.goals_against = 0) as clean_sheets,
+                    json_agg(
+                        json_build_object(
+                            'match_id', r.match_id,
+                            'match_date', to_char(r.match_date, 'YYYY-MM-DD'),
+                            'match_type', r.match_type,
+                            'goals_for', r.goals_for,
+                            'goals_against', r.goals_against,
+                            'opponent1_id', r.opponent1_id,
+                            'opponent2_id', r.opponent2_id
+                        ) ORDER BY r.match_date DESC, r.match_id DESC
+                    ) as match_log
+                FROM participant_results r
+                GROUP BY r.player_id
+                """,
+                {"tournament_id": tournament_id, "round": round_name, "match_type": match_type},
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psycopg2.extensions
+from psycopg2.extras import Json, execute_values
+
+from app.database import get_connection
+from app.repositories.rating_repository import RATING_LOCK_ID
+from app.rows import CompactCursor
+
+
+class MatchEventRepository:
+    def get_events(self, match_id: Optional[int], after_event_id: int, limit: int) -> List[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                SELECT event_id, match_id, tournament_id, event_type, payload, recorded_at
+                FROM match_events
+                WHERE event_id > %(after)s
+                AND (%(match_id)s::INT IS NULL OR match_id = %(match_id)s)
+                ORDER BY event_id
+                LIMIT %(limit)s
+                """,
+                {"match_id": match_id, "after": after_event_id, "limit": limit},
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    @contextmanager
+    def head_replay(self) -> Iterator[psycopg2.extensions.connection]:
+        # One transaction for a replay to the head of the log: SHARE on matches waits for in-flight match
+        # writes and blocks new ones (each appends its event in the same statement), so the log cannot grow
+        # and no trigger can write match_stats between reading the log and replacing the derived tables.
+        # The rating lock keeps incremental rating updates out as well. Committed when the block exits.
+        conn = get_connection()
+        cur = conn.cursor()
+        try:
+            cur.execute("LOCK TABLE matches IN SHARE MODE")
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (RATING_LOCK_ID,))
+            yield conn
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+            conn.close()
+
+    def stream_events(
+        self,
+        after_event_id: int,
+        until_event_id: Optional[int],
+        batch_size: int,
+        conn: Optional[psycopg2.extensions.connection] = None,
+    ) -> Iterator[dict]:
+        # Server-side cursor: events arrive batch_size at a time, so memory does not grow with the log.
+        # Reads inside conn's transaction when given one (see head_replay), on its own connection otherwise.
+        own_connection = conn is None
+        if own_connection:
+            conn = get_connection()
+        cur = conn.cursor(name="match_event_replay", cursor_factory=CompactCursor)
+        cur.itersize = batch_size
+        try:
+            cur.execute(
+                """
+                SELECT event_id, match_id, event_type, payload
+                FROM match_events
+                WHERE event_id > %(after)s
+                AND (%(until)s::BIGINT IS NULL OR event_id <= %(until)s)
+                ORDER BY event_id
+                """,
+                {"after": after_event_id, "until": until_event_id},
+            )
+            yield from cur
+        finally:
+            cur.close()
+            if own_connection:
+                conn.close()
+
+    def get_latest_snapshot(self, until_event_id: Optional[int]) -> Optional[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                SELECT last_event_id, state
+                FROM match_event_snapshots
+                WHERE %(until)s::BIGINT IS NULL OR last_event_id <= %(until)s
+                ORDER BY last_event_id DESC
+                LIMIT 1
+                """,
+                {"until": until_event_id},
+            )
+            return cur.fetchone()
+        finally:
+            cur.close()
+            conn.close()
+
+    def save_snapshot(self, last_event_id: int, state: Dict) -> None:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                INSERT INTO match_event_snapshots (last_event_id, state)
+                VALUES (%s, %s)
+                ON CONFLICT (last_event_id) DO NOTHING
+                """,
+                (last_event_id, Json(state)),
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+            conn.close()
+
+    def replace_derived(
+        self,
+        match_stats: List[Tuple],
+        rating_history: List[Tuple],
+        ratings: List[Tuple],
+        conn: psycopg2.extensions.connection,
+    ) -> None:
+        # Swaps match_stats and the ratings tables for the replayed versions inside the head_replay
+        # transaction the events were read in; it commits them together
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute("DELETE FROM match_stats")
+            execute_values(
+                cur,
+                """
+                INSERT INTO match_stats (match_id, tournament_id, player_id, goals, clean_sheet, points)
+                VALUES %s
+                """,
+                match_stats,
+                page_size=1000,
+            )
+            cur.execute("DELETE FROM rating_history")
+            cur.execute("DELETE FROM ratings")
+            execute_values(
+                cur,
+                """
+                INSERT INTO rating_history (match_id, match_date, entity_type, entity_key, rating_before, rating_after)
+                VALUES %s
+                """,
+                rating_history,
+                page_size=1000,
+            )
+            execute_values(
+                cur,
+                "INSERT INTO ratings (entity_type, entity_key, rating, matches_played) VALUES %s",
+                ratings,
+                page_size=1000,
+            )
+        finally:
+            cur.close()
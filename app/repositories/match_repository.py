@@ -1,49 +1,128 @@
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
+from psycopg2.extras import execute_values
 
-from app.database import get_connection
+from app.database import get_connection, get_read_connection
 from app.models import MatchCreate
+from app.rows import CompactCursor
+
+MATCH_COLUMNS = (
+    "id",
+    "tournament_id",
+    "round",
+    "match_type",
+    "team1_player1_id",
+    "team1_player2_id",
+    "team2_player1_id",
+    "team2_player2_id",
+    "match_date",
+    "scheduled_date",
+    "team1_goals",
+    "team2_goals",
+    "status",
+    "result",
+    "created_at",
+    "updated_at",
+)
+
+
+# Pre-update values an edit returns alongside the new row, as previous_<column>: what the rating service
+# needs to tell whether the match was rated before the write
+PREVIOUS_COLUMNS = ("match_date", "status", "team1_goals", "team2_goals")
+
+
+def _logged(statement: str, event_type: str) -> str:
+    # Wraps an INSERT/UPDATE/DELETE ... RETURNING * so the same statement appends one match_events row per
+    # changed match: the log can never miss a write, or record one that was rolled back
+    previous = ",".join(f"previous_{column}" for column in PREVIOUS_COLUMNS)
+    return f"""
+        WITH changed AS ({statement}),
+        logged AS (
+            INSERT INTO match_events (match_id, tournament_id, event_type, payload)
+            SELECT id, tournament_id, '{event_type}', to_jsonb(changed) - '{{{previous}}}'::TEXT[] FROM changed
+        )
+        SELECT * FROM changed
+    """
+
+
+def _conditional_update(assignments: str) -> str:
+    # UPDATE of one match that locks and reads the row in the same statement, so there is no separate
+    # existence check to race with: no row back means the match is not in the tournament. Parameters are
+    # the SET values followed by match id and tournament id.
+    previous = ", ".join(f"previous.{column} AS previous_{column}" for column in PREVIOUS_COLUMNS)
+    return f"""
+        UPDATE matches
+        SET {assignments}
+        FROM (SELECT * FROM matches WHERE id = %s AND tournament_id = %s FOR UPDATE) previous
+        WHERE matches.id = previous.id AND matches.tournament_id = previous.tournament_id
+        RETURNING matches.*, {previous}
+    """
+
+
+def _split_previous(row) -> Optional[Tuple[dict, dict]]:
+    # (previous, updated) from a conditional update row, or None when nothing matched
+    if row is None:
+        return None
+    previous = {"id": row["id"], **{column: row[f"previous_{column}"] for column in PREVIOUS_COLUMNS}}
+    updated = {column: value for column, value in row.items() if not column.startswith("previous_")}
+    return previous, updated
 
 
 class MatchRepository:
-    async def get_matches(self):
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+    async def get_matches(self, tournament_id: int, fields: Optional[Sequence[str]] = None):
+        conn = get_read_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
+            if fields:
+                # Sparse fieldset: only the requested columns
+                columns = [column for column in MATCH_COLUMNS if column in fields] or ["id"]
+                cur.execute(
+                    sql.SQL("SELECT {} FROM matches m WHERE m.tournament_id = %s ORDER BY m.match_date DESC").format(
+                        sql.SQL(", ").join(sql.Identifier("m", column) for column in columns)
+                    ),
+                    (tournament_id,),
+                )
+                return cur.fetchall()
+
+            # Bare ids: MatchService fills player names from the player directory when it needs them
             cur.execute(
-                """
-                SELECT m.*,
-                       p1.player_name as team1_player1_name,
-                       p2.player_name as team1_player2_name,
-                       p3.player_name as team2_player1_name,
-                       p4.player_name as team2_player2_name
-                FROM matches m
-                LEFT JOIN players p1 ON m.team1_player1_id = p1.player_id
-                LEFT JOIN players p2 ON m.team1_player2_id = p2.player_id
-                LEFT JOIN players p3 ON m.team2_player1_id = p3.player_id
-                LEFT JOIN players p4 ON m.team2_player2_id = p4.player_id
-                ORDER BY m.match_date DESC
-            """
+                "SELECT * FROM matches m WHERE m.tournament_id = %s ORDER BY m.match_date DESC", (tournament_id,)
             )
             return cur.fetchall()
         finally:
             cur.close()
             conn.close()
 
-    async def get_match_by_id(self, match_id: int):
+    async def get_match_by_id(self, match_id: int, tournament_id: int):
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
-            cur.execute("SELECT * FROM matches WHERE id = %s", (match_id,))
+            cur.execute("SELECT * FROM matches WHERE id = %s AND tournament_id = %s", (match_id, tournament_id))
             return cur.fetchone()
         finally:
             cur.close()
             conn.close()
 
-    async def create_match(self, match: MatchCreate, scheduled_date, status: str, result: Optional[str]):
+    def get_matches_by_ids(self, match_ids: Sequence[int], tournament_id: int) -> List[dict]:
+        # Any number of ids in one round trip; the caller puts the rows in the order it needs. Blocking,
+        # so async callers run it in the threadpool
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                "SELECT * FROM matches WHERE tournament_id = %s AND id = ANY(%s)", (tournament_id, list(match_ids))
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    async def create_match(
+        self, match: MatchCreate, tournament_id: int, scheduled_date, status: str, result: Optional[str]
+    ):
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             # Validate players exist
             player_ids = [match.team1_player1_id, match.team2_player1_id]
@@ -57,18 +136,22 @@ class MatchRepository:
 
             # Insert match
             cur.execute(
-                """
-                INSERT INTO matches (
-                    round, match_type,
-                    team1_player1_id, team1_player2_id,
-                    team2_player1_id, team2_player2_id,
-                    match_date, scheduled_date,
-                    team1_goals, team2_goals,
-                    status, result
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING *
-            """,
+                _logged(
+                    """
+                    INSERT INTO matches (
+                        tournament_id, round, match_type,
+                        team1_player1_id, team1_player2_id,
+                        team2_player1_id, team2_player2_id,
+                        match_date, scheduled_date,
+                        team1_goals, team2_goals,
+                        status, result
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING *
+                    """,
+                    "created",
+                ),
                 (
+                    tournament_id,
                     match.round,
                     match.match_type,
                     match.team1_player1_id,
@@ -93,28 +176,72 @@ class MatchRepository:
             cur.close()
             conn.close()
 
-    async def update_match(self, match_id: int, match: MatchCreate, status: str, result: Optional[str]):
+    async def create_matches(self, tournament_id: int, fixtures: List[Tuple]) -> List[dict]:
+        # fixtures: (round, match_type, team1_player1_id, team1_player2_id, team2_player1_id,
+        # team2_player2_id, match_date, scheduled_date) tuples, inserted as scheduled matches in one transaction
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            # One existence check for every player referenced by the whole batch
+            player_ids = {player_id for fixture in fixtures for player_id in fixture[2:6] if player_id is not None}
+            cur.execute("SELECT player_id FROM players WHERE player_id = ANY(%s)", (list(player_ids),))
+            if len(cur.fetchall()) != len(player_ids):
+                raise ValueError("One or more players not found in database")
+
+            created = execute_values(
+                cur,
+                _logged(
+                    """
+                    INSERT INTO matches (
+                        tournament_id, round, match_type,
+                        team1_player1_id, team1_player2_id,
+                        team2_player1_id, team2_player2_id,
+                        match_date, scheduled_date, status
+                    ) VALUES %s
+                    RETURNING *
+                    """,
+                    "created",
+                ),
+                [(tournament_id,) + fixture for fixture in fixtures],
+                template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, 'SCHEDULED')",
+                page_size=500,
+                fetch=True,
+            )
+            conn.commit()
+            return created
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+            conn.close()
+
+    async def update_match(
+        self, match_id: int, tournament_id: int, match: MatchCreate, status: str, result: Optional[str]
+    ) -> Optional[Tuple[dict, dict]]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
-                """
-                UPDATE matches
-                SET round = %s,
-                    match_type = %s,
-                    team1_player1_id = %s,
-                    team1_player2_id = %s,
-                    team2_player1_id = %s,
-                    team2_player2_id = %s,
-                    match_date = %s,
-                    team1_goals = %s,
-                    team2_goals = %s,
-                    status = %s,
-                    result = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-                RETURNING *
-            """,
+                _logged(
+                    _conditional_update(
+                        """
+                        round = %s,
+                        match_type = %s,
+                        team1_player1_id = %s,
+                        team1_player2_id = %s,
+                        team2_player1_id = %s,
+                        team2_player2_id = %s,
+                        match_date = %s,
+                        team1_goals = %s,
+                        team2_goals = %s,
+                        status = %s,
+                        result = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                        """
+                    ),
+                    "edited",
+                ),
                 (
                     match.round,
                     match.match_type,
@@ -128,12 +255,13 @@ class MatchRepository:
                     status,
                     result,
                     match_id,
+                    tournament_id,
                 ),
             )
 
-            updated_match = cur.fetchone()
+            updated = _split_previous(cur.fetchone())
             conn.commit()
-            return updated_match
+            return updated
         except Exception as e:
             conn.rollback()
             raise e
@@ -141,27 +269,31 @@ class MatchRepository:
             cur.close()
             conn.close()
 
-    async def update_match_score(self, match_id: int, team1_goals: int, team2_goals: int, result: str):
+    async def update_match_score(
+        self, match_id: int, tournament_id: int, team1_goals: int, team2_goals: int, result: str
+    ) -> Optional[Tuple[dict, dict]]:
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
-                """
-                UPDATE matches
-                SET team1_goals = %s,
-                    team2_goals = %s,
-                    status = 'COMPLETED',
-                    result = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-                RETURNING *
-            """,
-                (team1_goals, team2_goals, result, match_id),
+                _logged(
+                    _conditional_update(
+                        """
+                        team1_goals = %s,
+                        team2_goals = %s,
+                        status = 'COMPLETED',
+                        result = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                        """
+                    ),
+                    "rescored",
+                ),
+                (team1_goals, team2_goals, result, match_id, tournament_id),
             )
 
-            updated_match = cur.fetchone()
+            updated = _split_previous(cur.fetchone())
             conn.commit()
-            return updated_match
+            return updated
         except Exception as e:
             conn.rollback()
             raise e
@@ -169,11 +301,15 @@ class MatchRepository:
             cur.close()
             conn.close()
 
-    async def delete_match(self, match_id: int):
+    async def delete_match(self, match_id: int, tournament_id: int):
+        # The deleted row, or None when the match is not in the tournament
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
-            cur.execute("DELETE FROM matches WHERE id = %s RETURNING *", (match_id,))
+            cur.execute(
+                _logged("DELETE FROM matches WHERE id = %s AND tournament_id = %s RETURNING *", "deleted"),
+                (match_id, tournament_id),
+            )
             deleted_match = cur.fetchone()
             conn.commit()
             return deleted_match
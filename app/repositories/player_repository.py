@@ -1,30 +1,86 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
 
-from app.database import get_connection
+from app.database import get_connection, get_read_connection
 from app.models import PlayerCreate
+from app.rows import CompactCursor
+
+PLAYER_COLUMNS = ("player_id", "player_name", "created_at", "updated_at")
 
 
 class PlayerRepository:
-    def get_all_players(self) -> List[dict]:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+    def get_all_players(
+        self, fields: Optional[Sequence[str]] = None, tournament_id: Optional[int] = None
+    ) -> List[dict]:
+        # With a tournament, only the players taking part in it
+        conn = get_read_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            columns = (
+                sql.SQL(", ").join(
+                    sql.Identifier(column)
+                    for column in ([column for column in PLAYER_COLUMNS if column in fields] or ["player_id"])
+                )
+                if fields
+                else sql.SQL("*")
+            )
+            cur.execute(
+                sql.SQL(
+                    """
+                    SELECT {} FROM players
+                    WHERE %(tournament_id)s::INT IS NULL OR player_id IN (
+                        SELECT player_id FROM tournament_players WHERE tournament_id = %(tournament_id)s
+                    )
+                    ORDER BY player_name
+                    """
+                ).format(columns),
+                {"tournament_id": tournament_id},
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    def search_players(self, query: str, limit: int) -> List[dict]:
+        # Needs pg_trgm (see sql/create.sql). Substring matches and names with a word similar to the query
+        # (so typos still match); names starting with the query rank first, then by word similarity.
+        pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conn = get_read_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
                 """
-                SELECT * FROM players
-                ORDER BY player_name
-            """
+                SELECT player_id, player_name
+                FROM players
+                WHERE player_name ILIKE %(contains)s OR %(query)s <%% player_name
+                ORDER BY
+                    player_name ILIKE %(prefix)s DESC,
+                    word_similarity(%(query)s, player_name) DESC,
+                    player_name
+                LIMIT %(limit)s
+                """,
+                {"query": query, "contains": f"%{pattern}%", "prefix": f"{pattern}%", "limit": limit},
             )
             return cur.fetchall()
         finally:
             cur.close()
             conn.close()
 
+    def get_player_names(self) -> List[dict]:
+        # Read from the primary: the directory is reloaded right after player writes
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute("SELECT player_id, player_name FROM players")
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
     def create_player(self, player: PlayerCreate) -> dict:
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
                 """
@@ -46,7 +102,7 @@ class PlayerRepository:
 
     def get_player_by_id(self, player_id: int) -> Optional[dict]:
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
                 """
@@ -60,49 +116,115 @@ class PlayerRepository:
             cur.close()
             conn.close()
 
-    def delete_player(self, player_id: int) -> Optional[dict]:
+    def get_players_by_ids(self, player_ids: Sequence[int]) -> List[dict]:
         conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute("SELECT * FROM players WHERE player_id = ANY(%s)", (list(player_ids),))
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    def get_player_stats(self, tournament_id: int, player_id: Optional[int] = None) -> List[dict]:
+        # One pass over completed matches: every match fans out into one row per participant
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
-            # First check if player exists
             cur.execute(
                 """
-                SELECT * FROM players
-                WHERE player_id = %s
+                WITH participant_results AS (
+                    SELECT
+                        s.player_id,
+                        s.goals_for,
+                        s.goals_against
+                    FROM matches m
+                    CROSS JOIN LATERAL (
+                        VALUES
+                            (m.team1_player1_id, m.team1_goals, m.team2_goals),
+                            (m.team1_player2_id, m.team1_goals, m.team2_goals),
+                            (m.team2_player1_id, m.team2_goals, m.team1_goals),
+                            (m.team2_player2_id, m.team2_goals, m.team1_goals)
+                    ) AS s(player_id, goals_for, goals_against)
+                    WHERE m.tournament_id = %(tournament_id)s
+                    AND m.status = 'COMPLETED'
+                    AND m.team1_goals IS NOT NULL
+                    AND m.team2_goals IS NOT NULL
+                    AND s.player_id IS NOT NULL
+                    AND (%(player_id)s::INT IS NULL OR %(player_id)s IN (
+                        m.team1_player1_id, m.team1_player2_id,
+                        m.team2_player1_id, m.team2_player2_id
+                    ))
+                ),
+                player_stats AS (
+                    SELECT
+                        player_id,
+                        COUNT(*) as matches_played,
+                        COUNT(*) FILTER (WHERE goals_for > goals_against) as wins,
+                        COUNT(*) FILTER (WHERE goals_for = goals_against) as draws,
+                        COUNT(*) FILTER (WHERE goals_for < goals_against) as losses,
+                        SUM(goals_for) as goals_scored,
+                        SUM(goals_against) as goals_against,
+                        COUNT(*) FILTER (WHERE goals_against = 0) as clean_sheets
+                    FROM participant_results
+                    GROUP BY player_id
+                )
+                SELECT
+                    p.*,
+                    COALESCE(s.matches_played, 0) as matches_played,
+                    COALESCE(s.wins, 0) as wins,
+                    COALESCE(s.draws, 0) as draws,
+                    COALESCE(s.losses, 0) as losses,
+                    COALESCE(s.goals_scored, 0) as goals_scored,
+                    COALESCE(s.goals_against, 0) as goals_against,
+                    COALESCE(s.goals_scored - s.goals_against, 0) as goal_difference,
+                    COALESCE(s.clean_sheets, 0) as clean_sheets
+                FROM players p
+                LEFT JOIN player_stats s ON s.player_id = p.player_id
+                WHERE %(player_id)s::INT IS NULL OR p.player_id = %(player_id)s
+                ORDER BY p.player_name
                 """,
-                (player_id,),
+                {"tournament_id": tournament_id, "player_id": player_id},
             )
-            player = cur.fetchone()
-            if not player:
-                return None
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
 
-            # Check if player has any matches
+    def delete_player(self, player_id: int) -> Optional[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            # One statement: the player is deleted only when no match references them, and the match count
+            # comes back either way so a refusal can say why. No row deleted and no matches means the
+            # player does not exist.
             cur.execute(
                 """
-                SELECT COUNT(*) FROM matches
-                WHERE team1_player1_id = %s
-                   OR team1_player2_id = %s
-                   OR team2_player1_id = %s
-                   OR team2_player2_id = %s
+                WITH usage AS (
+                    SELECT COUNT(*) AS match_count FROM matches
+                    WHERE team1_player1_id = %(player_id)s
+                       OR team1_player2_id = %(player_id)s
+                       OR team2_player1_id = %(player_id)s
+                       OR team2_player2_id = %(player_id)s
+                ),
+                deleted AS (
+                    DELETE FROM players
+                    WHERE player_id = %(player_id)s
+                    AND (SELECT match_count FROM usage) = 0
+                    RETURNING *
+                )
+                SELECT usage.match_count, deleted.* FROM usage LEFT JOIN deleted ON TRUE
                 """,
-                (player_id, player_id, player_id, player_id),
+                {"player_id": player_id},
             )
-            match_count = cur.fetchone()["count"]
-            if match_count > 0:
+            row = cur.fetchone()
+            if row["match_count"] > 0:
                 raise ValueError(
-                    f"Cannot delete player with ID {player_id} as they have {match_count} matches associated"
+                    f"Cannot delete player with ID {player_id} as they have {row['match_count']} matches associated"
                 )
-
-            # Delete the player if no matches found
-            cur.execute(
-                """
-                DELETE FROM players
-                WHERE player_id = %s
-                RETURNING *
-                """,
-                (player_id,),
-            )
-            deleted_player = cur.fetchone()
+            if row["player_id"] is None:
+                return None
+            deleted_player = {column: value for column, value in row.items() if column != "match_count"}
             conn.commit()
             return deleted_player
         except Exception as e:
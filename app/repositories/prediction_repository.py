@@ -0,0 +1,38 @@
+from typing import Dict, List
+
+from app.database import get_connection
+from app.rows import CompactCursor
+
+
+class PredictionRepository:
+    def get_simulation_source(self, tournament_id: int) -> List[Dict]:
+        # Completed results fit the scoring model; scheduled league fixtures are what gets simulated
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                SELECT
+                    m.round,
+                    m.match_type,
+                    m.status,
+                    m.team1_player1_id,
+                    m.team1_player2_id,
+                    m.team2_player1_id,
+                    m.team2_player2_id,
+                    m.team1_goals,
+                    m.team2_goals
+                FROM matches m
+                WHERE m.tournament_id = %s
+                AND (
+                    (m.status = 'COMPLETED' AND m.team1_goals IS NOT NULL AND m.team2_goals IS NOT NULL)
+                    OR m.status = 'SCHEDULED'
+                )
+                ORDER BY m.match_date, m.id
+                """,
+                (tournament_id,),
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
@@ -0,0 +1,165 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from app.database import get_connection
+from app.rows import CompactCursor
+
+# Serialises replays across workers
+RATING_LOCK_ID = 7_300_331
+
+
+class RatingRepository:
+    def replay_from(self, match_date: Optional[datetime], match_id: Optional[int], engine) -> int:
+        # Rolls every rating back to its value before (match_date, match_id), then re-rates all completed
+        # matches from that point on in one transaction. None replays the whole history.
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (RATING_LOCK_ID,))
+
+            if match_date is None:
+                cur.execute("DELETE FROM rating_history")
+                cur.execute("DELETE FROM ratings")
+            else:
+                cur.execute(
+                    """
+                    WITH removed AS (
+                        DELETE FROM rating_history
+                        WHERE (match_date, match_id) >= (%s, %s)
+                        RETURNING entity_type, entity_key, match_date, match_id, rating_before
+                    ),
+                    rolled_back AS (
+                        SELECT DISTINCT ON (entity_type, entity_key)
+                            entity_type,
+                            entity_key,
+                            rating_before,
+                            COUNT(*) OVER (PARTITION BY entity_type, entity_key) as removed_matches
+                        FROM removed
+                        ORDER BY entity_type, entity_key, match_date, match_id
+                    )
+                    UPDATE ratings r
+                    SET rating = rb.rating_before,
+                        matches_played = r.matches_played - rb.removed_matches,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM rolled_back rb
+                    WHERE r.entity_type = rb.entity_type
+                    AND r.entity_key = rb.entity_key
+                    """,
+                    (match_date, match_id),
+                )
+                cur.execute("DELETE FROM ratings WHERE matches_played <= 0")
+
+            cur.execute(
+                """
+                SELECT
+                    id, match_date, match_type,
+                    team1_player1_id, team1_player2_id,
+                    team2_player1_id, team2_player2_id,
+                    team1_goals, team2_goals
+                FROM matches
+                WHERE status = 'COMPLETED'
+                AND team1_goals IS NOT NULL
+                AND team2_goals IS NOT NULL
+                AND (%(match_date)s::TIMESTAMP IS NULL OR (match_date, id) >= (%(match_date)s, %(match_id)s))
+                ORDER BY match_date, id
+                """,
+                {"match_date": match_date, "match_id": match_id},
+            )
+            matches = cur.fetchall()
+            if not matches:
+                conn.commit()
+                return 0
+
+            cur.execute("SELECT entity_type, entity_key, rating FROM ratings")
+            ratings: Dict[Tuple[str, str], float] = {
+                (row["entity_type"], row["entity_key"]): row["rating"] for row in cur.fetchall()
+            }
+
+            history = []
+            for match in matches:
+                for entity_type, entity_key, before, after in engine.rate_match(match, ratings):
+                    history.append((match["id"], match["match_date"], entity_type, entity_key, before, after))
+
+            execute_values(
+                cur,
+                """
+                INSERT INTO rating_history (match_id, match_date, entity_type, entity_key, rating_before, rating_after)
+                VALUES %s
+                """,
+                history,
+            )
+            played = Counter((entity_type, entity_key) for _, _, entity_type, entity_key, _, _ in history)
+            execute_values(
+                cur,
+                """
+                INSERT INTO ratings (entity_type, entity_key, rating, matches_played)
+                VALUES %s
+                ON CONFLICT (entity_type, entity_key) DO UPDATE
+                SET rating = EXCLUDED.rating,
+                    matches_played = ratings.matches_played + EXCLUDED.matches_played,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [
+                    (entity_type, entity_key, ratings[(entity_type, entity_key)], count)
+                    for (entity_type, entity_key), count in played.items()
+                ],
+            )
+            conn.commit()
+            return len(matches)
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+            conn.close()
+
+    def get_leaderboard(self, entity_type: str, limit: int) -> List[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                SELECT
+                    r.entity_type,
+                    r.entity_key,
+                    string_to_array(r.entity_key, '-')::INT[] as player_ids,
+                    (
+                        SELECT string_agg(p.player_name, ' & ' ORDER BY p.player_id)
+                        FROM players p
+                        WHERE p.player_id = ANY(string_to_array(r.entity_key, '-')::INT[])
+                    ) as name,
+                    r.rating,
+                    r.matches_played
+                FROM ratings r
+                WHERE r.entity_type = %s
+                ORDER BY r.rating DESC, r.matches_played DESC
+                LIMIT %s
+                """,
+                (entity_type, limit),
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    def get_history(self, entity_type: str, entity_key: str) -> List[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                SELECT match_id, match_date, rating_before, rating_after
+                FROM rating_history
+                WHERE entity_type = %s
+                AND entity_key = %s
+                ORDER BY match_date, match_id
+                """,
+                (entity_type, entity_key),
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
@@ -1,14 +1,13 @@
 from typing import Dict, List
 
-from psycopg2.extras import RealDictCursor
-
-from app.database import get_connection
+from app.database import get_read_connection
+from app.rows import CompactCursor
 
 
 class StandingRepository:
-    async def get_round1_standings(self) -> List[Dict]:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+    def get_round1_standings(self, tournament_id: int) -> List[Dict]:
+        conn = get_read_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
                 """
@@ -48,7 +47,8 @@ class StandingRepository:
                         m.team1_player1_id = p.player_id OR
                         m.team2_player1_id = p.player_id
                     )
-                    WHERE m.match_type = '1v1'
+                    WHERE m.tournament_id = %s
+                    AND m.match_type = '1v1'
                     AND m.round = 'Round 1'
                     AND m.status = 'COMPLETED'
                     GROUP BY p.player_id, p.player_name
@@ -67,16 +67,17 @@ class StandingRepository:
                 FROM round1_stats
                 WHERE matches_played > 0
                 ORDER BY points DESC, goal_difference DESC
-            """
+            """,
+                (tournament_id,),
             )
             return cur.fetchall()
         finally:
             cur.close()
             conn.close()
 
-    async def get_round2_standings(self) -> List[Dict]:
-        conn = get_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+    def get_round2_standings(self, tournament_id: int) -> List[Dict]:
+        conn = get_read_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
         try:
             cur.execute(
                 """
@@ -120,7 +121,8 @@ class StandingRepository:
                         m.team2_player1_id = p.player_id OR
                         m.team2_player2_id = p.player_id
                     )
-                    WHERE m.match_type = '2v2'
+                    WHERE m.tournament_id = %s
+                    AND m.match_type = '2v2'
                     AND m.round = 'Round 2'
                     AND m.status = 'COMPLETED'
                     GROUP BY p.player_id, p.player_name
@@ -139,7 +141,8 @@ class StandingRepository:
                 FROM round2_stats
                 WHERE matches_played > 0
                 ORDER BY points DESC, goal_difference DESC
-            """
+            """,
+                (tournament_id,),
             )
             return cur.fetchall()
         finally:
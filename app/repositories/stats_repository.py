@@ -0,0 +1,30 @@
+from typing import List, Tuple
+
+from app.database import get_connection
+
+
+class StatsRepository:
+    def get_head_to_head_source(self, tournament_id: int) -> List[Tuple]:
+        conn = get_connection()
+        cur = conn.cursor()
+        try:
+            # Plain tuples: the matrix build only needs positions, not a mapping per row
+            cur.execute(
+                """
+                SELECT
+                    match_type,
+                    team1_player1_id, team1_player2_id,
+                    team2_player1_id, team2_player2_id,
+                    team1_goals, team2_goals
+                FROM matches
+                WHERE tournament_id = %s
+                AND status = 'COMPLETED'
+                AND team1_goals IS NOT NULL
+                AND team2_goals IS NOT NULL
+                """,
+                (tournament_id,),
+            )
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from app.database import get_connection
+from app.models import TournamentCreate
+from app.rows import CompactCursor
+
+
+class TournamentRepository:
+    def get_tournaments(self) -> List[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute("SELECT * FROM tournaments ORDER BY tournament_id")
+            return cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+    def get_tournament_by_id(self, tournament_id: int) -> Optional[dict]:
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute("SELECT * FROM tournaments WHERE tournament_id = %s", (tournament_id,))
+            return cur.fetchone()
+        finally:
+            cur.close()
+            conn.close()
+
+    def create_tournament(self, tournament: TournamentCreate) -> dict:
+        # The create_tournament_partition trigger adds the tournament's matches partition in the same transaction
+        conn = get_connection()
+        cur = conn.cursor(cursor_factory=CompactCursor)
+        try:
+            cur.execute(
+                """
+                INSERT INTO tournaments (name, format_id, starts_on)
+                VALUES (%s, %s, %s)
+                RETURNING *
+                """,
+                (tournament.name, tournament.format_id, tournament.starts_on),
+            )
+            new_tournament = cur.fetchone()
+            conn.commit()
+            return new_tournament
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cur.close()
+            conn.close()
@@ -0,0 +1,25 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+
+from app.models import FixtureRequest, Match
+from app.routers.tournament_router import get_tournament_id
+from app.serialization import JSONBytesResponse
+from app.services.fixture_service import FixtureService
+from app.services.match_service import MATCH_ENCODER
+
+router = APIRouter(prefix="/fixtures", tags=["fixtures"])
+
+
+def get_fixture_service():
+    return FixtureService()
+
+
+@router.post("", response_model=List[Match], status_code=201)
+async def create_fixtures(
+    request: FixtureRequest,
+    tournament_id: int = Depends(get_tournament_id),
+    fixture_service: FixtureService = Depends(get_fixture_service),
+):
+    fixtures = await fixture_service.create_fixtures(request, tournament_id)
+    return JSONBytesResponse(MATCH_ENCODER.encode(fixtures), status_code=201)
@@ -0,0 +1,27 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.models import LeaderboardEntry, LeaderboardMetric, MatchType
+from app.routers.tournament_router import get_tournament_id
+from app.services.leaderboard_service import LeaderboardService
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+
+def get_leaderboard_service():
+    return LeaderboardService()
+
+
+@router.get("/{metric}", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    metric: LeaderboardMetric,
+    limit: int = Query(10, ge=1, le=100),
+    round_name: Optional[str] = Query(None, alias="round", description="Only count matches from this round"),
+    match_type: Optional[MatchType] = Query(None),
+    tournament_id: int = Depends(get_tournament_id),
+    leaderboard_service: LeaderboardService = Depends(get_leaderboard_service),
+):
+    return leaderboard_service.get_leaderboard(
+        metric, limit, round_name, match_type.value if match_type else None, tournament_id
+    )
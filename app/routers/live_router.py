@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.routers.tournament_router import get_tournament_id
+from app.services.live_service import LiveService, live_service
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+
+def get_live_service():
+    return live_service
+
+
+@router.get("")
+async def stream_live_events(
+    tournament_id: int = Depends(get_tournament_id),
+    live_service: LiveService = Depends(get_live_service),
+):
+    return StreamingResponse(
+        live_service.subscribe(tournament_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
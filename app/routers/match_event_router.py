@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.models import MatchEvent
+from app.services.match_event_service import MatchEventService
+
+router = APIRouter(prefix="/match-events", tags=["match-events"])
+
+
+def get_match_event_service():
+    return MatchEventService()
+
+
+@router.get("", response_model=List[MatchEvent])
+async def get_match_events(
+    match_id: Optional[int] = Query(None, description="Only events for this match"),
+    after: int = Query(0, ge=0, description="Only events with a greater event_id"),
+    limit: int = Query(100, ge=1, le=1000),
+    match_event_service: MatchEventService = Depends(get_match_event_service),
+):
+    return match_event_service.get_events(match_id, after, limit)
+
+
+# Sync route: the replay streams the whole log and runs in the threadpool
+@router.post("/replay")
+def replay_match_events(
+    until_event_id: Optional[int] = Query(
+        None, ge=1, description="Rebuild the state as of this event; omit to rebuild and persist the current state"
+    ),
+    match_event_service: MatchEventService = Depends(get_match_event_service),
+):
+    return match_event_service.replay(until_event_id)
@@ -1,8 +1,11 @@
-from typing import List
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from app.models import Match, MatchCreate, ScoreUpdate
+from app.config import settings
+from app.models import Match, MatchBatch, MatchCreate, ScoreUpdate
+from app.routers.tournament_router import get_tournament_id
+from app.serialization import JSONBytesResponse, parse_fields, parse_ids
 from app.services.match_service import MatchService
 
 router = APIRouter(prefix="/matches", tags=["matches"])
@@ -12,33 +15,63 @@ def get_match_service():
     return MatchService()
 
 
-@router.get("", response_model=List[Match])
-async def get_matches(match_service: MatchService = Depends(get_match_service)):
-    return await match_service.get_matches()
+@router.get("", response_model=Union[List[Match], MatchBatch])
+async def get_matches(
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. id,match_date,team1_goals"),
+    ids: Optional[str] = Query(None, description="Comma-separated match ids to fetch in one request, e.g. 4,9,2"),
+    tournament_id: int = Depends(get_tournament_id),
+    match_service: MatchService = Depends(get_match_service),
+):
+    match_ids = parse_ids(ids, settings.BATCH_MAX_IDS)
+    if match_ids:
+        return JSONBytesResponse(
+            await match_service.get_matches_by_ids_json(match_ids, parse_fields(fields, Match), tournament_id)
+        )
+    return JSONBytesResponse(await match_service.get_matches_json(parse_fields(fields, Match), tournament_id))
 
 
 @router.post("", response_model=Match)
-async def create_match(match: MatchCreate, match_service: MatchService = Depends(get_match_service)):
-    return await match_service.create_match(match)
+async def create_match(
+    match: MatchCreate,
+    tournament_id: int = Depends(get_tournament_id),
+    match_service: MatchService = Depends(get_match_service),
+):
+    return await match_service.create_match(match, tournament_id)
 
 
 @router.get("/{match_id}", response_model=Match)
-async def get_match(match_id: int, match_service: MatchService = Depends(get_match_service)):
-    return await match_service.get_match_by_id(match_id)
+async def get_match(
+    match_id: int,
+    tournament_id: int = Depends(get_tournament_id),
+    match_service: MatchService = Depends(get_match_service),
+):
+    return await match_service.get_match_by_id(match_id, tournament_id)
 
 
 @router.put("/{match_id}", response_model=Match)
-async def update_match(match_id: int, match: MatchCreate, match_service: MatchService = Depends(get_match_service)):
-    return await match_service.update_match(match_id, match)
+async def update_match(
+    match_id: int,
+    match: MatchCreate,
+    tournament_id: int = Depends(get_tournament_id),
+    match_service: MatchService = Depends(get_match_service),
+):
+    return await match_service.update_match(match_id, match, tournament_id)
 
 
 @router.put("/{match_id}/score", response_model=Match)
 async def update_match_score(
-    match_id: int, score: ScoreUpdate, match_service: MatchService = Depends(get_match_service)
+    match_id: int,
+    score: ScoreUpdate,
+    tournament_id: int = Depends(get_tournament_id),
+    match_service: MatchService = Depends(get_match_service),
 ):
-    return await match_service.update_match_score(match_id, score)
+    return await match_service.update_match_score(match_id, score, tournament_id)
 
 
 @router.delete("/{match_id}", response_model=Match)
-async def delete_match(match_id: int, match_service: MatchService = Depends(get_match_service)):
-    return await match_service.delete_match(match_id)
+async def delete_match(
+    match_id: int,
+    tournament_id: int = Depends(get_tournament_id),
+    match_service: MatchService = Depends(get_match_service),
+):
+    return await match_service.delete_match(match_id, tournament_id)
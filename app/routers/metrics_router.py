@@ -0,0 +1,31 @@
+from typing import Dict
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.cache import result_cache
+from app.metrics import metrics
+from app.profiling import profile_store
+from app.serialization import JSONBytesResponse
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_model=Dict)
+async def get_metrics():
+    return {"counters": metrics.snapshot(), "cache_entries": len(result_cache)}
+
+
+@router.get("/profiles", response_model=Dict)
+async def get_profiles():
+    # Per-route aggregates of the requests sampled by the profiling middleware (PROFILING_ENABLED)
+    return profile_store.summary()
+
+
+@router.get("/profiles/speedscope", response_class=JSONBytesResponse)
+async def get_profile(
+    route: str = Query(..., description='Route as listed by /metrics/profiles, e.g. "GET /standings"')
+):
+    profile = profile_store.speedscope(route)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile recorded for {route}")
+    return JSONBytesResponse(profile)
@@ -2,6 +2,7 @@ from typing import Dict
 
 from fastapi import APIRouter, Depends
 
+from app.routers.tournament_router import get_tournament_id
 from app.services.overview_service import OverviewService
 
 router = APIRouter(prefix="/overview", tags=["overview"])
@@ -11,6 +12,11 @@ def get_overview_service():
     return OverviewService()
 
 
+# Sync route: the overview queries block, so FastAPI runs it in the threadpool where concurrent
+# requests can overlap and share one computation
 @router.get("", response_model=Dict)
-async def get_overview_stats(overview_service: OverviewService = Depends(get_overview_service)):
-    return overview_service.get_overview_stats()
+def get_overview_stats(
+    tournament_id: int = Depends(get_tournament_id),
+    overview_service: OverviewService = Depends(get_overview_service),
+):
+    return overview_service.get_overview_stats(tournament_id)
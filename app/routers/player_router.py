@@ -1,8 +1,11 @@
-from typing import List
+from typing import List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from app.models import Player, PlayerCreate
+from app.config import settings
+from app.models import Player, PlayerBatch, PlayerCreate, PlayerSearchResult
+from app.routers.tournament_router import get_tournament_id
+from app.serialization import JSONBytesResponse, parse_fields, parse_ids
 from app.services.player_service import PlayerService
 
 router = APIRouter(prefix="/players", tags=["players"])
@@ -12,9 +15,32 @@ def get_player_service():
     return PlayerService()
 
 
-@router.get("", response_model=List[Player])
-async def get_players(player_service: PlayerService = Depends(get_player_service)):
-    return player_service.get_all_players()
+@router.get("", response_model=Union[List[Player], PlayerBatch])
+async def get_players(
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields, e.g. player_id,player_name"),
+    include: Optional[Literal["stats"]] = Query(None, description="Set to 'stats' to fill in match statistics"),
+    tournament_id: Optional[int] = Query(None, ge=1, description="Only players taking part in this tournament"),
+    ids: Optional[str] = Query(None, description="Comma-separated player ids to fetch in one request, e.g. 4,9,2"),
+    player_service: PlayerService = Depends(get_player_service),
+):
+    player_ids = parse_ids(ids, settings.BATCH_MAX_IDS)
+    if player_ids:
+        return JSONBytesResponse(player_service.get_players_by_ids_json(player_ids, parse_fields(fields, Player)))
+    return JSONBytesResponse(
+        player_service.get_all_players_json(
+            parse_fields(fields, Player), include_stats=include == "stats", tournament_id=tournament_id
+        )
+    )
+
+
+# Declared before /{player_id} so "search" is not taken for a player id
+@router.get("/search", response_model=List[PlayerSearchResult])
+async def search_players(
+    q: str = Query(..., min_length=1, max_length=100, description="Name or start of a name; small typos are tolerated"),
+    limit: int = Query(settings.PLAYER_SEARCH_LIMIT, ge=1, le=100),
+    player_service: PlayerService = Depends(get_player_service),
+):
+    return JSONBytesResponse(player_service.search_players_json(q, limit))
 
 
 @router.post("", response_model=Player)
@@ -27,6 +53,15 @@ async def get_player(player_id: int, player_service: PlayerService = Depends(get
     return player_service.get_player_by_id(player_id)
 
 
+@router.get("/{player_id}/stats", response_model=Player)
+async def get_player_stats(
+    player_id: int,
+    tournament_id: int = Depends(get_tournament_id),
+    player_service: PlayerService = Depends(get_player_service),
+):
+    return player_service.get_player_stats(player_id, tournament_id)
+
+
 @router.delete("/{player_id}", response_model=Player)
 async def delete_player(player_id: int, player_service: PlayerService = Depends(get_player_service)):
     return player_service.delete_player(player_id)
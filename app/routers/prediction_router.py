@@ -0,0 +1,24 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from app.config import settings
+from app.routers.tournament_router import get_tournament_id
+from app.services.prediction_service import PredictionService
+
+router = APIRouter(prefix="/predictions", tags=["predictions"])
+
+
+def get_prediction_service():
+    return PredictionService()
+
+
+# Sync route: the simulation is CPU-bound, so FastAPI runs it in the threadpool off the event loop. The
+# iteration count is PREDICTION_ITERATIONS rather than a query parameter, so clients cannot pick the cost
+# of a run or spread requests over uncached variants.
+@router.get("", response_model=Dict)
+def get_predictions(
+    tournament_id: int = Depends(get_tournament_id),
+    prediction_service: PredictionService = Depends(get_prediction_service),
+):
+    return prediction_service.get_predictions(settings.PREDICTION_ITERATIONS, tournament_id)
@@ -0,0 +1,36 @@
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, Query
+
+from app.models import Rating, RatingHistoryEntry, RatingType
+from app.services.rating_service import RatingService
+
+router = APIRouter(prefix="/ratings", tags=["ratings"])
+
+
+def get_rating_service():
+    return RatingService()
+
+
+@router.get("", response_model=List[Rating])
+async def get_ratings(
+    type: RatingType = Query(
+        RatingType.PLAYER, description="'player' for individual ratings, 'team' for 2v2 partnerships"
+    ),
+    limit: int = Query(50, ge=1, le=500),
+    rating_service: RatingService = Depends(get_rating_service),
+):
+    return rating_service.get_leaderboard(type, limit)
+
+
+@router.get("/{entity_type}/{entity_key}/history", response_model=List[RatingHistoryEntry])
+async def get_rating_history(
+    entity_type: RatingType, entity_key: str, rating_service: RatingService = Depends(get_rating_service)
+):
+    return rating_service.get_history(entity_type, entity_key)
+
+
+# Sync route: replays every completed match, so it runs in the threadpool
+@router.post("/rebuild", response_model=Dict[str, int])
+def rebuild_ratings(rating_service: RatingService = Depends(get_rating_service)):
+    return rating_service.rebuild()
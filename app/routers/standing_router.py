@@ -1,14 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
+from app.routers.tournament_router import get_tournament_id
 from app.services.standing_service import StandingService
 
 router = APIRouter(prefix="/standings", tags=["standings"])
 
 
 @router.get("")
-async def get_standings():
+async def get_standings(tournament_id: int = Depends(get_tournament_id)):
     try:
         service = StandingService()
-        return await service.get_standings()
+        return await service.get_standings(tournament_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,21 @@
+from typing import Dict
+
+from fastapi import APIRouter, Depends
+
+from app.routers.tournament_router import get_tournament_id
+from app.serialization import JSONBytesResponse
+from app.services.stats_service import StatsService
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+def get_stats_service():
+    return StatsService()
+
+
+@router.get("/head-to-head", response_model=Dict)
+async def get_head_to_head(
+    tournament_id: int = Depends(get_tournament_id),
+    stats_service: StatsService = Depends(get_stats_service),
+):
+    return JSONBytesResponse(stats_service.get_head_to_head_json(tournament_id))
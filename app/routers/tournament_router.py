@@ -0,0 +1,37 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+
+from app.config import settings
+from app.models import Tournament, TournamentCreate
+from app.services.tournament_service import TournamentService
+
+router = APIRouter(prefix="/tournaments", tags=["tournaments"])
+
+
+def get_tournament_service():
+    return TournamentService()
+
+
+# Shared by every tournament-scoped route: ?tournament_id=, defaulting to the current tournament
+def get_tournament_id(
+    tournament_id: int = Query(settings.DEFAULT_TOURNAMENT_ID, ge=1, description="Tournament to scope results to"),
+) -> int:
+    return tournament_id
+
+
+@router.get("", response_model=List[Tournament])
+async def get_tournaments(tournament_service: TournamentService = Depends(get_tournament_service)):
+    return tournament_service.get_tournaments()
+
+
+@router.post("", response_model=Tournament, status_code=201)
+async def create_tournament(
+    tournament: TournamentCreate, tournament_service: TournamentService = Depends(get_tournament_service)
+):
+    return tournament_service.create_tournament(tournament)
+
+
+@router.get("/{tournament_id}", response_model=Tournament)
+async def get_tournament(tournament_id: int, tournament_service: TournamentService = Depends(get_tournament_service)):
+    return tournament_service.get_tournament_by_id(tournament_id)
@@ -0,0 +1,107 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from psycopg2.extensions import cursor as _cursor
+
+
+# Read-only mapping over one result row. Values live in positional __slots__ (_0, _1, ...) and the
+# column -> slot table is shared by every row of the same shape, so a row costs one small object
+# instead of a full dict with its own hash table and key references.
+class Row(Mapping):
+    __slots__ = ()
+    _slots: Dict[str, str] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of column ``key``, raising KeyError for unknown columns."""
+        try:
+            slot = self._slots[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return getattr(self, slot)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        slot = self._slots.get(key)
+        return default if slot is None else getattr(self, slot)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the row has a column named ``key``."""
+        return key in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the column names in result order."""
+        return iter(self._slots)
+
+    def __len__(self) -> int:
+        """Return the number of columns."""
+        return len(self._slots)
+
+    def __repr__(self) -> str:
+        """Show the row as its column -> value dict."""
+        return f"Row({dict(self.items())!r})"
+
+    def __reduce__(self):
+        """Pickle as a plain dict, since the generated row classes cannot be imported by name."""
+        return dict, (list(self.items()),)
+
+
+_row_classes: Dict[Tuple[str, ...], Type[Row]] = {}
+
+
+def row_class(columns: Tuple[str, ...]) -> Type[Row]:
+    cls = _row_classes.get(columns)
+    if cls is None:
+        slots = tuple(f"_{i}" for i in range(len(columns)))
+        # Duplicate column names (e.g. m.* plus an aliased m.match_date) resolve to the last one,
+        # the same as RealDictCursor
+        namespace: Dict[str, Any] = {
+            "__slots__": slots,
+            "_slots": {name: slot for name, slot in zip(columns, slots)},
+        }
+        if slots:
+            # Tuple-unpacking assignment is much cheaper than setattr per column
+            exec(f"def __init__(self, values):\n    {', '.join(f'self.{s}' for s in slots)}, = values", namespace)
+        else:
+            namespace["__init__"] = lambda self, values: None
+        cls = type("Row", (Row,), namespace)
+        _row_classes[columns] = cls
+    return cls
+
+
+class CompactCursor(_cursor):
+    def execute(self, query, vars=None):
+        self._row_cls = None
+        return super().execute(query, vars)
+
+    def callproc(self, procname, vars=None):
+        self._row_cls = None
+        return super().callproc(procname, vars)
+
+    def _get_row_cls(self) -> Type[Row]:
+        cls = getattr(self, "_row_cls", None)
+        if cls is None:
+            cls = self._row_cls = row_class(tuple(column.name for column in self.description))
+        return cls
+
+    def fetchone(self) -> Optional[Row]:
+        values = super().fetchone()
+        return None if values is None else self._get_row_cls()(values)
+
+    def fetchmany(self, size=None) -> List[Row]:
+        rows = super().fetchmany() if size is None else super().fetchmany(size)
+        cls = self._get_row_cls() if rows else None
+        return [cls(values) for values in rows]
+
+    def fetchall(self) -> List[Row]:
+        rows = super().fetchall()
+        cls = self._get_row_cls() if rows else None
+        return [cls(values) for values in rows]
+
+    def __iter__(self):
+        """Iterate over the remaining rows as Row objects."""
+        return self
+
+    def __next__(self) -> Row:
+        """Fetch the next row as a Row object."""
+        # Fetch first: a named cursor has no description until its first FETCH
+        values = super().__next__()
+        return self._get_row_cls()(values)
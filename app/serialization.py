@@ -0,0 +1,67 @@
+from decimal import Decimal
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+
+# Trusted-read path: rows straight from our own repositories are already shaped by the schema, so
+# they are projected onto the response model's fields and encoded without building model instances.
+class RowEncoder:
+    def __init__(self, model: Type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.model = model
+        self.fields: List[Tuple[str, Any]] = [
+            (name, None if field.is_required() else field.get_default(call_default_factory=True))
+            for name, field in model.model_fields.items()
+            if fields is None or name in fields
+        ]
+
+    def project(self, row: Mapping) -> dict:
+        return {name: row.get(name, default) for name, default in self.fields}
+
+    def encode(self, rows: Iterable[Mapping]) -> bytes:
+        fields = self.fields
+        return dumps([{name: row.get(name, default) for name, default in fields} for row in rows])
+
+
+# Parses a sparse-fieldset parameter such as "id,match_date,team1_goals" against the model's fields
+def parse_fields(value: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    if not value:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = sorted(requested.difference(model.model_fields))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # Model order, so equivalent requests share one cache entry
+    return tuple(name for name in model.model_fields if name in requested) or None
+
+
+# Parses a batch lookup parameter such as "3,1,2": ids in the order given, duplicates dropped
+def parse_ids(value: Optional[str], max_ids: int) -> Optional[List[int]]:
+    if not value:
+        return None
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if len(ids) > max_ids:
+        raise HTTPException(status_code=400, detail=f"At most {max_ids} ids can be requested at once")
+    return ids or None
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.config import settings
+from app.models import FixtureRequest, MatchType
+from app.repositories.match_repository import MatchRepository
+
+Side = Tuple[int, ...]
+Fixture = Tuple[Side, Side]
+
+
+def round_robin(players: Sequence[Hashable]) -> List[List[Tuple[Hashable, Hashable]]]:
+    # Circle method: one player stays fixed while the rest rotate, giving n - 1 rounds in which every
+    # pair meets exactly once and nobody plays twice in a round. Odd counts get a bye each round.
+    items: List[Optional[Hashable]] = list(players)
+    if len(items) % 2:
+        items.append(None)
+    size = len(items)
+    fixed, rotating = items[0], items[1:]
+    rounds = []
+    for round_index in range(size - 1):
+        current = [fixed] + rotating
+        pairs = []
+        for i in range(size // 2):
+            first, second = current[i], current[size - 1 - i]
+            if first is None or second is None:
+                continue
+            # Alternate sides for the fixed player so nobody is always team 1
+            pairs.append((second, first) if i == 0 and round_index % 2 else (first, second))
+        rounds.append(pairs)
+        rotating = rotating[-1:] + rotating[:-1]
+    return rounds
+
+
+def _pack(fixtures: List[Fixture]) -> List[List[Fixture]]:
+    # Greedily groups fixtures into rounds in which no player appears twice
+    rounds: List[Tuple[set, List[Fixture]]] = []
+    for fixture in fixtures:
+        players = set(fixture[0] + fixture[1])
+        for busy, matches in rounds:
+            if not busy & players:
+                busy.update(players)
+                matches.append(fixture)
+                break
+        else:
+            rounds.append((players, [fixture]))
+    return [matches for _, matches in rounds]
+
+
+def generate_fixtures(player_ids: Sequence[int], match_type: MatchType) -> List[List[Fixture]]:
+    if match_type == MatchType.ONE_V_ONE:
+        return [[((a,), (b,)) for a, b in pairs] for pairs in round_robin(player_ids)]
+    if len(player_ids) < 4:
+        raise ValueError("2v2 fixtures need at least 4 players")
+
+    # 2v2: the round-robin pairs become partnerships, so every player partners every other player once.
+    # Each round's partnerships then play each other; with an odd number of partnerships in a round the
+    # spare one is carried over and matched against another spare with no shared players. A spare left
+    # without one (always the case when the total number of partnerships is odd) plays a partnership that
+    # already has a match, so every partnership is scheduled and only its opponents play twice.
+    rounds, spare = [], []
+    for partnerships in round_robin(player_ids):
+        teams = [tuple(sorted(pair)) for pair in partnerships]
+        if len(teams) % 2:
+            spare.append(teams.pop())
+        rounds.append([(teams[i], teams[i + 1]) for i in range(0, len(teams), 2)])
+
+    scheduled = [team for matches in rounds for fixture in matches for team in fixture]
+    extra = []
+    while spare:
+        team = spare.pop(0)
+        opponent = next((other for other in spare if not set(team) & set(other)), None)
+        if opponent is not None:
+            spare.remove(opponent)
+        else:
+            opponent = next(other for other in scheduled if not set(team) & set(other))
+        scheduled.extend((team, opponent))
+        extra.append((team, opponent))
+    return [matches for matches in rounds if matches] + _pack(extra)
+
+
+class FixtureService:
+    def __init__(self):
+        self.repository = MatchRepository()
+        self.cache = result_cache
+
+    async def create_fixtures(
+        self, request: FixtureRequest, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID
+    ) -> List[dict]:
+        rows = []
+        slot = 0
+        slot_length = timedelta(minutes=request.slot_minutes)
+        for matches in generate_fixtures(request.player_ids, request.match_type):
+            # Fixtures within a round share no players, so up to matches_per_slot of them can be played
+            # at the same time; every round starts a new slot
+            for i in range(0, len(matches), request.matches_per_slot):
+                match_date = request.start_date + slot * slot_length
+                for team1, team2 in matches[i : i + request.matches_per_slot]:
+                    rows.append(
+                        (
+                            request.round,
+                            request.match_type.value,
+                            team1[0],
+                            team1[1] if len(team1) > 1 else None,
+                            team2[0],
+                            team2[1] if len(team2) > 1 else None,
+                            match_date,
+                            match_date,
+                        )
+                    )
+                slot += 1
+
+        if not rows:
+            raise HTTPException(status_code=400, detail="Not enough players to generate any fixtures")
+        try:
+            created = await self.repository.create_matches(tournament_id, rows)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        self.cache.invalidate("matches")
+        return created
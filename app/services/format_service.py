@@ -0,0 +1,50 @@
+from typing import Dict
+
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.config import settings
+from app.repositories.format_repository import FormatRepository
+
+
+class FormatService:
+    def __init__(self):
+        self.repository = FormatRepository()
+        self.cache = result_cache
+
+    def get_format(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> Dict:
+        # Formats almost never change, so they are kept for FORMAT_CACHE_TTL_SECONDS unless a format or
+        # tournament change notification drops them first
+        return self.cache.get_or_set(
+            ("tournament_format", tournament_id),
+            lambda: self._load_format(tournament_id),
+            tags=[("format_rounds",), ("tournament_formats",), ("tournaments", tournament_id)],
+            ttl=settings.FORMAT_CACHE_TTL_SECONDS,
+        )
+
+    def _load_format(self, tournament_id: int) -> Dict:
+        rows = self.repository.get_format_rounds(tournament_id)
+        if not rows:
+            raise HTTPException(status_code=404, detail=f"No format found for tournament {tournament_id}")
+
+        # Phases in round order, each with its own and the cumulative expected match count
+        phases = []
+        for row in rows:
+            if not phases or phases[-1]["name"] != row["phase"]:
+                phases.append({"name": row["phase"], "expected_matches": 0})
+            phases[-1]["expected_matches"] += row["expected_matches"]
+        cumulative = 0
+        for phase in phases:
+            cumulative += phase["expected_matches"]
+            phase["cumulative_matches"] = cumulative
+
+        return {
+            "format_id": rows[0]["format_id"],
+            "name": rows[0]["name"],
+            "rounds": [
+                {"round": row["round"], "phase": row["phase"], "expected_matches": row["expected_matches"]}
+                for row in rows
+            ],
+            "phases": phases,
+            "total_matches": cumulative,
+        }
@@ -0,0 +1,158 @@
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.config import settings
+from app.models import LeaderboardMetric
+from app.player_directory import PlayerDirectory, player_directory
+from app.repositories.leaderboard_repository import LeaderboardRepository
+
+# Goals against only ranks players who have played enough to have a defensive record
+MIN_DEFENSE_MATCHES = 3
+
+
+def _current_streak(match_log: List[Mapping]) -> int:
+    streak = 0
+    for match in match_log:
+        if match["goals_for"] <= match["goals_against"]:
+            break
+        streak += 1
+    return streak
+
+
+def _summary(row: Mapping, directory: PlayerDirectory) -> Dict:
+    matches_played = row["matches_played"]
+    match_log = [
+        {
+            "match_id": match["match_id"],
+            "match_date": match["match_date"],
+            "match_type": match["match_type"],
+            "goals_for": match["goals_for"],
+            "goals_against": match["goals_against"],
+            "opponent": directory.team_name((match["opponent1_id"], match["opponent2_id"])),
+        }
+        for match in row["match_log"]
+    ]
+    return {
+        "player_id": row["player_id"],
+        "player_name": directory.get(row["player_id"]),
+        "matches_played": matches_played,
+        "wins": row["wins"],
+        "draws": row["draws"],
+        "losses": row["losses"],
+        "goals_scored": row["goals_scored"],
+        "goals_against": row["goals_against"],
+        "clean_sheets": row["clean_sheets"],
+        "goals_per_game": round(row["goals_scored"] / matches_played, 2),
+        "goals_against_per_game": round(row["goals_against"] / matches_played, 2),
+        "win_percentage": round(row["wins"] * 100 / matches_played, 1),
+        "streak": _current_streak(match_log),
+        "match_log": match_log,
+    }
+
+
+# Per metric: who qualifies, the ranking key (smallest first), the headline value and the matches
+# shown alongside it
+Metric = Tuple[Callable[[Dict], bool], Callable[[Dict], tuple], Callable[[Dict], float], Callable[[Dict], List]]
+
+METRICS: Dict[LeaderboardMetric, Metric] = {
+    LeaderboardMetric.GOALS: (
+        lambda s: s["goals_scored"] > 0,
+        lambda s: (-s["goals_scored"], -s["goals_per_game"], s["matches_played"]),
+        lambda s: s["goals_scored"],
+        lambda s: s["match_log"],
+    ),
+    LeaderboardMetric.GOALS_AGAINST: (
+        lambda s: s["matches_played"] >= MIN_DEFENSE_MATCHES,
+        lambda s: (s["goals_against"], -s["matches_played"]),
+        lambda s: s["goals_against"],
+        lambda s: s["match_log"],
+    ),
+    LeaderboardMetric.CLEAN_SHEETS: (
+        lambda s: s["clean_sheets"] > 0,
+        lambda s: (-s["clean_sheets"], -s["clean_sheets"] / s["matches_played"]),
+        lambda s: s["clean_sheets"],
+        lambda s: [match for match in s["match_log"] if match["goals_against"] == 0],
+    ),
+    LeaderboardMetric.WIN_PERCENTAGE: (
+        lambda s: s["matches_played"] > 0,
+        lambda s: (-s["win_percentage"], -s["wins"]),
+        lambda s: s["win_percentage"],
+        lambda s: [],
+    ),
+    LeaderboardMetric.STREAK: (
+        lambda s: s["streak"] > 0,
+        lambda s: (-s["streak"], -s["wins"]),
+        lambda s: s["streak"],
+        lambda s: s["match_log"][: s["streak"]],
+    ),
+}
+
+
+class LeaderboardService:
+    def __init__(self):
+        self.repository = LeaderboardRepository()
+        self.cache = result_cache
+        self.directory = player_directory
+
+    def get_leaderboard(
+        self,
+        metric: LeaderboardMetric,
+        limit: int = 10,
+        round_name: Optional[str] = None,
+        match_type: Optional[str] = None,
+        tournament_id: int = settings.DEFAULT_TOURNAMENT_ID,
+    ) -> List[Dict]:
+        try:
+            boards = self.get_leaderboards(round_name, match_type, tournament_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching leaderboard: {str(e)}")
+        return boards[metric][:limit]
+
+    def get_leaderboards(
+        self,
+        round_name: Optional[str] = None,
+        match_type: Optional[str] = None,
+        tournament_id: int = settings.DEFAULT_TOURNAMENT_ID,
+    ) -> Dict[LeaderboardMetric, List[Dict]]:
+        # All boards for a filter are built together and cached as one entry, so the overview and
+        # every /leaderboards metric share a single aggregate query
+        return self.cache.get_or_set(
+            ("leaderboards", tournament_id, round_name, match_type),
+            lambda: self._build_leaderboards(
+                self.repository.get_player_aggregates(tournament_id, round_name, match_type)
+            ),
+            tags=[("matches",), ("players",)],
+        )
+
+    def _build_leaderboards(self, rows: List[Mapping]) -> Dict[LeaderboardMetric, List[Dict]]:
+        summaries = [_summary(row, self.directory) for row in rows if row["matches_played"]]
+        boards = {}
+        for metric, (qualifies, sort_key, value, matches) in METRICS.items():
+            ranked = sorted((s for s in summaries if qualifies(s)), key=lambda s: (sort_key(s), s["player_name"] or ""))
+            board = []
+            previous_key = None
+            for position, summary in enumerate(ranked, start=1):
+                key = sort_key(summary)
+                # Equal records share a rank
+                rank = board[-1]["rank"] if key == previous_key else position
+                previous_key = key
+                board.append(
+                    {
+                        "rank": rank,
+                        "player_id": summary["player_id"],
+                        "player_name": summary["player_name"],
+                        "value": value(summary),
+                        "matches_played": summary["matches_played"],
+                        "wins": summary["wins"],
+                        "draws": summary["draws"],
+                        "losses": summary["losses"],
+                        "goals_scored": summary["goals_scored"],
+                        "goals_against": summary["goals_against"],
+                        "clean_sheets": summary["clean_sheets"],
+                        "matches": matches(summary),
+                    }
+                )
+            boards[metric] = board
+        return boards
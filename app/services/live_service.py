@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.notifications import ChangeFeed
+from app.repositories.match_repository import MatchRepository
+from app.services.standing_service import StandingService
+
+logger = logging.getLogger(__name__)
+
+STANDING_TABLES = ("tournament", "round1", "round2")
+
+
+class LiveService:
+    def __init__(
+        self,
+        queue_size: int = settings.LIVE_QUEUE_SIZE,
+        heartbeat: float = settings.LIVE_HEARTBEAT_SECONDS,
+        batch_window: float = settings.LIVE_BATCH_SECONDS,
+        max_match_events: int = settings.LIVE_MAX_MATCH_EVENTS,
+    ):
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.batch_window = batch_window
+        self.max_match_events = max_match_events
+        self.match_repository = MatchRepository()
+        self.standing_service = StandingService()
+        # Subscriber queues per tournament; a tournament is only present while someone follows it
+        self.subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._event_id = 0
+        self._last_standings: Dict[int, Dict] = {}
+        self._lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Dict] = []
+        self._flush: Optional[asyncio.Future] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop, feed: ChangeFeed) -> None:
+        self._loop = loop
+        feed.subscribe(self._on_change)
+
+    def _on_change(self, change: Dict) -> None:
+        # Called on the feed thread
+        if change.get("table") not in ("matches", "*") or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._queue_change, change)
+
+    def _queue_change(self, change: Dict) -> None:
+        # Updates and deletes notify once per row, so everything arriving within one window is handled together
+        self._pending.append(change)
+        if self._flush is None:
+            self._flush = asyncio.ensure_future(self._flush_pending())
+
+    async def _flush_pending(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        changes, self._pending, self._flush = self._pending, [], None
+        try:
+            await self.handle_changes(changes)
+        except Exception:
+            logger.exception("Failed to publish %d live changes", len(changes))
+
+    async def handle_changes(self, changes: List[Dict]) -> None:
+        async with self._lock:
+            # Nobody follows these any more, so their next subscriber gets a full standings delta
+            for tournament_id in list(self._last_standings):
+                if tournament_id not in self.subscribers:
+                    del self._last_standings[tournament_id]
+
+            for tournament_id in list(self.subscribers):
+                # Resync and polled changes carry no tournament and may affect every one
+                batch = [change for change in changes if change.get("tournament_id") in (None, tournament_id)]
+                if batch:
+                    await self._publish_changes(tournament_id, batch)
+
+    async def _publish_changes(self, tournament_id: int, changes: List[Dict]) -> None:
+        # The last change to each match wins. Multi-row inserts arrive as one change with a count and
+        # no id; polling and resync changes only say that something changed, so only standings are
+        # pushed for them
+        latest: Dict[int, Dict] = {}
+        unnamed = 0
+        for change in changes:
+            if change.get("id") is not None:
+                latest.pop(change["id"], None)
+                latest[change["id"]] = change
+            else:
+                unnamed += change.get("count") or 0
+        if unnamed or len(latest) > self.max_match_events:
+            # Too many to send one by one without overrunning subscriber queues; clients refetch
+            self.publish(tournament_id, "matches_changed", {"count": len(latest) + unnamed})
+        elif latest:
+            ids = [match_id for match_id, change in latest.items() if change.get("operation") != "DELETE"]
+            matches = {}
+            if ids:
+                rows = await run_in_threadpool(self.match_repository.get_matches_by_ids, ids, tournament_id)
+                matches = {row["id"]: row for row in rows}
+            for match_id, change in latest.items():
+                self.publish(tournament_id, self._event_type(change), {"id": match_id, "match": matches.get(match_id)})
+
+        standings = await self.standing_service.get_standings(tournament_id)
+        delta = self._standings_delta(self._last_standings.get(tournament_id), standings)
+        self._last_standings[tournament_id] = standings
+        if delta:
+            self.publish(tournament_id, "standings_delta", delta)
+
+    def publish(self, tournament_id: int, event: str, data: Dict) -> None:
+        # Encode once, hand the same bytes to every subscriber of the tournament
+        self._event_id += 1
+        frame = f"id: {self._event_id}\nevent: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n".encode()
+        for queue in list(self.subscribers.get(tournament_id, ())):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning("Dropping live subscriber that fell %d events behind", self.queue_size)
+                self._unsubscribe(tournament_id, queue)
+
+    async def subscribe(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(tournament_id, set()).add(queue)
+        try:
+            yield b"retry: 3000\n\n"
+            while queue in self.subscribers.get(tournament_id, ()) or not queue.empty():
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+        finally:
+            self._unsubscribe(tournament_id, queue)
+
+    def _unsubscribe(self, tournament_id: int, queue: asyncio.Queue) -> None:
+        queues = self.subscribers.get(tournament_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[tournament_id]
+
+    @staticmethod
+    def _event_type(change: Dict) -> str:
+        operation = change.get("operation")
+        if operation == "INSERT":
+            return "match_created"
+        if operation == "DELETE":
+            return "match_deleted"
+        return "score_updated" if change.get("score_changed") else "match_updated"
+
+    @staticmethod
+    def _standings_delta(previous: Optional[Dict], current: Dict) -> Dict:
+        delta = {}
+        for table in STANDING_TABLES:
+            old_rows = LiveService._ranked_rows((previous or {}).get(table, []))
+            new_rows = LiveService._ranked_rows(current.get(table, []))
+
+            updated: List[Dict] = [row for player_id, row in new_rows.items() if old_rows.get(player_id) != row]
+            removed = [player_id for player_id in old_rows if player_id not in new_rows]
+
+            if updated or removed:
+                delta[table] = {"updated": updated, "removed": removed}
+        return delta
+
+    @staticmethod
+    def _ranked_rows(rows: List[Dict]) -> Dict[int, Dict]:
+        return {row["player_id"]: {**row, "position": position} for position, row in enumerate(rows, start=1)}
+
+
+live_service = LiveService()
@@ -0,0 +1,228 @@
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.config import settings
+from app.repositories.match_event_repository import MatchEventRepository
+from app.services.rating_service import EloEngine
+
+# Bumped whenever the replay rules change, so snapshots written under the old rules are not reused
+SNAPSHOT_VERSION = 1
+
+# The parts of a match row the replay needs; snapshots keep only these
+REPLAY_FIELDS = (
+    "id",
+    "tournament_id",
+    "match_type",
+    "match_date",
+    "team1_player1_id",
+    "team1_player2_id",
+    "team2_player1_id",
+    "team2_player2_id",
+    "team1_goals",
+    "team2_goals",
+    "status",
+)
+
+# Per (tournament, player) totals, in this order
+TOTAL_FIELDS = ("matches_played", "wins", "draws", "losses", "goals_scored", "goals_against", "clean_sheets")
+
+
+def _is_completed(match: Mapping) -> bool:
+    return match["status"] == "COMPLETED" and match["team1_goals"] is not None and match["team2_goals"] is not None
+
+
+def _sides(match: Mapping):
+    # (player id, goals for, goals against) for every participant
+    for team, goals_for, goals_against in (
+        (1, match["team1_goals"], match["team2_goals"]),
+        (2, match["team2_goals"], match["team1_goals"]),
+    ):
+        for slot in (1, 2):
+            player_id = match[f"team{team}_player{slot}_id"]
+            if player_id is not None:
+                yield player_id, goals_for, goals_against
+
+
+def _points(match_type: str, goals_for: int, goals_against: int) -> int:
+    # Same rules as the update_player_stats trigger
+    win, draw = (3, 1) if match_type == "2v2" else (6, 2)
+    return win if goals_for > goals_against else draw if goals_for == goals_against else 0
+
+
+# The current state of every match plus per-player totals, advanced one event at a time. Edits and deletes
+# retract the match's previous contribution before applying the new one, so totals stay incremental.
+class ReplayState:
+    def __init__(self, last_event_id: int = 0):
+        self.last_event_id = last_event_id
+        self.matches: Dict[int, Dict] = {}
+        self.totals: Dict[Tuple[int, int], List[int]] = {}
+
+    def apply(self, event: Mapping) -> None:
+        previous = self.matches.pop(event["match_id"], None)
+        if previous is not None:
+            self._count(previous, -1)
+        if event["event_type"] != "deleted":
+            match = {field: event["payload"].get(field) for field in REPLAY_FIELDS}
+            self.matches[event["match_id"]] = match
+            self._count(match, 1)
+        self.last_event_id = event["event_id"]
+
+    def _count(self, match: Mapping, sign: int) -> None:
+        if not _is_completed(match):
+            return
+        for player_id, goals_for, goals_against in _sides(match):
+            key = (match["tournament_id"], player_id)
+            record = self.totals.setdefault(key, [0] * len(TOTAL_FIELDS))
+            record[0] += sign
+            record[1] += sign * (goals_for > goals_against)
+            record[2] += sign * (goals_for == goals_against)
+            record[3] += sign * (goals_for < goals_against)
+            record[4] += sign * goals_for
+            record[5] += sign * goals_against
+            record[6] += sign * (goals_against == 0)
+            if not record[0]:
+                del self.totals[key]
+
+    def completed_matches(self) -> List[Dict]:
+        # Ratings and streaks depend on the order matches were played, not the order they were logged
+        return sorted(
+            (match for match in self.matches.values() if _is_completed(match)),
+            key=lambda match: (match["match_date"], match["id"]),
+        )
+
+    def to_snapshot(self) -> Dict:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "matches": list(self.matches.values()),
+            "totals": [
+                [tournament_id, player_id, *record] for (tournament_id, player_id), record in self.totals.items()
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, last_event_id: int, snapshot: Mapping) -> Optional["ReplayState"]:
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            return None
+        state = cls(last_event_id)
+        state.matches = {match["id"]: match for match in snapshot["matches"]}
+        state.totals = {(row[0], row[1]): list(row[2:]) for row in snapshot["totals"]}
+        return state
+
+
+class MatchEventService:
+    def __init__(self):
+        self.repository = MatchEventRepository()
+        self.engine = EloEngine()
+        self.cache = result_cache
+
+    def get_events(self, match_id: Optional[int] = None, after_event_id: int = 0, limit: int = 100) -> List[Dict]:
+        try:
+            return self.repository.get_events(match_id, after_event_id, limit)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching match events: {str(e)}")
+
+    def replay(
+        self,
+        until_event_id: Optional[int] = None,
+        snapshot_interval: int = settings.EVENT_SNAPSHOT_INTERVAL,
+        batch_size: int = settings.EVENT_STREAM_BATCH_SIZE,
+    ) -> Dict:
+        # Rebuilds the state as of until_event_id (default: the latest event) from the newest usable snapshot
+        # and one pass over the events after it. Only a replay to the head of the log replaces match_stats
+        # and the ratings, reading the log and writing them in one transaction that match writes wait for;
+        # replaying to an earlier checkpoint just reports the state at that point.
+        snapshot = self.repository.get_latest_snapshot(until_event_id)
+        state = ReplayState.from_snapshot(snapshot["last_event_id"], snapshot["state"]) if snapshot else None
+        state = state or ReplayState()
+        started_from = state.last_event_id
+
+        persisted = until_event_id is None
+        with self.repository.head_replay() if persisted else nullcontext() as conn:
+            replayed = 0
+            for event in self.repository.stream_events(started_from, until_event_id, batch_size, conn=conn):
+                state.apply(event)
+                replayed += 1
+                if replayed % snapshot_interval == 0:
+                    self.repository.save_snapshot(state.last_event_id, state.to_snapshot())
+            if replayed % snapshot_interval:
+                self.repository.save_snapshot(state.last_event_id, state.to_snapshot())
+
+            completed = state.completed_matches()
+            ratings, history = self._rate(completed)
+            streaks = self._streaks(completed)
+
+            if persisted:
+                self.repository.replace_derived(
+                    self._match_stats(completed), history, self._rating_rows(ratings, history), conn=conn
+                )
+        if persisted:
+            self.cache.invalidate("ratings")
+
+        return {
+            "last_event_id": state.last_event_id,
+            "started_from_event_id": started_from,
+            "events_replayed": replayed,
+            "persisted": persisted,
+            "completed_matches": len(completed),
+            "players": [
+                {
+                    "tournament_id": tournament_id,
+                    "player_id": player_id,
+                    **dict(zip(TOTAL_FIELDS, record)),
+                    "current_streak": streaks.get((tournament_id, player_id), (0, 0))[0],
+                    "best_streak": streaks.get((tournament_id, player_id), (0, 0))[1],
+                }
+                for (tournament_id, player_id), record in sorted(state.totals.items())
+            ],
+            "ratings": [
+                {"entity_type": entity_type, "entity_key": entity_key, "rating": rating}
+                for (entity_type, entity_key), rating in sorted(ratings.items(), key=lambda item: -item[1])
+            ],
+        }
+
+    def _rate(self, completed: List[Dict]) -> Tuple[Dict[Tuple[str, str], float], List[Tuple]]:
+        ratings: Dict[Tuple[str, str], float] = {}
+        history = []
+        for match in completed:
+            for entity_type, entity_key, before, after in self.engine.rate_match(match, ratings):
+                history.append((match["id"], match["match_date"], entity_type, entity_key, before, after))
+        return ratings, history
+
+    @staticmethod
+    def _streaks(completed: List[Dict]) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        # (current, best) run of consecutive wins per (tournament, player), in match date order
+        streaks: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        for match in completed:
+            for player_id, goals_for, goals_against in _sides(match):
+                key = (match["tournament_id"], player_id)
+                current, best = streaks.get(key, (0, 0))
+                current = current + 1 if goals_for > goals_against else 0
+                streaks[key] = (current, max(best, current))
+        return streaks
+
+    @staticmethod
+    def _match_stats(completed: List[Dict]) -> List[Tuple]:
+        return [
+            (
+                match["id"],
+                match["tournament_id"],
+                player_id,
+                goals_for,
+                goals_against == 0,
+                _points(match["match_type"], goals_for, goals_against),
+            )
+            for match in completed
+            for player_id, goals_for, goals_against in _sides(match)
+        ]
+
+    @staticmethod
+    def _rating_rows(ratings: Dict[Tuple[str, str], float], history: List[Tuple]) -> List[Tuple]:
+        played = Counter((entity_type, entity_key) for _, _, entity_type, entity_key, _, _ in history)
+        return [
+            (entity_type, entity_key, rating, played[(entity_type, entity_key)])
+            for (entity_type, entity_key), rating in ratings.items()
+        ]
@@ -1,18 +1,88 @@
+from collections import defaultdict
 from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
-from models import MatchCreate, ScoreUpdate
+from fastapi import HTTPException
+from models import Match, MatchCreate, ScoreUpdate
+from starlette.concurrency import run_in_threadpool
 
+from app.cache import result_cache
+from app.config import settings
+from app.dataloader import DataLoader
+from app.player_directory import player_directory
 from app.repositories.match_repository import MatchRepository
+from app.serialization import RowEncoder, dumps
+from app.services.rating_service import RatingService
+
+MATCH_ENCODER = RowEncoder(Match)
 
 
 class MatchService:
     def __init__(self):
         self.repository = MatchRepository()
-
-    async def get_matches(self):
-        return await self.repository.get_matches()
-
-    async def create_match(self, match: MatchCreate):
+        self.rating_service = RatingService()
+        self.cache = result_cache
+        self.directory = player_directory
+        # Keyed by (tournament_id, match_id): single-match lookups that happen together share one query
+        self.loader = DataLoader(self._load_matches)
+
+    async def get_matches(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID):
+        return await self.cache.get_or_set_async(
+            ("matches:all", tournament_id),
+            lambda: self._get_matches_with_names(tournament_id),
+            tags=[("matches",), ("players",)],
+        )
+
+    async def _get_matches_with_names(self, tournament_id: int):
+        return [self.directory.with_names(match) for match in await self.repository.get_matches(tournament_id)]
+
+    async def get_matches_json(
+        self, fields: Optional[Tuple[str, ...]] = None, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID
+    ) -> bytes:
+        return await self.cache.get_or_set_async(
+            ("matches:json", tournament_id, fields),
+            lambda: self._encode_matches(fields, tournament_id),
+            tags=[("matches",), ("players",)],
+        )
+
+    async def _encode_matches(self, fields: Optional[Tuple[str, ...]], tournament_id: int) -> bytes:
+        if not fields:
+            return MATCH_ENCODER.encode(await self.repository.get_matches(tournament_id))
+        return RowEncoder(Match, fields).encode(await self.repository.get_matches(tournament_id, fields))
+
+    async def _load_matches(self, keys: List[Tuple[int, int]]) -> Dict[Tuple[int, int], dict]:
+        match_ids = defaultdict(list)
+        for tournament_id, match_id in keys:
+            match_ids[tournament_id].append(match_id)
+        found = {}
+        for tournament_id, ids in match_ids.items():
+            for row in await run_in_threadpool(self.repository.get_matches_by_ids, ids, tournament_id):
+                found[(tournament_id, row["id"])] = row
+        return found
+
+    async def get_match_by_id(self, match_id: int, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID):
+        match = await self.loader.load((tournament_id, match_id))
+        if not match:
+            raise HTTPException(status_code=404, detail=f"Match with ID {match_id} not found")
+        return match
+
+    async def get_matches_by_ids_json(
+        self,
+        match_ids: List[int],
+        fields: Optional[Tuple[str, ...]] = None,
+        tournament_id: int = settings.DEFAULT_TOURNAMENT_ID,
+    ) -> bytes:
+        # Found matches in the requested order, plus the ids that do not exist in the tournament
+        matches = await self.loader.load_many((tournament_id, match_id) for match_id in match_ids)
+        encoder = RowEncoder(Match, fields) if fields else MATCH_ENCODER
+        return dumps(
+            {
+                "matches": [encoder.project(match) for match in matches if match],
+                "missing_ids": [match_id for match_id, match in zip(match_ids, matches) if not match],
+            }
+        )
+
+    async def create_match(self, match: MatchCreate, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID):
         # Validate 2v2 match requirements
         if match.match_type == "2v2":
             if not all(
@@ -50,14 +120,14 @@ class MatchService:
         if match.match_date < datetime.now() and status == "SCHEDULED":
             raise ValueError("Scheduled matches cannot be in the past")
 
-        return await self.repository.create_match(match, scheduled_date, status, result)
-
-    async def update_match(self, match_id: int, match: MatchCreate):
-        # First check if match exists
-        existing_match = await self.repository.get_match_by_id(match_id)
-        if not existing_match:
-            raise ValueError("Match not found")
+        new_match = await self.repository.create_match(match, tournament_id, scheduled_date, status, result)
+        self.cache.invalidate("matches", new_match["id"])
+        await self.rating_service.on_match_written(None, new_match)
+        return new_match
 
+    async def update_match(
+        self, match_id: int, match: MatchCreate, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID
+    ):
         # Determine status and result based on goals
         if match.team1_goals is not None and match.team2_goals is not None:
             status = "COMPLETED"
@@ -73,14 +143,18 @@ class MatchService:
             match.team1_goals = None
             match.team2_goals = None
 
-        return await self.repository.update_match(match_id, match, status, result)
-
-    async def update_match_score(self, match_id: int, score: ScoreUpdate):
-        # Verify match exists
-        existing_match = await self.repository.get_match_by_id(match_id)
-        if not existing_match:
+        # The update only applies to an existing match, so it is also the existence check
+        updated = await self.repository.update_match(match_id, tournament_id, match, status, result)
+        if not updated:
             raise ValueError("Match not found")
-
+        existing_match, updated_match = updated
+        self.cache.invalidate("matches", match_id)
+        await self.rating_service.on_match_written(existing_match, updated_match)
+        return updated_match
+
+    async def update_match_score(
+        self, match_id: int, score: ScoreUpdate, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID
+    ):
         # Calculate result based on scores
         if score.team1_goals > score.team2_goals:
             result = "Team1"
@@ -89,12 +163,20 @@ class MatchService:
         else:
             result = "Draw"
 
-        return await self.repository.update_match_score(match_id, score.team1_goals, score.team2_goals, result)
-
-    async def delete_match(self, match_id: int):
-        # Verify match exists
-        existing_match = await self.repository.get_match_by_id(match_id)
-        if not existing_match:
+        updated = await self.repository.update_match_score(
+            match_id, tournament_id, score.team1_goals, score.team2_goals, result
+        )
+        if not updated:
             raise ValueError("Match not found")
-
-        return await self.repository.delete_match(match_id)
+        existing_match, updated_match = updated
+        self.cache.invalidate("matches", match_id)
+        await self.rating_service.on_match_written(existing_match, updated_match)
+        return updated_match
+
+    async def delete_match(self, match_id: int, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID):
+        deleted_match = await self.repository.delete_match(match_id, tournament_id)
+        if not deleted_match:
+            raise ValueError("Match not found")
+        self.cache.invalidate("matches", match_id)
+        await self.rating_service.on_match_written(deleted_match, None)
+        return deleted_match
@@ -2,23 +2,52 @@ from typing import Dict, Optional
 
 from fastapi import HTTPException
 
+from app.cache import result_cache
+from app.config import settings
+from app.models import LeaderboardMetric
+from app.player_directory import player_directory
 from app.repositories.overview_repository import OverviewRepository
+from app.services.format_service import FormatService
+from app.services.leaderboard_service import LeaderboardService
+from app.singleflight import SingleFlight
+
+# Shared by every OverviewService, so concurrent requests for the same overview run the queries once
+overview_flight = SingleFlight("overview")
 
 
 class OverviewService:
     def __init__(self):
         self.repository = OverviewRepository()
+        self.leaderboard_service = LeaderboardService()
+        self.format_service = FormatService()
+        self.cache = result_cache
+        self.directory = player_directory
+        self.flight = overview_flight
+
+    def get_overview_stats(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> Dict:
+        return self.cache.get_or_set(
+            ("overview", tournament_id),
+            lambda: self.flight.do(("overview", tournament_id), lambda: self._get_overview_stats(tournament_id)),
+            tags=[
+                ("matches",),
+                ("players",),
+                ("tournaments", tournament_id),
+                ("format_rounds",),
+                ("tournament_formats",),
+            ],
+        )
 
-    def get_overview_stats(self) -> Dict:
+    def _get_overview_stats(self, tournament_id: int) -> Dict:
         try:
-            progress = self._get_tournament_progress()
-            basic_stats = self._get_basic_tournament_stats()
-            top_scorer = self._get_top_scorer()
-            latest_match = self._get_latest_match()
-            highest_scoring = self._get_highest_scoring_match()
-            current_streak = self._get_current_streak()
-            best_defense = self._get_best_defense()
-            clean_sheets = self._get_clean_sheets()
+            progress = self._get_tournament_progress(tournament_id)
+            basic_stats = self._get_basic_tournament_stats(tournament_id)
+            leaderboards = self.leaderboard_service.get_leaderboards(tournament_id=tournament_id)
+            top_scorer = self._get_top_scorer(leaderboards)
+            latest_match = self._get_latest_match(tournament_id)
+            highest_scoring = self._get_highest_scoring_match(tournament_id)
+            current_streak = self._get_current_streak(tournament_id)
+            best_defense = self._get_best_defense(leaderboards)
+            clean_sheets = self._get_clean_sheets(leaderboards)
 
             return {
                 "progress": progress,
@@ -30,33 +59,52 @@ class OverviewService:
                 "bestDefense": best_defense,
                 "cleanSheets": clean_sheets,
             }
+        except HTTPException:
+            # e.g. the tournament has no format: a 404, not a server error
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error fetching overview stats: {str(e)}")
 
-    def _get_tournament_progress(self) -> Dict:
-        progress = self.repository.get_tournament_progress()
-        return (
-            {
-                "percentage": progress.get("completion_percentage", 0),
-                "matchesPlayed": progress.get("matches_played", 0),
-                "totalMatches": progress.get("total_expected_matches", 29),
-                "currentPhase": progress.get("current_phase", "League Phase"),
-                "phasePercentage": progress.get("phase_completion_percentage", 0),
-                "phaseTotalMatches": progress.get("phase_total_matches", 25),
-            }
-            if progress
-            else {
-                "percentage": 0,
-                "matchesPlayed": 0,
-                "totalMatches": 29,
-                "currentPhase": "League Phase",
-                "phasePercentage": 0,
-                "phaseTotalMatches": 25,
-            }
+    def _get_tournament_progress(self, tournament_id: int) -> Dict:
+        tournament_format = self.format_service.get_format(tournament_id)
+        played_by_round = {
+            row["round"]: row["matches_played"] for row in self.repository.get_completed_matches_by_round(tournament_id)
+        }
+        # Only the format's rounds count, each up to its expected matches, so matches in rounds the format
+        # does not list (or extra ones in a round) cannot push progress past 100%
+        matches_played = sum(
+            min(played_by_round.get(format_round["round"], 0), format_round["expected_matches"])
+            for format_round in tournament_format["rounds"]
         )
+        total_matches = tournament_format["total_matches"]
+
+        # The current phase is the first one whose matches are not all played yet
+        phases = tournament_format["phases"]
+        current = next((phase for phase in phases if matches_played < phase["cumulative_matches"]), phases[-1])
+        phase_played = matches_played - (current["cumulative_matches"] - current["expected_matches"])
+
+        return {
+            "percentage": round(matches_played * 100 / total_matches, 1) if total_matches else 0,
+            "matchesPlayed": matches_played,
+            "totalMatches": total_matches,
+            "currentPhase": current["name"],
+            "phasePercentage": (
+                round(phase_played * 100 / current["expected_matches"], 1) if current["expected_matches"] else 0
+            ),
+            "phaseTotalMatches": current["cumulative_matches"],
+            "rounds": [
+                {
+                    "round": format_round["round"],
+                    "phase": format_round["phase"],
+                    "matchesPlayed": played_by_round.get(format_round["round"], 0),
+                    "totalMatches": format_round["expected_matches"],
+                }
+                for format_round in tournament_format["rounds"]
+            ],
+        }
 
-    def _get_basic_tournament_stats(self) -> Dict:
-        basic_stats = self.repository.get_basic_tournament_stats()
+    def _get_basic_tournament_stats(self, tournament_id: int) -> Dict:
+        basic_stats = self.repository.get_basic_tournament_stats(tournament_id)
         return (
             {
                 "totalMatches": basic_stats.get("total_matches", 0),
@@ -67,22 +115,31 @@ class OverviewService:
             else {"totalMatches": 0, "totalGoals": 0, "averageGoals": 0}
         )
 
-    def _get_top_scorer(self) -> Optional[Dict]:
-        top_scorer = self.repository.get_top_scorer()
-        return (
-            {
-                "name": top_scorer.get("player_name"),
-                "goals": top_scorer.get("goals_scored"),
-                "matches": top_scorer.get("matches_played"),
-                "average": float(top_scorer.get("goals_per_game")),
-                "details": top_scorer.get("match_details", []),
-            }
-            if top_scorer
-            else None
-        )
+    def _get_top_scorer(self, leaderboards: Dict) -> Optional[Dict]:
+        board = leaderboards[LeaderboardMetric.GOALS]
+        if not board:
+            return None
+        leader = board[0]
+        return {
+            "name": leader["player_name"],
+            "goals": leader["goals_scored"],
+            "matches": leader["matches_played"],
+            "average": round(leader["goals_scored"] / leader["matches_played"], 2),
+            "details": [
+                {
+                    "match_date": match["match_date"],
+                    "match_type": match["match_type"],
+                    "goals_scored": match["goals_for"],
+                    "opponent": match["opponent"],
+                }
+                for match in leader["matches"]
+            ],
+        }
 
-    def _get_latest_match(self) -> Optional[Dict]:
-        latest_match = self.repository.get_latest_match()
+    def _get_latest_match(self, tournament_id: int) -> Optional[Dict]:
+        latest_match = self.repository.get_latest_match(tournament_id)
+        if latest_match:
+            latest_match = self.directory.with_names(latest_match)
         return (
             {
                 "team1": latest_match.get("team1_display_name"),
@@ -101,22 +158,15 @@ class OverviewService:
             else None
         )
 
-    def _get_highest_scoring_match(self) -> Optional[Dict]:
-        highest_scoring = self.repository.get_highest_scoring_match()
+    def _get_highest_scoring_match(self, tournament_id: int) -> Optional[Dict]:
+        highest_scoring = self.repository.get_highest_scoring_match(tournament_id)
         if not highest_scoring or highest_scoring.get("team1_goals") is None:
             return None
+        highest_scoring = self.directory.with_names(highest_scoring)
 
         return {
-            "team1": (
-                f"{highest_scoring.get('team1_player1_name')} & {highest_scoring.get('team1_player2_name')}"
-                if highest_scoring.get("team1_player2_name")
-                else highest_scoring.get("team1_player1_name")
-            ),
-            "team2": (
-                f"{highest_scoring.get('team2_player1_name')} & {highest_scoring.get('team2_player2_name')}"
-                if highest_scoring.get("team2_player2_name")
-                else highest_scoring.get("team2_player1_name")
-            ),
+            "team1": highest_scoring["team1_display_name"],
+            "team2": highest_scoring["team2_display_name"],
             "score1": highest_scoring.get("team1_goals", 0),
             "score2": highest_scoring.get("team2_goals", 0),
             "totalGoals": highest_scoring.get("total_goals", 0),
@@ -126,8 +176,8 @@ class OverviewService:
             "matchType": highest_scoring.get("match_type"),
         }
 
-    def _get_current_streak(self) -> Optional[Dict]:
-        streak = self.repository.get_current_streak()
+    def _get_current_streak(self, tournament_id: int) -> Optional[Dict]:
+        streak = self.repository.get_current_streak(tournament_id)
         return (
             {
                 "player": streak.get("player_name"),
@@ -141,36 +191,42 @@ class OverviewService:
             else None
         )
 
-    def _get_best_defense(self) -> Optional[Dict]:
-        best_defense = self.repository.get_best_defense()
-        return (
-            {
-                "player": best_defense.get("player_name"),
-                "goalsAgainst": best_defense.get("goals_against"),
-                "average": float(best_defense.get("average")),
-                "matches": best_defense.get("matches_played"),
-                "details": best_defense.get("match_details", []),
-            }
-            if best_defense
-            else None
-        )
+    def _get_best_defense(self, leaderboards: Dict) -> Optional[Dict]:
+        board = leaderboards[LeaderboardMetric.GOALS_AGAINST]
+        if not board:
+            return None
+        leader = board[0]
+        return {
+            "player": leader["player_name"],
+            "goalsAgainst": leader["goals_against"],
+            "average": round(leader["goals_against"] / leader["matches_played"], 2),
+            "matches": leader["matches_played"],
+            "details": [
+                {
+                    "match_date": match["match_date"],
+                    "match_type": match["match_type"],
+                    "goals_conceded": match["goals_against"],
+                    "opponent": match["opponent"],
+                }
+                for match in leader["matches"]
+            ],
+        }
 
-    def _get_clean_sheets(self) -> Optional[Dict]:
-        clean_sheets_data = self.repository.get_clean_sheets()
-        return (
-            {
-                "player": clean_sheets_data.get("player_name"),
-                "count": clean_sheets_data.get("count", 0),
-                "percentage": round(clean_sheets_data.get("percentage", 0), 1),
-                "matches": [
-                    {
-                        "date": match["match_date"],
-                        "opponent": match.get("opponent"),
-                        "matchType": match.get("match_type"),
-                    }
-                    for match in clean_sheets_data.get("matches_detail", [])
-                ],
-            }
-            if clean_sheets_data
-            else None
-        )
+    def _get_clean_sheets(self, leaderboards: Dict) -> Optional[Dict]:
+        board = leaderboards[LeaderboardMetric.CLEAN_SHEETS]
+        if not board:
+            return None
+        leader = board[0]
+        return {
+            "player": leader["player_name"],
+            "count": leader["clean_sheets"],
+            "percentage": round(leader["clean_sheets"] * 100 / leader["matches_played"], 1),
+            "matches": [
+                {
+                    "date": match["match_date"],
+                    "opponent": match["opponent"],
+                    "matchType": match["match_type"],
+                }
+                for match in leader["matches"]
+            ],
+        }
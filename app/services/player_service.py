@@ -1,42 +1,158 @@
-from typing import List
+import logging
+from typing import List, Mapping, Optional, Tuple
 
 from fastapi import HTTPException
+from psycopg2.errors import UndefinedFunction
 
-from app.models import Player, PlayerCreate
+from app.cache import result_cache
+from app.config import settings
+from app.models import Player, PlayerCreate, PlayerSearchResult
+from app.player_directory import player_directory
 from app.repositories.player_repository import PlayerRepository
+from app.serialization import RowEncoder, dumps
+
+logger = logging.getLogger(__name__)
+
+PLAYER_ENCODER = RowEncoder(Player)
+SEARCH_ENCODER = RowEncoder(PlayerSearchResult)
 
 
 class PlayerService:
+    # Whether searches go to pg_trgm; shared by every instance and switched off for good the first time
+    # a search finds the extension missing (PLAYER_SEARCH_BACKEND=auto)
+    trigram_search = settings.PLAYER_SEARCH_BACKEND != "prefix"
+
     def __init__(self):
         self.repository = PlayerRepository()
+        self.cache = result_cache
+        self.directory = player_directory
 
     def get_all_players(self) -> List[Player]:
         try:
-            players = self.repository.get_all_players()
-            return [Player(**player) for player in players]
+            return self.cache.get_or_set(
+                "players:all",
+                lambda: [Player(**player) for player in self.repository.get_all_players()],
+                tags=[("players",)],
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching players: {str(e)}")
+
+    def get_all_players_json(
+        self,
+        fields: Optional[Tuple[str, ...]] = None,
+        include_stats: bool = False,
+        tournament_id: Optional[int] = None,
+    ) -> bytes:
+        # Without a tournament every player is listed; statistics are always for one tournament
+        if include_stats and tournament_id is None:
+            tournament_id = settings.DEFAULT_TOURNAMENT_ID
+        tags = [("players",), ("matches",)] if include_stats or tournament_id is not None else [("players",)]
+        try:
+            return self.cache.get_or_set(
+                ("players:json", tournament_id, fields, include_stats),
+                lambda: self._encode_players(fields, include_stats, tournament_id),
+                tags=tags,
+            )
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error fetching players: {str(e)}")
 
+    def _encode_players(
+        self, fields: Optional[Tuple[str, ...]], include_stats: bool, tournament_id: Optional[int]
+    ) -> bytes:
+        encoder = RowEncoder(Player, fields) if fields else PLAYER_ENCODER
+        if include_stats:
+            return encoder.encode(self.repository.get_player_stats(tournament_id))
+        return encoder.encode(self.repository.get_all_players(fields, tournament_id))
+
+    def search_players_json(self, query: str, limit: int = settings.PLAYER_SEARCH_LIMIT) -> bytes:
+        return SEARCH_ENCODER.encode(self.search_players(query, limit))
+
+    def search_players(self, query: str, limit: int = settings.PLAYER_SEARCH_LIMIT) -> List[Mapping]:
+        query = query.strip()
+        if not query:
+            return []
+        if type(self).trigram_search:
+            try:
+                return self.repository.search_players(query, limit)
+            except UndefinedFunction as e:
+                # pg_trgm's operators and functions are not installed
+                if settings.PLAYER_SEARCH_BACKEND == "trigram":
+                    raise HTTPException(status_code=500, detail=f"Error searching players: {str(e)}")
+                logger.warning("pg_trgm is not available, searching players in process: %s", e)
+                type(self).trigram_search = False
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error searching players: {str(e)}")
+        return self.directory.search(query, limit)
+
+    def get_player_stats(self, player_id: int, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> Player:
+        return self.cache.get_or_set(
+            ("players:stats", tournament_id, player_id),
+            lambda: self._load_player_stats(player_id, tournament_id),
+            tags=[("players", player_id), ("matches",)],
+        )
+
+    def _load_player_stats(self, player_id: int, tournament_id: int) -> Player:
+        players = self.repository.get_player_stats(tournament_id, player_id)
+        if not players:
+            raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+        return Player(**players[0])
+
     def create_player(self, player: PlayerCreate) -> Player:
         try:
             # Additional business logic can be added here
             # For example, validating player name format, checking for duplicates, etc.
             new_player = self.repository.create_player(player)
+            self.cache.invalidate("players", new_player["player_id"])
+            self.directory.invalidate()
             return Player(**new_player)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Error creating player: {str(e)}")
 
     def get_player_by_id(self, player_id: int) -> Player:
+        return self.cache.get_or_set(
+            ("players", player_id), lambda: self._load_player(player_id), tags=[("players", player_id)]
+        )
+
+    def _load_player(self, player_id: int) -> Player:
         player = self.repository.get_player_by_id(player_id)
         if not player:
             raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
         return Player(**player)
 
+    def get_players_by_ids_json(self, player_ids: List[int], fields: Optional[Tuple[str, ...]] = None) -> bytes:
+        # Players already cached individually are reused; the rest come from one query
+        players = {player_id: self.cache.get(("players", player_id)) for player_id in player_ids}
+        uncached = [player_id for player_id, player in players.items() if player is None]
+        if uncached:
+            generations = {player_id: self.cache.generation([("players", player_id)]) for player_id in uncached}
+            try:
+                rows = self.repository.get_players_by_ids(uncached)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error fetching players: {str(e)}")
+            for row in rows:
+                player = players[row["player_id"]] = Player(**row)
+                self.cache.set_if_current(
+                    ("players", player.player_id),
+                    player,
+                    [("players", player.player_id)],
+                    generations[player.player_id],
+                )
+
+        encoder = RowEncoder(Player, fields) if fields else PLAYER_ENCODER
+        return dumps(
+            {
+                "players": [encoder.project(player.model_dump()) for player in players.values() if player],
+                "missing_ids": [player_id for player_id, player in players.items() if player is None],
+            }
+        )
+
     def delete_player(self, player_id: int) -> Player:
         try:
             deleted_player = self.repository.delete_player(player_id)
             if not deleted_player:
                 raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+            self.cache.invalidate("players", player_id)
+            self.directory.invalidate()
             return Player(**deleted_player)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
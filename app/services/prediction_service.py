@@ -0,0 +1,232 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.config import settings
+from app.player_directory import player_directory
+from app.repositories.prediction_repository import PredictionRepository
+
+# Same points rules as StandingRepository: (win, draw) per league round and format
+LEAGUE_POINTS = {("Round 1", "1v1"): (6, 2), ("Round 2", "2v2"): (3, 1)}
+
+# Goals per side per match assumed before any result is in
+DEFAULT_MEAN_GOALS = 1.5
+# Pseudo-matches at the league average blended into every player's attack and defense strength, so
+# one lopsided result does not dominate a player's forecast
+PRIOR_MATCHES = 2
+MIN_EXPECTED_GOALS = 0.05
+
+
+def _side(row: Mapping, team: int) -> Tuple[int, ...]:
+    return tuple(
+        player_id
+        for player_id in (row[f"team{team}_player1_id"], row[f"team{team}_player2_id"])
+        if player_id is not None
+    )
+
+
+def _league_points(row: Mapping) -> Optional[Tuple[int, int]]:
+    return LEAGUE_POINTS.get((row["round"], row["match_type"]))
+
+
+class ScoringModel:
+    # Independent Poisson goals: a side's expected goals are the league mean scaled by its attack
+    # strength and the opponent's defensive weakness (2v2 sides average their two players)
+    def __init__(self, completed: List[Mapping]):
+        scored: Dict[int, int] = {}
+        conceded: Dict[int, int] = {}
+        played: Dict[int, int] = {}
+        total_goals = 0
+        for row in completed:
+            total_goals += row["team1_goals"] + row["team2_goals"]
+            for team, goals_for, goals_against in (
+                (1, row["team1_goals"], row["team2_goals"]),
+                (2, row["team2_goals"], row["team1_goals"]),
+            ):
+                for player_id in _side(row, team):
+                    scored[player_id] = scored.get(player_id, 0) + goals_for
+                    conceded[player_id] = conceded.get(player_id, 0) + goals_against
+                    played[player_id] = played.get(player_id, 0) + 1
+
+        self.mean_goals = total_goals / (2 * len(completed)) if completed else DEFAULT_MEAN_GOALS
+        self.attack: Dict[int, float] = {}
+        self.defense: Dict[int, float] = {}
+        if not self.mean_goals:
+            return
+        prior_goals = PRIOR_MATCHES * self.mean_goals
+        for player_id, matches in played.items():
+            baseline = (matches + PRIOR_MATCHES) * self.mean_goals
+            self.attack[player_id] = (scored[player_id] + prior_goals) / baseline
+            self.defense[player_id] = (conceded[player_id] + prior_goals) / baseline
+
+    def expected_goals(self, side: Tuple[int, ...], opponent: Tuple[int, ...]) -> float:
+        attack = sum(self.attack.get(player_id, 1.0) for player_id in side) / len(side)
+        defense = sum(self.defense.get(player_id, 1.0) for player_id in opponent) / len(opponent)
+        return max(self.mean_goals * attack * defense, MIN_EXPECTED_GOALS)
+
+
+class TournamentSimulator:
+    # Plain arrays only, so it pickles cheaply into worker processes
+    def __init__(self, player_ids: List[int], completed: List[Mapping], fixtures: List[Mapping]):
+        self.player_ids = player_ids
+        index = {player_id: i for i, player_id in enumerate(player_ids)}
+        size = len(player_ids)
+
+        self.base_points = np.zeros(size, dtype=np.int64)
+        self.base_goal_difference = np.zeros(size, dtype=np.int64)
+        for row in completed:
+            rules = _league_points(row)
+            if rules is None:
+                continue
+            win, draw = rules
+            difference = row["team1_goals"] - row["team2_goals"]
+            for team, sign in ((1, 1), (2, -1)):
+                points = win if difference * sign > 0 else draw if difference == 0 else 0
+                for player_id in _side(row, team):
+                    self.base_points[index[player_id]] += points
+                    self.base_goal_difference[index[player_id]] += difference * sign
+
+        model = ScoringModel(completed)
+        # Fixture m puts +1 in side1[m] and side2[m] for each player on that side
+        self.side1 = np.zeros((len(fixtures), size), dtype=np.int64)
+        self.side2 = np.zeros((len(fixtures), size), dtype=np.int64)
+        self.expected1 = np.zeros(len(fixtures))
+        self.expected2 = np.zeros(len(fixtures))
+        self.win_points = np.zeros(len(fixtures), dtype=np.int64)
+        self.draw_points = np.zeros(len(fixtures), dtype=np.int64)
+        for m, row in enumerate(fixtures):
+            team1, team2 = _side(row, 1), _side(row, 2)
+            for player_id in team1:
+                self.side1[m, index[player_id]] = 1
+            for player_id in team2:
+                self.side2[m, index[player_id]] = 1
+            self.expected1[m] = model.expected_goals(team1, team2)
+            self.expected2[m] = model.expected_goals(team2, team1)
+            self.win_points[m], self.draw_points[m] = _league_points(row)
+
+    def simulate(
+        self, iterations: int, seed=None, chunk_size: int = settings.PREDICTION_CHUNK_SIZE
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Iterations run chunk_size at a time: (chunk, fixtures) goal matrices, then one matrix product per
+        # side to total points and goal difference, so memory follows the chunk and not the iteration
+        # count. Returns finishing-position counts (player x position) and each player's summed final points.
+        rng = np.random.default_rng(seed)
+        size = len(self.player_ids)
+        counts = np.zeros((size, size), dtype=np.int64)
+        total_points = np.zeros(size, dtype=np.int64)
+        for start in range(0, iterations, chunk_size):
+            chunk = min(chunk_size, iterations - start)
+            goals1 = rng.poisson(self.expected1, size=(chunk, len(self.expected1)))
+            goals2 = rng.poisson(self.expected2, size=(chunk, len(self.expected2)))
+            difference = goals1 - goals2
+
+            draw_points = np.where(difference == 0, self.draw_points, 0)
+            points1 = np.where(difference > 0, self.win_points, draw_points)
+            points2 = np.where(difference < 0, self.win_points, draw_points)
+            points = self.base_points + points1 @ self.side1 + points2 @ self.side2
+            goal_difference = self.base_goal_difference + difference @ (self.side1 - self.side2)
+
+            # Rank by points, then goal difference, then a coin toss; order[i, k] is the player in position k
+            order = np.lexsort((rng.random((chunk, size)), -goal_difference, -points), axis=-1)
+            cells = order * size + np.arange(size)
+            counts += np.bincount(cells.ravel(), minlength=size * size).reshape(size, size)
+            total_points += points.sum(axis=0)
+        return counts, total_points
+
+
+# One pool per worker count for the life of the process; starting worker processes per request would cost
+# more than most simulations
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _simulate_batch(simulator: TournamentSimulator, iterations: int, seed) -> Tuple[np.ndarray, np.ndarray]:
+    return simulator.simulate(iterations, seed)
+
+
+def run_simulation(
+    simulator: TournamentSimulator, iterations: int, workers: int = 1, seed=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    if workers <= 1 or iterations < workers:
+        return simulator.simulate(iterations, seed)
+
+    # Independent streams per batch so workers never repeat each other's samples
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    batches = [iterations // workers + (1 if i < iterations % workers else 0) for i in range(workers)]
+    results = list(_get_pool(workers).map(_simulate_batch, [simulator] * workers, batches, seeds))
+    return sum(counts for counts, _ in results), sum(points for _, points in results)
+
+
+class PredictionService:
+    def __init__(self):
+        self.repository = PredictionRepository()
+        self.cache = result_cache
+        self.directory = player_directory
+
+    def get_predictions(
+        self, iterations: int = settings.PREDICTION_ITERATIONS, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID
+    ) -> Dict:
+        try:
+            return self.cache.get_or_set(
+                ("predictions", tournament_id, iterations),
+                lambda: self._get_predictions(iterations, tournament_id),
+                tags=[("matches",), ("players",)],
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error computing predictions: {str(e)}")
+
+    def _get_predictions(self, iterations: int, tournament_id: int) -> Dict:
+        rows = self.repository.get_simulation_source(tournament_id)
+        completed = [row for row in rows if row["status"] == "COMPLETED"]
+        fixtures = [row for row in rows if row["status"] == "SCHEDULED" and _league_points(row) is not None]
+
+        player_ids = sorted(
+            {
+                player_id
+                for row in completed + fixtures
+                if _league_points(row) is not None
+                for team in (1, 2)
+                for player_id in _side(row, team)
+            }
+        )
+        if not player_ids:
+            return {"iterations": iterations, "remaining_matches": len(fixtures), "players": []}
+
+        simulator = TournamentSimulator(player_ids, completed, fixtures)
+        counts, points = run_simulation(simulator, iterations, settings.PREDICTION_WORKERS)
+        qualifiers = min(settings.PREDICTION_QUALIFIERS, len(player_ids))
+
+        players = [
+            {
+                "player_id": player_id,
+                "player_name": self.directory.get(player_id),
+                "current_points": int(simulator.base_points[i]),
+                "expected_points": round(float(points[i]) / iterations, 2),
+                "title_probability": round(float(counts[i, 0]) / iterations, 4),
+                "qualification_probability": round(float(counts[i, :qualifiers].sum()) / iterations, 4),
+                "position_probabilities": [round(float(count) / iterations, 4) for count in counts[i]],
+            }
+            for i, player_id in enumerate(player_ids)
+        ]
+        players.sort(key=lambda p: (-p["title_probability"], -p["qualification_probability"], -p["expected_points"]))
+        return {"iterations": iterations, "remaining_matches": len(fixtures), "players": players}
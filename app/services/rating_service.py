@@ -0,0 +1,117 @@
+import logging
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from app.cache import result_cache
+from app.config import settings
+from app.metrics import metrics
+from app.models import Rating, RatingHistoryEntry, RatingType
+from app.repositories.rating_repository import RatingRepository
+
+logger = logging.getLogger(__name__)
+
+RatingKey = Tuple[str, str]
+
+
+def team_key(player_ids) -> str:
+    return "-".join(str(player_id) for player_id in sorted(player_ids))
+
+
+class EloEngine:
+    def __init__(self, k_factor: float = settings.RATING_K_FACTOR, initial_rating: float = settings.RATING_INITIAL):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+
+    def expected(self, rating: float, opponent_rating: float) -> float:
+        return 1 / (1 + 10 ** ((opponent_rating - rating) / 400))
+
+    def rate_match(self, match: Mapping, ratings: Dict[RatingKey, float]) -> List[Tuple[str, str, float, float]]:
+        # Updates ratings in place; returns (entity_type, entity_key, before, after) per rated entity
+        team1 = [p for p in (match["team1_player1_id"], match["team1_player2_id"]) if p is not None]
+        team2 = [p for p in (match["team2_player1_id"], match["team2_player2_id"]) if p is not None]
+        goals1, goals2 = match["team1_goals"], match["team2_goals"]
+        score1 = 1.0 if goals1 > goals2 else 0.5 if goals1 == goals2 else 0.0
+
+        changes = []
+        # Players: a 2v2 side plays at its average rating and every member gets the side's delta
+        side1 = [("player", str(p)) for p in team1]
+        side2 = [("player", str(p)) for p in team2]
+        changes.extend(self._rate_sides(side1, side2, score1, ratings))
+        if match["match_type"] == "2v2":
+            changes.extend(self._rate_sides([("team", team_key(team1))], [("team", team_key(team2))], score1, ratings))
+        return changes
+
+    def _rate_sides(
+        self, side1: List[RatingKey], side2: List[RatingKey], score1: float, ratings: Dict[RatingKey, float]
+    ):
+        rating1 = sum(ratings.get(key, self.initial_rating) for key in side1) / len(side1)
+        rating2 = sum(ratings.get(key, self.initial_rating) for key in side2) / len(side2)
+        delta = self.k_factor * (score1 - self.expected(rating1, rating2))
+
+        changes = []
+        for keys, side_delta in ((side1, delta), (side2, -delta)):
+            for key in keys:
+                before = ratings.get(key, self.initial_rating)
+                ratings[key] = before + side_delta
+                changes.append((key[0], key[1], before, ratings[key]))
+        return changes
+
+
+class RatingService:
+    def __init__(self):
+        self.repository = RatingRepository()
+        self.engine = EloEngine()
+        self.cache = result_cache
+
+    async def on_match_written(self, before: Optional[Mapping], after: Optional[Mapping]) -> None:
+        # Re-rates from the earliest affected completed match. A new result after the last rated match
+        # replays just itself; editing or deleting an old one replays everything after it, so the replay
+        # runs in the threadpool rather than on the event loop.
+        positions = [(row["match_date"], row["id"]) for row in (before, after) if self._is_rated(row)]
+        if not positions:
+            return
+        match_date, match_id = min(positions)
+        try:
+            await run_in_threadpool(self.repository.replay_from, match_date, match_id, self.engine)
+            self.cache.invalidate("ratings")
+        except Exception:
+            # The match write itself has already been committed. Counted in /metrics; POST /ratings/rebuild
+            # repairs the ratings.
+            logger.exception("Failed to update ratings after match %s", match_id)
+            metrics.increment("rating_replay_failures")
+
+    def rebuild(self) -> Dict[str, int]:
+        try:
+            replayed = self.repository.replay_from(None, None, self.engine)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error rebuilding ratings: {str(e)}")
+        self.cache.invalidate("ratings")
+        return {"replayed": replayed}
+
+    def get_leaderboard(self, entity_type: RatingType = RatingType.PLAYER, limit: int = 50) -> List[Rating]:
+        try:
+            return self.cache.get_or_set(
+                ("ratings", entity_type.value, limit),
+                lambda: [Rating(**row) for row in self.repository.get_leaderboard(entity_type.value, limit)],
+                tags=[("ratings",), ("players",)],
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching ratings: {str(e)}")
+
+    def get_history(self, entity_type: RatingType, entity_key: str) -> List[RatingHistoryEntry]:
+        history = self.repository.get_history(entity_type.value, entity_key)
+        if not history:
+            raise HTTPException(status_code=404, detail=f"No rating history for {entity_type.value} {entity_key}")
+        return [RatingHistoryEntry(**row) for row in history]
+
+    @staticmethod
+    def _is_rated(row: Optional[Mapping]) -> bool:
+        return (
+            row is not None
+            and row.get("status") == "COMPLETED"
+            and row.get("team1_goals") is not None
+            and row.get("team2_goals") is not None
+            and row.get("match_date") is not None
+        )
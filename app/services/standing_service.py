@@ -1,15 +1,35 @@
 from typing import Dict, List
 
+from starlette.concurrency import run_in_threadpool
+
+from app.cache import result_cache
+from app.config import settings
 from app.repositories.standing_repository import StandingRepository
+from app.singleflight import SingleFlight
+
+# Shared by every StandingService, so concurrent requests for the same standings run the queries once
+standings_flight = SingleFlight("standings")
 
 
 class StandingService:
     def __init__(self):
         self.repository = StandingRepository()
+        self.cache = result_cache
+        self.flight = standings_flight
+
+    async def get_standings(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> Dict:
+        # The queries block, so they run in the threadpool, where concurrent requests overlap and share one
+        # computation
+        key = ("standings", tournament_id)
+        return await self.cache.get_or_set_async(
+            key,
+            lambda: run_in_threadpool(self.flight.do, key, lambda: self._get_standings(tournament_id)),
+            tags=[("matches",), ("players",)],
+        )
 
-    async def get_standings(self) -> Dict:
-        round1_standings = await self.repository.get_round1_standings()
-        round2_standings = await self.repository.get_round2_standings()
+    def _get_standings(self, tournament_id: int) -> Dict:
+        round1_standings = self.repository.get_round1_standings(tournament_id)
+        round2_standings = self.repository.get_round2_standings(tournament_id)
 
         tournament_standings = self._calculate_tournament_standings(round1_standings, round2_standings)
 
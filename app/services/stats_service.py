@@ -0,0 +1,99 @@
+from typing import Dict, Hashable, List, Tuple
+
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.config import settings
+from app.player_directory import player_directory
+from app.repositories.stats_repository import StatsRepository
+from app.serialization import dumps
+
+# Per ordered pair of sides: played, wins, draws, goals scored
+PLAYED, WINS, DRAWS, GOALS = range(4)
+
+
+# Pairwise results for one kind of side (single players or 2v2 partnerships), accumulated in a single
+# pass and emitted as row-major n*n arrays: cell [i * n + j] is side i's record against side j.
+# Losses and goals against are the transposed cells ([j * n + i]), so they are not sent.
+class PairwiseMatrix:
+    def __init__(self):
+        self.records: Dict[Tuple[Hashable, Hashable], List[int]] = {}
+
+    def add(self, side1: Hashable, side2: Hashable, goals1: int, goals2: int) -> None:
+        self._add(side1, side2, goals1, goals2)
+        self._add(side2, side1, goals2, goals1)
+
+    def _add(self, side: Hashable, opponent: Hashable, goals_for: int, goals_against: int) -> None:
+        record = self.records.get((side, opponent))
+        if record is None:
+            record = self.records[(side, opponent)] = [0, 0, 0, 0]
+        record[PLAYED] += 1
+        record[GOALS] += goals_for
+        if goals_for > goals_against:
+            record[WINS] += 1
+        elif goals_for == goals_against:
+            record[DRAWS] += 1
+
+    def encode(self) -> Tuple[List[Hashable], Dict[str, List[int]]]:
+        sides = sorted({side for side, _ in self.records})
+        index = {side: i for i, side in enumerate(sides)}
+        size = len(sides)
+        arrays = {name: [0] * (size * size) for name in ("played", "wins", "draws", "goals")}
+        for (side, opponent), record in self.records.items():
+            cell = index[side] * size + index[opponent]
+            arrays["played"][cell] = record[PLAYED]
+            arrays["wins"][cell] = record[WINS]
+            arrays["draws"][cell] = record[DRAWS]
+            arrays["goals"][cell] = record[GOALS]
+        return sides, arrays
+
+
+class StatsService:
+    def __init__(self):
+        self.repository = StatsRepository()
+        self.cache = result_cache
+        self.directory = player_directory
+
+    def get_head_to_head_json(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> bytes:
+        try:
+            return self.cache.get_or_set(
+                ("stats:head-to-head", tournament_id),
+                lambda: dumps(self.get_head_to_head(tournament_id)),
+                tags=[("matches",), ("players",)],
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching head-to-head stats: {str(e)}")
+
+    def get_head_to_head(self, tournament_id: int = settings.DEFAULT_TOURNAMENT_ID) -> Dict:
+        matches = self.repository.get_head_to_head_source(tournament_id)
+        singles, partnerships = PairwiseMatrix(), PairwiseMatrix()
+
+        for match_type, t1p1, t1p2, t2p1, t2p2, team1_goals, team2_goals in matches:
+            if match_type == "2v2":
+                partnerships.add(self._team(t1p1, t1p2), self._team(t2p1, t2p2), team1_goals, team2_goals)
+            else:
+                singles.add(t1p1, t2p1, team1_goals, team2_goals)
+
+        players, singles_arrays = singles.encode()
+        teams, partnership_arrays = partnerships.encode()
+        return {
+            "1v1": {
+                "size": len(players),
+                "players": [
+                    {"player_id": player_id, "player_name": self.directory.get(player_id)} for player_id in players
+                ],
+                **singles_arrays,
+            },
+            "2v2": {
+                "size": len(teams),
+                "teams": [
+                    {"player_ids": list(team), "name": self.directory.team_name(team)} for team in teams
+                ],
+                **partnership_arrays,
+            },
+        }
+
+    @staticmethod
+    def _team(player1: int, player2: int) -> Tuple[int, ...]:
+        # A partnership is the same team whichever slot each player was entered in
+        return tuple(sorted(player_id for player_id in (player1, player2) if player_id is not None))
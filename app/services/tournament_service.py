@@ -0,0 +1,38 @@
+from typing import List
+
+from fastapi import HTTPException
+
+from app.cache import result_cache
+from app.models import Tournament, TournamentCreate
+from app.repositories.tournament_repository import TournamentRepository
+
+
+class TournamentService:
+    def __init__(self):
+        self.repository = TournamentRepository()
+        self.cache = result_cache
+
+    def get_tournaments(self) -> List[Tournament]:
+        try:
+            return self.cache.get_or_set(
+                "tournaments:all",
+                lambda: [Tournament(**tournament) for tournament in self.repository.get_tournaments()],
+                tags=[("tournaments",)],
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching tournaments: {str(e)}")
+
+    def get_tournament_by_id(self, tournament_id: int) -> Tournament:
+        tournament = self.repository.get_tournament_by_id(tournament_id)
+        if not tournament:
+            raise HTTPException(status_code=404, detail=f"Tournament with ID {tournament_id} not found")
+        return Tournament(**tournament)
+
+    def create_tournament(self, tournament: TournamentCreate) -> Tournament:
+        try:
+            # Duplicate names and unknown formats are rejected by the table constraints
+            new_tournament = self.repository.create_tournament(tournament)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Error creating tournament: {str(e)}")
+        self.cache.invalidate("tournaments", new_tournament["tournament_id"])
+        return Tournament(**new_tournament)
@@ -0,0 +1,48 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.metrics import Metrics, metrics
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+# Coalesces concurrent identical computations: the first caller for a key runs the loader, every caller
+# that arrives while it is in flight waits for and shares its result (or exception). Nothing is kept
+# once the call finishes; caching finished results is ResultCache's job.
+class SingleFlight:
+    def __init__(self, name: str, registry: Metrics = metrics):
+        self.name = name
+        self.metrics = registry
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self.metrics.increment("singleflight_coalesced", self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        self.metrics.increment("singleflight_executed", self.name)
+        try:
+            call.value = loader()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
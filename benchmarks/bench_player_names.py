@@ -0,0 +1,114 @@
+"""/matches query time: four LEFT JOINs on players vs bare ids plus names from the player directory.
+
+Needs the PostgreSQL configured through the POSTGRES_* variables. Loads sql/create.sql into a scratch
+schema, fills it with generated matches and drops it afterwards.
+
+Run from the repository root: python -m benchmarks.bench_player_names [matches] [players] [repeats]
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from psycopg2.extras import execute_values
+
+from app.database import get_connection
+from app.player_directory import PlayerDirectory
+from app.rows import CompactCursor
+
+SCHEMA_FILE = Path(__file__).resolve().parents[1] / "sql" / "create.sql"
+
+JOIN_QUERY = """
+    SELECT m.*,
+           p1.player_name as team1_player1_name,
+           p2.player_name as team1_player2_name,
+           p3.player_name as team2_player1_name,
+           p4.player_name as team2_player2_name
+    FROM matches m
+    LEFT JOIN players p1 ON m.team1_player1_id = p1.player_id
+    LEFT JOIN players p2 ON m.team1_player2_id = p2.player_id
+    LEFT JOIN players p3 ON m.team2_player1_id = p3.player_id
+    LEFT JOIN players p4 ON m.team2_player2_id = p4.player_id
+    WHERE m.tournament_id = 1
+    ORDER BY m.match_date DESC
+"""
+
+BARE_QUERY = "SELECT * FROM matches m WHERE m.tournament_id = 1 ORDER BY m.match_date DESC"
+
+
+def seed(cur, matches: int, players: int) -> None:
+    cur.execute(
+        "INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, %s) n RETURNING player_id",
+        (players,),
+    )
+    ids = [row[0] for row in cur.fetchall()]
+    start = datetime(2024, 1, 1, 18, 0)
+    rows = []
+    for i in range(matches):
+        date = start + timedelta(hours=i)
+        a, b, c, d = (ids[(i + k) % len(ids)] for k in range(4))
+        if i % 2:
+            rows.append(("Round 2", "2v2", a, b, c, d, date, date, i % 5, i % 3, "COMPLETED"))
+        else:
+            rows.append(("Round 1", "1v1", a, None, c, None, date, date, i % 5, i % 3, "COMPLETED"))
+    execute_values(
+        cur,
+        """
+        INSERT INTO matches (
+            round, match_type, team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id,
+            match_date, scheduled_date, team1_goals, team2_goals, status
+        ) VALUES %s
+        """,
+        rows,
+        page_size=1000,
+    )
+    cur.execute("ANALYZE")
+
+
+def best_of(repeats: int, run) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(matches: int, players: int, repeats: int) -> None:
+    conn = get_connection()
+    conn.autocommit = True
+    schema = f"bench_{uuid.uuid4().hex[:12]}"
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+        cur.execute(f"SET search_path TO {schema}")
+        cur.execute(SCHEMA_FILE.read_text())
+        seed(cur, matches, players)
+
+    def fetch(query):
+        with conn.cursor(cursor_factory=CompactCursor) as cur:
+            cur.execute(query)
+            return cur.fetchall()
+
+    def load_names():
+        return {row["player_id"]: row["player_name"] for row in fetch("SELECT player_id, player_name FROM players")}
+
+    try:
+        directory = PlayerDirectory(load_names)
+        directory.names()
+        print(f"{matches} matches, {players} players, best of {repeats}")
+        joined = best_of(repeats, lambda: fetch(JOIN_QUERY))
+        bare = best_of(repeats, lambda: fetch(BARE_QUERY))
+        filled = best_of(repeats, lambda: [directory.with_names(row) for row in fetch(BARE_QUERY)])
+        print(f"  {'4 player joins':<28} {joined * 1000:8.1f} ms")
+        print(f"  {'bare ids':<28} {bare * 1000:8.1f} ms")
+        print(f"  {'bare ids + directory names':<28} {filled * 1000:8.1f} ms")
+    finally:
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [20_000, 40, 5][len(args) :]))
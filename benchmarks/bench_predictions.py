@@ -0,0 +1,90 @@
+"""Monte Carlo tournament simulations per second: one-at-a-time loop vs vectorized vs process pool.
+
+Run from the repository root: python -m benchmarks.bench_predictions [iterations] [workers]
+"""
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+import numpy as np
+
+from app.services.prediction_service import TournamentSimulator, run_simulation
+
+PLAYERS = list(range(1, 7))
+
+
+def fixture(round_name, team1, team2, goals=None):
+    two_v_two = len(team1) == 2
+    return {
+        "round": round_name,
+        "match_type": "2v2" if two_v_two else "1v1",
+        "status": "SCHEDULED" if goals is None else "COMPLETED",
+        "team1_player1_id": team1[0],
+        "team1_player2_id": team1[1] if two_v_two else None,
+        "team2_player1_id": team2[0],
+        "team2_player2_id": team2[1] if two_v_two else None,
+        "team1_goals": goals[0] if goals else None,
+        "team2_goals": goals[1] if goals else None,
+    }
+
+
+def tournament():
+    # Half of a full round-robin in each round played, the rest still scheduled
+    rng = random.Random(0)
+    round1 = [((a,), (b,)) for a, b in combinations(PLAYERS, 2)]
+    pairs = list(combinations(PLAYERS, 2))
+    round2 = [(p, q) for p, q in combinations(pairs, 2) if not set(p) & set(q)][:45]
+    completed, scheduled = [], []
+    for round_name, matches in (("Round 1", round1), ("Round 2", round2)):
+        for i, (team1, team2) in enumerate(matches):
+            if i % 2:
+                scheduled.append(fixture(round_name, team1, team2))
+            else:
+                completed.append(fixture(round_name, team1, team2, (rng.randint(0, 4), rng.randint(0, 4))))
+    return completed, scheduled
+
+
+def loop_simulation(simulator: TournamentSimulator, iterations: int) -> None:
+    # Baseline: one season at a time in plain Python
+    rng = np.random.default_rng(0)
+    size = len(simulator.player_ids)
+    for _ in range(iterations):
+        points = simulator.base_points.tolist()
+        goal_difference = simulator.base_goal_difference.tolist()
+        for m in range(len(simulator.expected1)):
+            goals1, goals2 = rng.poisson(simulator.expected1[m]), rng.poisson(simulator.expected2[m])
+            for i in range(size):
+                sign = simulator.side1[m, i] - simulator.side2[m, i]
+                if not sign:
+                    continue
+                difference = (goals1 - goals2) * sign
+                points[i] += (
+                    simulator.win_points[m] if difference > 0 else simulator.draw_points[m] if difference == 0 else 0
+                )
+                goal_difference[i] += difference
+        sorted(range(size), key=lambda i: (-points[i], -goal_difference[i]))
+
+
+def measure(label: str, run, iterations: int) -> None:
+    start = time.perf_counter()
+    run(iterations)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {iterations:>9} sims  {elapsed:7.2f} s  {iterations / elapsed:12,.0f} sims/s")
+
+
+def main(iterations: int, workers: int) -> None:
+    completed, scheduled = tournament()
+    simulator = TournamentSimulator(PLAYERS, completed, scheduled)
+    print(f"{len(PLAYERS)} players, {len(completed)} completed and {len(scheduled)} remaining fixtures")
+    measure("python loop", lambda n: loop_simulation(simulator, n), max(iterations // 100, 100))
+    measure("numpy, 1 process", lambda n: run_simulation(simulator, n, workers=1, seed=0), iterations)
+    measure(f"numpy, {workers} processes", lambda n: run_simulation(simulator, n, workers=workers, seed=0), iterations)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1,
+    )
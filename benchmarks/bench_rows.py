@@ -0,0 +1,74 @@
+"""Memory and build time per 100k rows: RealDictCursor rows vs CompactCursor rows.
+
+Run from the repository root: python -m benchmarks.bench_rows [rows]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from psycopg2.extras import RealDictRow
+
+from app.rows import row_class
+
+# Shape of a /matches row: m.* plus the four joined player names
+COLUMNS = (
+    "id",
+    "round",
+    "match_type",
+    "team1_player1_id",
+    "team1_player2_id",
+    "team2_player1_id",
+    "team2_player2_id",
+    "match_date",
+    "scheduled_date",
+    "team1_goals",
+    "team2_goals",
+    "result",
+    "status",
+    "created_at",
+    "updated_at",
+    "team1_player1_name",
+    "team1_player2_name",
+    "team2_player1_name",
+    "team2_player2_name",
+)
+
+
+def raw_rows(count: int):
+    start = datetime(2024, 1, 1, 18, 0)
+    names = [f"Player {i}" for i in range(20)]
+    for i in range(count):
+        date = start + timedelta(hours=i)
+        yield (i, "Round 1", "1v1", 1, None, 2, None, date, date, i % 5, i % 3, "Draw", "COMPLETED", date, date) + (
+            names[i % 20],
+            None,
+            names[(i + 1) % 20],
+            None,
+        )
+
+
+def measure(label: str, build, count: int) -> None:
+    tuples = list(raw_rows(count))
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = build(tuples)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {current / 1024 / 1024:8.1f} MiB  {current / count:6.0f} B/row  {elapsed * 1000:7.1f} ms")
+    del rows
+
+
+def main(count: int) -> None:
+    print(f"{count} rows x {len(COLUMNS)} columns (row containers only; column values are shared)")
+    measure("RealDictRow", lambda tuples: [RealDictRow(zip(COLUMNS, values)) for values in tuples], count)
+    measure("dict", lambda tuples: [dict(zip(COLUMNS, values)) for values in tuples], count)
+    cls = row_class(COLUMNS)
+    measure("CompactCursor Row", lambda tuples: [cls(values) for values in tuples], count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,83 @@
+"""Compare the validated response path with the trusted-read RowEncoder path.
+
+Run from the repository root: python -m benchmarks.bench_serialization [rows]
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Match, Player
+from app.serialization import RowEncoder
+
+
+def player_rows(count: int) -> List[dict]:
+    now = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    return [{"player_id": i, "player_name": f"Player {i}", "created_at": now, "updated_at": now} for i in range(count)]
+
+
+def match_rows(count: int) -> List[dict]:
+    start = datetime(2024, 1, 1, 18, 0)
+    rows = []
+    for i in range(count):
+        date = start + timedelta(hours=i)
+        rows.append(
+            {
+                "id": i,
+                "round": "Round 1",
+                "match_type": "1v1",
+                "team1_player1_id": 1,
+                "team1_player2_id": None,
+                "team2_player1_id": 2,
+                "team2_player2_id": None,
+                "match_date": date,
+                "scheduled_date": date,
+                "team1_goals": i % 5,
+                "team2_goals": i % 3,
+                "status": "COMPLETED",
+                "result": "Draw",
+                "created_at": date,
+                "updated_at": date,
+                "team1_player1_name": "Player 1",
+                "team1_player2_name": None,
+                "team2_player1_name": "Player 2",
+                "team2_player2_name": None,
+            }
+        )
+    return rows
+
+
+async def validated_path(model, rows, build_models: bool) -> bytes:
+    # What the routers did before: optional Model(**row) in the service, then response_model validation,
+    # jsonable_encoder and json.dumps inside JSONResponse
+    field = create_model_field(name="Response", type_=List[model], mode="serialization")
+    content = [model(**row) for row in rows] if build_models else rows
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def timed(label: str, fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<28} {best * 1000:8.2f} ms")
+    return best
+
+
+def main(count: int) -> None:
+    for model, rows, build_models in ((Player, player_rows(count), True), (Match, match_rows(count), False)):
+        encoder = RowEncoder(model)
+        print(f"{model.__name__} x {count}")
+        slow = timed("validated (pydantic + json)", lambda: asyncio.run(validated_path(model, rows, build_models)))
+        fast = timed("trusted (RowEncoder/orjson)", lambda: encoder.encode(rows))
+        print(f"  speedup {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,442 @@
+"""EXPLAIN (ANALYZE, BUFFERS) plans for every repository statement at several data sizes, checked against baselines.
+
+Needs the PostgreSQL configured through the POSTGRES_* variables. For each scale it loads sql/create.sql into
+a scratch schema, fills it with generated matches, then calls every repository method once. Each statement
+a method executes is first run under EXPLAIN (ANALYZE, BUFFERS) inside a savepoint that is rolled back, and
+then for real, so later calls see the same data the application would.
+
+Plans are reduced to their shape (node types, relations and indexes) plus the top-level cost and row
+estimate, the largest row estimate of any node, and the relations read by sequential scans. Compared with
+the baseline file, a statement regresses when it gains a sequential scan, or when its cost or row estimates
+grow by more than --threshold. Plan shape changes are shown as diffs. Exits with status 1 on regressions.
+
+Run from the repository root:
+    python -m benchmarks.explain_plans [--scales 1000,10000,100000] [--update] [--threshold 1.5]
+"""
+import argparse
+import asyncio
+import difflib
+import inspect
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+
+from app import repositories
+from app.database import get_connection
+from app.models import MatchCreate, PlayerCreate, TournamentCreate
+from app.repositories.format_repository import FormatRepository
+from app.repositories.leaderboard_repository import LeaderboardRepository
+from app.repositories.match_event_repository import MatchEventRepository
+from app.repositories.match_repository import MatchRepository
+from app.repositories.overview_repository import OverviewRepository
+from app.repositories.player_repository import PlayerRepository
+from app.repositories.prediction_repository import PredictionRepository
+from app.repositories.rating_repository import RatingRepository
+from app.repositories.standing_repository import StandingRepository
+from app.repositories.stats_repository import StatsRepository
+from app.repositories.tournament_repository import TournamentRepository
+from app.services.match_event_service import MatchEventService
+from app.services.rating_service import EloEngine
+from benchmarks.bench_player_names import SCHEMA_FILE, seed
+
+BASELINE_FILE = Path(__file__).resolve().parent / "plans" / "baseline.json"
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES")
+
+
+def run(result):
+    return asyncio.run(result) if inspect.isawaitable(result) else result
+
+
+def calls(ids: Dict) -> List[Tuple[str, Callable]]:
+    # Every repository method with realistic arguments. Reads come first; the writes at the end only touch
+    # a few rows, and the derived tables are rebuilt last by the event replay.
+    tournament_id, player_id, match_id = 1, ids["player_id"], ids["match_id"]
+    matches, players = MatchRepository(), PlayerRepository()
+    future = datetime.now() + timedelta(days=7)
+    new_match = MatchCreate(
+        round="Round 1",
+        match_type="1v1",
+        team1_player1_id=ids["player_ids"][0],
+        team2_player1_id=ids["player_ids"][1],
+        match_date=future,
+    )
+    created = {}
+
+    def create_match():
+        created["match"] = run(matches.create_match(new_match, tournament_id, future, "SCHEDULED", None))
+
+    def delete_player_with_matches():
+        try:
+            players.delete_player(player_id)
+        except ValueError:
+            pass
+
+    def search_players():
+        try:
+            players.search_players("Player 1", 20)
+        except psycopg2.errors.UndefinedFunction:
+            # pg_trgm is not installed; the recorded plan holds the error
+            pass
+
+    def delete_unused_player():
+        created["player"] = players.create_player(PlayerCreate(player_name=f"Explain {uuid.uuid4().hex[:8]}"))
+        players.delete_player(created["player"]["player_id"])
+
+    return [
+        ("FormatRepository.get_format_rounds", lambda: FormatRepository().get_format_rounds(tournament_id)),
+        (
+            "LeaderboardRepository.get_player_aggregates",
+            lambda: LeaderboardRepository().get_player_aggregates(tournament_id),
+        ),
+        (
+            "LeaderboardRepository.get_player_aggregates(round, match_type)",
+            lambda: LeaderboardRepository().get_player_aggregates(tournament_id, "Round 2", "2v2"),
+        ),
+        ("MatchRepository.get_matches", lambda: run(matches.get_matches(tournament_id))),
+        (
+            "MatchRepository.get_matches(fields)",
+            lambda: run(matches.get_matches(tournament_id, ("id", "match_date", "status"))),
+        ),
+        ("MatchRepository.get_match_by_id", lambda: run(matches.get_match_by_id(match_id, tournament_id))),
+        (
+            "MatchRepository.get_matches_by_ids",
+            lambda: matches.get_matches_by_ids(ids["match_ids"], tournament_id),
+        ),
+        (
+            "OverviewRepository.get_completed_matches_by_round",
+            lambda: OverviewRepository().get_completed_matches_by_round(tournament_id),
+        ),
+        (
+            "OverviewRepository.get_basic_tournament_stats",
+            lambda: OverviewRepository().get_basic_tournament_stats(tournament_id),
+        ),
+        ("OverviewRepository.get_latest_match", lambda: OverviewRepository().get_latest_match(tournament_id)),
+        (
+            "OverviewRepository.get_highest_scoring_match",
+            lambda: OverviewRepository().get_highest_scoring_match(tournament_id),
+        ),
+        ("OverviewRepository.get_current_streak", lambda: OverviewRepository().get_current_streak(tournament_id)),
+        ("PlayerRepository.get_all_players", lambda: players.get_all_players()),
+        ("PlayerRepository.get_all_players(tournament)", lambda: players.get_all_players(None, tournament_id)),
+        ("PlayerRepository.get_player_names", lambda: players.get_player_names()),
+        ("PlayerRepository.get_player_by_id", lambda: players.get_player_by_id(player_id)),
+        ("PlayerRepository.get_players_by_ids", lambda: players.get_players_by_ids(ids["player_ids"])),
+        ("PlayerRepository.get_player_stats", lambda: players.get_player_stats(tournament_id)),
+        ("PlayerRepository.get_player_stats(player)", lambda: players.get_player_stats(tournament_id, player_id)),
+        ("PlayerRepository.search_players", search_players),
+        (
+            "PredictionRepository.get_simulation_source",
+            lambda: PredictionRepository().get_simulation_source(tournament_id),
+        ),
+        ("RatingRepository.get_leaderboard", lambda: RatingRepository().get_leaderboard("player", 50)),
+        ("RatingRepository.get_history", lambda: RatingRepository().get_history("player", str(player_id))),
+        (
+            "StandingRepository.get_round1_standings",
+            lambda: StandingRepository().get_round1_standings(tournament_id),
+        ),
+        (
+            "StandingRepository.get_round2_standings",
+            lambda: StandingRepository().get_round2_standings(tournament_id),
+        ),
+        (
+            "StatsRepository.get_head_to_head_source",
+            lambda: StatsRepository().get_head_to_head_source(tournament_id),
+        ),
+        ("TournamentRepository.get_tournaments", lambda: TournamentRepository().get_tournaments()),
+        (
+            "TournamentRepository.get_tournament_by_id",
+            lambda: TournamentRepository().get_tournament_by_id(tournament_id),
+        ),
+        ("MatchEventRepository.get_events", lambda: MatchEventRepository().get_events(None, 0, 100)),
+        ("MatchEventRepository.get_latest_snapshot", lambda: MatchEventRepository().get_latest_snapshot(None)),
+        ("MatchRepository.create_match", create_match),
+        (
+            "MatchRepository.update_match",
+            lambda: run(matches.update_match(created["match"]["id"], tournament_id, new_match, "SCHEDULED", None)),
+        ),
+        (
+            "MatchRepository.update_match_score",
+            lambda: run(matches.update_match_score(created["match"]["id"], tournament_id, 2, 1, "Team1")),
+        ),
+        ("MatchRepository.delete_match", lambda: run(matches.delete_match(created["match"]["id"], tournament_id))),
+        (
+            "MatchRepository.create_matches",
+            lambda: run(
+                matches.create_matches(
+                    tournament_id,
+                    [("Round 1", "1v1", ids["player_ids"][0], None, ids["player_ids"][1], None, future, future)],
+                )
+            ),
+        ),
+        ("PlayerRepository.delete_player(with matches)", delete_player_with_matches),
+        ("PlayerRepository.create_player, delete_player", delete_unused_player),
+        (
+            "TournamentRepository.create_tournament",
+            lambda: TournamentRepository().create_tournament(TournamentCreate(name=f"Explain {uuid.uuid4().hex[:8]}")),
+        ),
+        (
+            "RatingRepository.replay_from",
+            lambda: RatingRepository().replay_from(ids["replay_from"][0], ids["replay_from"][1], EloEngine()),
+        ),
+        (
+            "MatchEventRepository.head_replay, stream_events, save_snapshot, replace_derived",
+            lambda: MatchEventService().replay(),
+        ),
+    ]
+
+
+def uncovered(names: List[str]) -> List[str]:
+    # Public repository methods that no call above names ("Class.method(variant)" or "Class.a, b")
+    covered = set()
+    for name in names:
+        class_name, _, methods = name.partition(".")
+        covered.update(f"{class_name}.{method}" for method in methods.split("(")[0].split(", "))
+    missing = []
+    for module_name in sorted(p.stem for p in Path(repositories.__file__).parent.glob("*_repository.py")):
+        module = __import__(f"app.repositories.{module_name}", fromlist=["*"])
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method in (name for name, _ in inspect.getmembers(cls, inspect.isfunction) if not name.startswith("_")):
+                if f"{class_name}.{method}" not in covered:
+                    missing.append(f"{class_name}.{method}")
+    return missing
+
+
+# Connections opened through psycopg2.connect while installed explain every statement before running it
+class PlanCapture:
+    def __init__(self):
+        self.current: Optional[str] = None
+        self.plans: Dict[str, Dict] = {}
+        self._counts: Dict[str, int] = {}
+        self._connect = psycopg2.connect
+        self._classes: Dict[type, type] = {}
+
+    def install(self) -> None:
+        psycopg2.connect = self.connect
+
+    def uninstall(self) -> None:
+        psycopg2.connect = self._connect
+
+    def connect(self, *args, connection_factory=None, **kwargs):
+        base = connection_factory or psycopg2.extensions.connection
+        return self._connect(*args, connection_factory=self._connection_class(base), **kwargs)
+
+    def _connection_class(self, base: type) -> type:
+        if base not in self._classes:
+            capture = self
+
+            def cursor(conn, *args, cursor_factory=None, **kwargs):
+                factory = cursor_factory or conn.cursor_factory or psycopg2.extensions.cursor
+                return base.cursor(conn, *args, cursor_factory=capture._cursor_class(factory), **kwargs)
+
+            self._classes[base] = type(f"Explaining{base.__name__}", (base,), {"cursor": cursor})
+        return self._classes[base]
+
+    def _cursor_class(self, base: type) -> type:
+        if base not in self._classes:
+            capture = self
+
+            def execute(cur, query, vars=None):
+                capture.explain(cur.connection, query, vars)
+                return base.execute(cur, query, vars)
+
+            self._classes[base] = type(f"Explaining{base.__name__}", (base,), {"execute": execute})
+        return self._classes[base]
+
+    def explain(self, conn, query, vars) -> None:
+        if self.current is None:
+            return
+        if hasattr(query, "as_string"):
+            query = query.as_string(conn)
+        statement = query.decode() if isinstance(query, bytes) else query
+        if statement.split(None, 1)[0].upper() not in EXPLAINABLE:
+            return
+        self._counts[self.current] = number = self._counts.get(self.current, 0) + 1
+        key = f"{self.current} #{number}"
+        with psycopg2.extensions.cursor(conn) as cur:
+            literal = cur.mogrify(statement, vars).decode()
+            cur.execute("BEGIN" if conn.autocommit else "SAVEPOINT explain_plans")
+            try:
+                cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {literal}")
+                self.plans[key] = normalize(cur.fetchone()[0][0])
+            except psycopg2.Error as e:
+                self.plans[key] = {"error": str(e).strip()}
+            finally:
+                cur.execute("ROLLBACK" if conn.autocommit else "ROLLBACK TO SAVEPOINT explain_plans")
+
+
+def normalize(plan: Dict) -> Dict:
+    shape, seq_scans, node_rows = [], set(), []
+
+    def walk(node: Dict, depth: int) -> None:
+        label = node["Node Type"]
+        if node.get("Join Type") and ("Join" in label or label == "Nested Loop"):
+            label = f"{label} ({node['Join Type']})"
+        if node.get("Index Name"):
+            label += f" using {node['Index Name']}"
+        if node.get("Relation Name"):
+            label += f" on {node['Relation Name']}"
+        if node.get("Subplan Name"):
+            label = f"{node['Subplan Name']}: {label}"
+        shape.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.add(node["Relation Name"])
+        node_rows.append(node["Plan Rows"])
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    top = plan["Plan"]
+    walk(top, 0)
+    return {
+        "shape": shape,
+        "seq_scans": sorted(seq_scans),
+        "total_cost": top["Total Cost"],
+        "plan_rows": top["Plan Rows"],
+        "max_node_rows": max(node_rows),
+        "actual_rows": top["Actual Rows"],
+        "execution_ms": round(plan["Execution Time"], 3),
+        "shared_blocks": top.get("Shared Hit Blocks", 0) + top.get("Shared Read Blocks", 0),
+    }
+
+
+def capture_scale(matches: int, players: int) -> Dict[str, Dict]:
+    conn = get_connection()
+    conn.autocommit = True
+    schema = f"explain_{uuid.uuid4().hex[:12]}"
+    previous_options = os.environ.get("PGOPTIONS")
+    with conn.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+        cur.execute(f"SET search_path TO {schema}")
+        cur.execute(SCHEMA_FILE.read_text())
+        seed(cur, matches, players)
+        cur.execute("SELECT player_id FROM players ORDER BY player_id LIMIT 4")
+        player_ids = [row[0] for row in cur.fetchall()]
+        cur.execute("SELECT id, match_date FROM matches ORDER BY match_date DESC, id DESC LIMIT 10")
+        recent = cur.fetchall()
+    ids = {
+        "player_id": player_ids[0],
+        "player_ids": player_ids,
+        "match_id": recent[0][0],
+        "match_ids": [row[0] for row in recent],
+        # Re-rates the ten most recent matches
+        "replay_from": (recent[-1][1], recent[-1][0]),
+    }
+
+    capture = PlanCapture()
+    os.environ["PGOPTIONS"] = f"-c search_path={schema}"
+    capture.install()
+    try:
+        # Ratings exist before their queries are explained
+        RatingRepository().replay_from(None, None, EloEngine())
+        for name, call in calls(ids):
+            capture.current = name
+            try:
+                call()
+            finally:
+                capture.current = None
+        return capture.plans
+    finally:
+        capture.uninstall()
+        if previous_options is None:
+            os.environ.pop("PGOPTIONS", None)
+        else:
+            os.environ["PGOPTIONS"] = previous_options
+        with conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> Tuple[List[str], int]:
+    lines, regressions = [], 0
+    for key in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(key), current.get(key)
+        if before is None:
+            lines.append(f"  + {key}: new statement")
+            continue
+        if after is None:
+            lines.append(f"  - {key}: no longer executed")
+            continue
+        if "error" in before or "error" in after:
+            if before.get("error") != after.get("error"):
+                regressions += "error" in after
+                lines.append(f"  ! {key}: {after.get('error', 'fixed: ' + before.get('error', ''))}")
+            continue
+
+        problems = [
+            f"new seq scan on {relation}" for relation in after["seq_scans"] if relation not in before["seq_scans"]
+        ]
+        for field in ("total_cost", "plan_rows", "max_node_rows"):
+            if after[field] > max(before[field], 1) * threshold:
+                problems.append(f"{field} {before[field]:g} -> {after[field]:g}")
+        regressions += bool(problems)
+        changed = before["shape"] != after["shape"]
+        if problems or changed:
+            marker = "!" if problems else "~"
+            lines.append(f"  {marker} {key}: {'; '.join(problems) or 'plan changed'}")
+            lines.append(
+                f"      execution {before['execution_ms']:.1f} -> {after['execution_ms']:.1f} ms, "
+                f"buffers {before['shared_blocks']} -> {after['shared_blocks']}"
+            )
+        if changed:
+            diff = difflib.unified_diff(before["shape"], after["shape"], "baseline", "current", lineterm="", n=1)
+            lines.extend(f"      {line}" for line in diff)
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Capture and compare EXPLAIN plans of the repository SQL")
+    parser.add_argument("--scales", default="1000,10000,100000", help="comma-separated match counts")
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true", help="store the captured plans as the new baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=1.5, help="cost/row estimate growth that counts as a regression"
+    )
+    args = parser.parse_args()
+
+    captured = {}
+    for scale in (int(scale) for scale in args.scales.split(",")):
+        print(f"Capturing plans at {scale} matches...", file=sys.stderr)
+        captured[str(scale)] = capture_scale(scale, args.players)
+
+    names = sorted({key.rsplit(" #", 1)[0] for plans in captured.values() for key in plans})
+    for method in uncovered(names):
+        print(f"warning: {method} is not exercised by the plan capture", file=sys.stderr)
+
+    if args.update:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(captured)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Stored {sum(len(plans) for plans in captured.values())} plans in {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update first", file=sys.stderr)
+        return 2
+    baseline = json.loads(args.baseline.read_text())
+    total = 0
+    for scale, plans in captured.items():
+        if scale not in baseline:
+            print(f"{scale} matches: no baseline at this scale")
+            continue
+        lines, regressions = compare(baseline[scale], plans, args.threshold)
+        total += regressions
+        print(f"{scale} matches: {len(plans)} statements, {regressions} regressed")
+        for line in lines:
+            print(line)
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,9 +6,43 @@ CREATE TABLE players (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Matches table - stores both scheduled and completed matches
+-- Tournament formats: expected matches per round, so progress works for tournaments of any size
+CREATE TABLE tournament_formats (
+    format_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE format_rounds (
+    format_id INT NOT NULL REFERENCES tournament_formats(format_id) ON DELETE CASCADE,
+    round VARCHAR(50) NOT NULL,
+    phase VARCHAR(50) NOT NULL,
+    position INT NOT NULL,
+    expected_matches INT NOT NULL CHECK (expected_matches >= 0),
+    PRIMARY KEY (format_id, round)
+);
+
+INSERT INTO tournament_formats (format_id, name) VALUES (1, 'default');
+SELECT setval('tournament_formats_format_id_seq', 1);
+
+INSERT INTO format_rounds (format_id, round, phase, position, expected_matches) VALUES
+    (1, 'Round 1', 'League Phase', 1, 10),
+    (1, 'Round 2', 'League Phase', 2, 15),
+    (1, 'Knockout', 'Knockout Phase', 3, 4);
+
+-- Tournaments (seasons); every match belongs to one, and matches are partitioned by it
+CREATE TABLE tournaments (
+    tournament_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    format_id INT NOT NULL REFERENCES tournament_formats(format_id),
+    starts_on DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Matches table - stores both scheduled and completed matches, one partition per tournament
 CREATE TABLE matches (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
+    tournament_id INT NOT NULL DEFAULT 1 REFERENCES tournaments(tournament_id),
     round VARCHAR(50) NOT NULL,
     match_type VARCHAR(10) CHECK (match_type IN ('1v1', '2v2')),
     team1_player1_id INT REFERENCES players(player_id),
@@ -22,18 +56,74 @@ CREATE TABLE matches (
     result VARCHAR(50), -- 'Team1', 'Team2', or 'Draw', NULL for scheduled matches
     status VARCHAR(20) DEFAULT 'SCHEDULED' CHECK (status IN ('SCHEDULED', 'COMPLETED', 'CANCELLED')),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, tournament_id)
+) PARTITION BY LIST (tournament_id);
+
+-- Catches rows for a tournament whose partition has not been created
+CREATE TABLE matches_default PARTITION OF matches DEFAULT;
+
+-- Every new tournament gets its own matches partition
+CREATE OR REPLACE FUNCTION create_tournament_partition()
+RETURNS TRIGGER AS $func$
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF matches FOR VALUES IN (%s)',
+        'matches_tournament_' || NEW.tournament_id,
+        NEW.tournament_id
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER create_tournament_partition
+    AFTER INSERT ON tournaments
+    FOR EACH ROW
+    EXECUTE FUNCTION create_tournament_partition();
+
+INSERT INTO tournaments (tournament_id, name, format_id) VALUES (1, 'Default', 1);
+SELECT setval('tournaments_tournament_id_seq', 1);
+
+-- Which players take part in which tournament, kept up to date from their matches
+CREATE TABLE tournament_players (
+    tournament_id INT NOT NULL REFERENCES tournaments(tournament_id) ON DELETE CASCADE,
+    player_id INT NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    PRIMARY KEY (tournament_id, player_id)
 );
 
+CREATE INDEX idx_tournament_players_player ON tournament_players(player_id);
+
+CREATE OR REPLACE FUNCTION record_tournament_players()
+RETURNS TRIGGER AS $func$
+BEGIN
+    INSERT INTO tournament_players (tournament_id, player_id)
+    SELECT NEW.tournament_id, player_id
+    FROM unnest(ARRAY[
+        NEW.team1_player1_id, NEW.team1_player2_id,
+        NEW.team2_player1_id, NEW.team2_player2_id
+    ]) AS player_id
+    WHERE player_id IS NOT NULL
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER record_tournament_players
+    AFTER INSERT OR UPDATE OF team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION record_tournament_players();
+
 -- Match statistics table - for detailed match statistics
 CREATE TABLE match_stats (
     id SERIAL PRIMARY KEY,
-    match_id INT REFERENCES matches(id) ON DELETE CASCADE,
+    match_id INT NOT NULL,
+    tournament_id INT NOT NULL DEFAULT 1,
     player_id INT REFERENCES players(player_id),
     goals INT DEFAULT 0,
     clean_sheet BOOLEAN DEFAULT FALSE,
     points INT DEFAULT 0, -- Points earned in this match
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (match_id, tournament_id) REFERENCES matches(id, tournament_id) ON DELETE CASCADE
 );
 
 -- Create indexes for better query performance
@@ -41,6 +131,10 @@ CREATE INDEX idx_matches_status ON matches(status);
 CREATE INDEX idx_matches_date ON matches(match_date);
 CREATE INDEX idx_matches_round ON matches(round);
 CREATE INDEX idx_match_stats_player ON match_stats(player_id);
+CREATE INDEX idx_matches_team1_player1 ON matches(team1_player1_id);
+CREATE INDEX idx_matches_team1_player2 ON matches(team1_player2_id);
+CREATE INDEX idx_matches_team2_player1 ON matches(team2_player1_id);
+CREATE INDEX idx_matches_team2_player2 ON matches(team2_player2_id);
 
 -- Function to update timestamp
 CREATE OR REPLACE FUNCTION update_timestamp()
@@ -62,45 +156,276 @@ CREATE TRIGGER update_matches_timestamp
     FOR EACH ROW
     EXECUTE FUNCTION update_timestamp();
 
--- Function to update player statistics when a match is completed
+-- Function to keep match_stats in line with a match: every write replaces the match's rows, so
+-- rescoring or editing an already completed match (or creating one with its result) is reflected too
 CREATE OR REPLACE FUNCTION update_player_stats()
 RETURNS TRIGGER AS $func$
 BEGIN
-    IF NEW.status = 'COMPLETED' AND OLD.status = 'SCHEDULED' THEN
-        -- Team 1 player 1
-        INSERT INTO match_stats (match_id, player_id, goals, clean_sheet, points)
-        VALUES (
-            NEW.id,
-            NEW.team1_player1_id,
-            NEW.team1_goals,
-            CASE WHEN NEW.team2_goals = 0 THEN TRUE ELSE FALSE END,
-            CASE
-                WHEN NEW.team1_goals > NEW.team2_goals THEN 6
-                WHEN NEW.team1_goals = NEW.team2_goals THEN 2
-                ELSE 0
-            END
-        );
+    DELETE FROM match_stats WHERE match_id = NEW.id AND tournament_id = NEW.tournament_id;
 
-        -- Team 2 player 1
-        INSERT INTO match_stats (match_id, player_id, goals, clean_sheet, points)
-        VALUES (
+    IF NEW.status = 'COMPLETED' AND NEW.team1_goals IS NOT NULL AND NEW.team2_goals IS NOT NULL THEN
+        INSERT INTO match_stats (match_id, tournament_id, player_id, goals, clean_sheet, points)
+        SELECT
             NEW.id,
-            NEW.team2_player1_id,
-            NEW.team2_goals,
-            CASE WHEN NEW.team1_goals = 0 THEN TRUE ELSE FALSE END,
+            NEW.tournament_id,
+            s.player_id,
+            s.goals_for,
+            s.goals_against = 0,
             CASE
-                WHEN NEW.team2_goals > NEW.team1_goals THEN 6
-                WHEN NEW.team2_goals = NEW.team1_goals THEN 2
+                WHEN s.goals_for > s.goals_against THEN CASE WHEN NEW.match_type = '2v2' THEN 3 ELSE 6 END
+                WHEN s.goals_for = s.goals_against THEN CASE WHEN NEW.match_type = '2v2' THEN 1 ELSE 2 END
                 ELSE 0
             END
-        );
+        FROM (
+            VALUES
+                (NEW.team1_player1_id, NEW.team1_goals, NEW.team2_goals),
+                (NEW.team1_player2_id, NEW.team1_goals, NEW.team2_goals),
+                (NEW.team2_player1_id, NEW.team2_goals, NEW.team1_goals),
+                (NEW.team2_player2_id, NEW.team2_goals, NEW.team1_goals)
+        ) AS s(player_id, goals_for, goals_against)
+        WHERE s.player_id IS NOT NULL;
     END IF;
     RETURN NEW;
 END;
 $func$ LANGUAGE plpgsql;
 
--- Trigger for updating player stats when match is completed
+-- Trigger for updating player stats whenever a match is written (deletes cascade)
 CREATE TRIGGER update_match_stats
-    AFTER UPDATE ON matches
+    AFTER INSERT OR UPDATE ON matches
     FOR EACH ROW
     EXECUTE FUNCTION update_player_stats();
+
+-- Per-table change counters, polled by workers that cannot keep a LISTEN connection open
+CREATE TABLE change_versions (
+    table_name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO change_versions (table_name, version) VALUES ('matches', 0), ('players', 0), ('ratings', 0);
+
+-- Function to broadcast row changes to listening workers
+-- TG_ARGV[0] is the primary key column of the table the trigger is attached to; TG_ARGV[1] optionally
+-- names the table to report, since on a partitioned table TG_TABLE_NAME is the partition
+CREATE OR REPLACE FUNCTION notify_table_change()
+RETURNS TRIGGER AS $func$
+DECLARE
+    changed_row JSONB;
+    score_changed BOOLEAN := FALSE;
+    changed_table TEXT := COALESCE(TG_ARGV[1], TG_TABLE_NAME);
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := to_jsonb(OLD);
+    ELSE
+        changed_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        score_changed := (to_jsonb(NEW) -> 'team1_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team1_goals')
+            OR (to_jsonb(NEW) -> 'team2_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team2_goals');
+    END IF;
+
+    PERFORM pg_notify(
+        'table_changes',
+        json_build_object(
+            'table', changed_table,
+            'id', (changed_row ->> TG_ARGV[0])::INT,
+            'tournament_id', (changed_row ->> 'tournament_id')::INT,
+            'operation', TG_OP,
+            'score_changed', score_changed
+        )::text
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+-- Trigger for pushing match changes to live subscribers
+CREATE TRIGGER notify_matches_change
+    AFTER UPDATE OR DELETE ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('id', 'matches');
+
+-- Inserts notify once per statement and tournament, so a bulk fixture insert is a single change rather
+-- than one per row; 'id' is only set when the statement inserted one match
+CREATE OR REPLACE FUNCTION notify_matches_inserted()
+RETURNS TRIGGER AS $func$
+DECLARE
+    batch RECORD;
+BEGIN
+    FOR batch IN
+        SELECT tournament_id, count(*) AS inserted_count, min(id) AS first_id
+        FROM inserted_matches
+        GROUP BY tournament_id
+    LOOP
+        PERFORM pg_notify(
+            'table_changes',
+            json_build_object(
+                'table', 'matches',
+                'id', CASE WHEN batch.inserted_count = 1 THEN batch.first_id END,
+                'tournament_id', batch.tournament_id,
+                'operation', 'INSERT',
+                'score_changed', FALSE,
+                'count', batch.inserted_count
+            )::text
+        );
+    END LOOP;
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_matches_insert
+    AFTER INSERT ON matches
+    REFERENCING NEW TABLE AS inserted_matches
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_matches_inserted();
+
+-- Trigger for invalidating cached player data on every worker
+CREATE TRIGGER notify_players_change
+    AFTER INSERT OR UPDATE OR DELETE ON players
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('player_id');
+
+-- Function to bump a table's change counter, once per statement rather than per row, so concurrent
+-- writers only meet on the counter row at the end of each statement; TG_ARGV[0] is the table to bump
+CREATE OR REPLACE FUNCTION bump_change_version()
+RETURNS TRIGGER AS $func$
+BEGIN
+    UPDATE change_versions SET version = version + 1 WHERE table_name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bump_matches_version
+    AFTER INSERT OR UPDATE OR DELETE ON matches
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('matches');
+
+CREATE TRIGGER bump_players_version
+    AFTER INSERT OR UPDATE OR DELETE ON players
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('players');
+
+-- Elo ratings for players and 2v2 partnerships; entity_key is the player id, or "low-high" player ids
+CREATE TABLE ratings (
+    entity_type VARCHAR(10) NOT NULL CHECK (entity_type IN ('player', 'team')),
+    entity_key VARCHAR(50) NOT NULL,
+    rating DOUBLE PRECISION NOT NULL,
+    matches_played INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (entity_type, entity_key)
+);
+
+-- One row per rated entity per match, in rating order; replays roll back from here
+CREATE TABLE rating_history (
+    id SERIAL PRIMARY KEY,
+    match_id INT NOT NULL,
+    match_date TIMESTAMP NOT NULL,
+    entity_type VARCHAR(10) NOT NULL,
+    entity_key VARCHAR(50) NOT NULL,
+    rating_before DOUBLE PRECISION NOT NULL,
+    rating_after DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_rating_history_order ON rating_history(match_date, match_id);
+CREATE INDEX idx_rating_history_entity ON rating_history(entity_type, entity_key, match_date, match_id);
+CREATE INDEX idx_ratings_rating ON ratings(entity_type, rating DESC);
+
+-- Ratings are rewritten in bulk by replays, so one notification per statement is enough
+CREATE OR REPLACE FUNCTION notify_ratings_change()
+RETURNS TRIGGER AS $func$
+BEGIN
+    UPDATE change_versions SET version = version + 1 WHERE table_name = 'ratings';
+    PERFORM pg_notify(
+        'table_changes',
+        json_build_object('table', 'ratings', 'id', NULL, 'operation', TG_OP)::text
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_rating_history_change
+    AFTER INSERT OR DELETE ON rating_history
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_ratings_change();
+
+-- Progress counts completed matches per round straight from this index
+CREATE INDEX idx_matches_completed_round ON matches(round) WHERE status = 'COMPLETED';
+
+INSERT INTO change_versions (table_name, version) VALUES ('format_rounds', 0);
+
+CREATE TRIGGER notify_format_rounds_change
+    AFTER INSERT OR UPDATE OR DELETE ON format_rounds
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('format_id');
+
+CREATE TRIGGER bump_format_rounds_version
+    AFTER INSERT OR UPDATE OR DELETE ON format_rounds
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('format_rounds');
+
+INSERT INTO change_versions (table_name, version) VALUES ('tournament_formats', 0);
+
+CREATE TRIGGER notify_tournament_formats_change
+    AFTER INSERT OR UPDATE OR DELETE ON tournament_formats
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('format_id');
+
+CREATE TRIGGER bump_tournament_formats_version
+    AFTER INSERT OR UPDATE OR DELETE ON tournament_formats
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('tournament_formats');
+
+INSERT INTO change_versions (table_name, version) VALUES ('tournaments', 0);
+
+CREATE TRIGGER notify_tournaments_change
+    AFTER INSERT OR UPDATE OR DELETE ON tournaments
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('tournament_id');
+
+CREATE TRIGGER bump_tournaments_version
+    AFTER INSERT OR UPDATE OR DELETE ON tournaments
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('tournaments');
+
+-- Append-only log of every match write, appended by the same statement as the write itself; payload is
+-- the match row after the change (before it, for deletes). Derived state can be rebuilt from it.
+CREATE TABLE match_events (
+    event_id BIGSERIAL PRIMARY KEY,
+    match_id INT NOT NULL,
+    tournament_id INT NOT NULL,
+    event_type VARCHAR(10) NOT NULL CHECK (event_type IN ('created', 'rescored', 'edited', 'deleted')),
+    payload JSONB NOT NULL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_match_events_match ON match_events(match_id, event_id);
+
+CREATE OR REPLACE FUNCTION reject_match_event_change()
+RETURNS TRIGGER AS $func$
+BEGIN
+    RAISE EXCEPTION 'match_events is append-only';
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER match_events_append_only
+    BEFORE UPDATE OR DELETE ON match_events
+    FOR EACH ROW
+    EXECUTE FUNCTION reject_match_event_change();
+
+-- Replay state as of last_event_id, so a rebuild starts from the newest snapshot instead of event zero
+CREATE TABLE match_event_snapshots (
+    last_event_id BIGINT PRIMARY KEY,
+    state JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Player search (/players/search) ranks by trigram similarity when pg_trgm can be installed; without it
+-- the API searches its in-process copy of the player names instead, so a missing extension is not fatal
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX idx_players_name_trgm ON players USING GIN (player_name gin_trgm_ops);
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'pg_trgm unavailable (%); player search uses the in-process prefix index', SQLERRM;
+END
+$$;
@@ -0,0 +1,146 @@
+-- Brings a database created from the original schema up to what 001 expects: change notifications and
+-- counters, Elo rating tables, tournament formats with the 'default' format, and the indexes added
+-- alongside them. Safe to run on a database that already has some or all of these.
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_matches_team1_player1 ON matches(team1_player1_id);
+CREATE INDEX IF NOT EXISTS idx_matches_team1_player2 ON matches(team1_player2_id);
+CREATE INDEX IF NOT EXISTS idx_matches_team2_player1 ON matches(team2_player1_id);
+CREATE INDEX IF NOT EXISTS idx_matches_team2_player2 ON matches(team2_player2_id);
+CREATE INDEX IF NOT EXISTS idx_matches_completed_round ON matches(round) WHERE status = 'COMPLETED';
+
+-- Change notifications
+CREATE TABLE IF NOT EXISTS change_versions (
+    table_name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO change_versions (table_name, version)
+VALUES ('matches', 0), ('players', 0), ('ratings', 0), ('format_rounds', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION notify_table_change()
+RETURNS TRIGGER AS $func$
+DECLARE
+    changed_row JSONB;
+    score_changed BOOLEAN := FALSE;
+    changed_table TEXT := COALESCE(TG_ARGV[1], TG_TABLE_NAME);
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := to_jsonb(OLD);
+    ELSE
+        changed_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        score_changed := (to_jsonb(NEW) -> 'team1_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team1_goals')
+            OR (to_jsonb(NEW) -> 'team2_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team2_goals');
+    END IF;
+
+    UPDATE change_versions SET version = version + 1 WHERE table_name = changed_table;
+
+    PERFORM pg_notify(
+        'table_changes',
+        json_build_object(
+            'table', changed_table,
+            'id', (changed_row ->> TG_ARGV[0])::INT,
+            'tournament_id', (changed_row ->> 'tournament_id')::INT,
+            'operation', TG_OP,
+            'score_changed', score_changed
+        )::text
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+-- matches is rebuilt by 001, which attaches its own notification trigger
+DROP TRIGGER IF EXISTS notify_players_change ON players;
+
+CREATE TRIGGER notify_players_change
+    AFTER INSERT OR UPDATE OR DELETE ON players
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('player_id');
+
+-- Elo ratings
+CREATE TABLE IF NOT EXISTS ratings (
+    entity_type VARCHAR(10) NOT NULL CHECK (entity_type IN ('player', 'team')),
+    entity_key VARCHAR(50) NOT NULL,
+    rating DOUBLE PRECISION NOT NULL,
+    matches_played INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (entity_type, entity_key)
+);
+
+CREATE TABLE IF NOT EXISTS rating_history (
+    id SERIAL PRIMARY KEY,
+    match_id INT NOT NULL,
+    match_date TIMESTAMP NOT NULL,
+    entity_type VARCHAR(10) NOT NULL,
+    entity_key VARCHAR(50) NOT NULL,
+    rating_before DOUBLE PRECISION NOT NULL,
+    rating_after DOUBLE PRECISION NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_rating_history_order ON rating_history(match_date, match_id);
+CREATE INDEX IF NOT EXISTS idx_rating_history_entity
+    ON rating_history(entity_type, entity_key, match_date, match_id);
+CREATE INDEX IF NOT EXISTS idx_ratings_rating ON ratings(entity_type, rating DESC);
+
+CREATE OR REPLACE FUNCTION notify_ratings_change()
+RETURNS TRIGGER AS $func$
+BEGIN
+    UPDATE change_versions SET version = version + 1 WHERE table_name = 'ratings';
+    PERFORM pg_notify(
+        'table_changes',
+        json_build_object('table', 'ratings', 'id', NULL, 'operation', TG_OP)::text
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_rating_history_change ON rating_history;
+
+CREATE TRIGGER notify_rating_history_change
+    AFTER INSERT OR DELETE ON rating_history
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_ratings_change();
+
+-- Tournament formats; existing matches are measured against 'default', which 001 assigns them to
+CREATE TABLE IF NOT EXISTS tournament_formats (
+    format_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS format_rounds (
+    format_id INT NOT NULL REFERENCES tournament_formats(format_id) ON DELETE CASCADE,
+    round VARCHAR(50) NOT NULL,
+    phase VARCHAR(50) NOT NULL,
+    position INT NOT NULL,
+    expected_matches INT NOT NULL CHECK (expected_matches >= 0),
+    PRIMARY KEY (format_id, round)
+);
+
+INSERT INTO tournament_formats (name) VALUES ('default') ON CONFLICT (name) DO NOTHING;
+
+INSERT INTO format_rounds (format_id, round, phase, position, expected_matches)
+SELECT f.format_id, r.round, r.phase, r.position, r.expected_matches
+FROM tournament_formats f
+CROSS JOIN (
+    VALUES
+        ('Round 1', 'League Phase', 1, 10),
+        ('Round 2', 'League Phase', 2, 15),
+        ('Knockout', 'Knockout Phase', 3, 4)
+) AS r(round, phase, position, expected_matches)
+WHERE f.name = 'default'
+    AND NOT EXISTS (SELECT 1 FROM format_rounds existing WHERE existing.format_id = f.format_id);
+
+DROP TRIGGER IF EXISTS notify_format_rounds_change ON format_rounds;
+
+CREATE TRIGGER notify_format_rounds_change
+    AFTER INSERT OR UPDATE OR DELETE ON format_rounds
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('format_id');
+
+COMMIT;
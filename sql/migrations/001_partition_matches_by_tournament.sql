@@ -0,0 +1,237 @@
+-- Moves an existing database onto tournament-partitioned matches. Run 000 first.
+-- Every existing match, and every player who played in one, goes into the 'Default' tournament (id 1).
+-- Run once, inside a maintenance window: matches is rewritten and locked for the duration.
+BEGIN;
+
+CREATE TABLE tournaments (
+    tournament_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    format_id INT NOT NULL REFERENCES tournament_formats(format_id),
+    starts_on DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Keep the existing table (and its id sequence) aside while the partitioned one is built
+ALTER TABLE match_stats DROP CONSTRAINT IF EXISTS match_stats_match_id_fkey;
+ALTER TABLE matches RENAME TO matches_unpartitioned;
+ALTER INDEX matches_pkey RENAME TO matches_unpartitioned_pkey;
+
+CREATE TABLE matches (
+    id INT NOT NULL DEFAULT nextval('matches_id_seq'),
+    tournament_id INT NOT NULL DEFAULT 1 REFERENCES tournaments(tournament_id),
+    round VARCHAR(50) NOT NULL,
+    match_type VARCHAR(10) CHECK (match_type IN ('1v1', '2v2')),
+    team1_player1_id INT REFERENCES players(player_id),
+    team1_player2_id INT REFERENCES players(player_id),
+    team2_player1_id INT REFERENCES players(player_id),
+    team2_player2_id INT REFERENCES players(player_id),
+    match_date TIMESTAMP NOT NULL,
+    scheduled_date TIMESTAMP NOT NULL,
+    team1_goals INT,
+    team2_goals INT,
+    result VARCHAR(50),
+    status VARCHAR(20) DEFAULT 'SCHEDULED' CHECK (status IN ('SCHEDULED', 'COMPLETED', 'CANCELLED')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, tournament_id)
+) PARTITION BY LIST (tournament_id);
+
+CREATE TABLE matches_default PARTITION OF matches DEFAULT;
+
+CREATE OR REPLACE FUNCTION create_tournament_partition()
+RETURNS TRIGGER AS $func$
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF matches FOR VALUES IN (%s)',
+        'matches_tournament_' || NEW.tournament_id,
+        NEW.tournament_id
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER create_tournament_partition
+    AFTER INSERT ON tournaments
+    FOR EACH ROW
+    EXECUTE FUNCTION create_tournament_partition();
+
+INSERT INTO tournaments (tournament_id, name, format_id)
+SELECT 1, 'Default', format_id FROM tournament_formats WHERE name = 'default';
+SELECT setval('tournaments_tournament_id_seq', 1);
+
+-- Every match defaults to, and is copied into, tournament 1
+DO $check$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM tournaments WHERE tournament_id = 1) THEN
+        RAISE EXCEPTION 'no ''default'' tournament format; run 000_notifications_ratings_and_formats.sql first';
+    END IF;
+END;
+$check$;
+
+-- Copy before any triggers exist on the new table, so no notifications or match_stats rows are produced
+INSERT INTO matches (
+    id, tournament_id, round, match_type,
+    team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id,
+    match_date, scheduled_date, team1_goals, team2_goals, result, status, created_at, updated_at
+)
+SELECT
+    id, 1, round, match_type,
+    team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id,
+    match_date, scheduled_date, team1_goals, team2_goals, result, status, created_at, updated_at
+FROM matches_unpartitioned;
+
+ALTER SEQUENCE matches_id_seq OWNED BY matches.id;
+DROP TABLE matches_unpartitioned;
+
+CREATE INDEX idx_matches_status ON matches(status);
+CREATE INDEX idx_matches_date ON matches(match_date);
+CREATE INDEX idx_matches_round ON matches(round);
+CREATE INDEX idx_matches_team1_player1 ON matches(team1_player1_id);
+CREATE INDEX idx_matches_team1_player2 ON matches(team1_player2_id);
+CREATE INDEX idx_matches_team2_player1 ON matches(team2_player1_id);
+CREATE INDEX idx_matches_team2_player2 ON matches(team2_player2_id);
+CREATE INDEX idx_matches_completed_round ON matches(round) WHERE status = 'COMPLETED';
+
+-- match_stats rows point at (match, tournament) now
+ALTER TABLE match_stats ADD COLUMN tournament_id INT NOT NULL DEFAULT 1;
+DELETE FROM match_stats WHERE match_id IS NULL OR match_id NOT IN (SELECT id FROM matches);
+ALTER TABLE match_stats ALTER COLUMN match_id SET NOT NULL;
+ALTER TABLE match_stats
+    ADD FOREIGN KEY (match_id, tournament_id) REFERENCES matches(id, tournament_id) ON DELETE CASCADE;
+
+CREATE OR REPLACE FUNCTION update_player_stats()
+RETURNS TRIGGER AS $func$
+BEGIN
+    IF NEW.status = 'COMPLETED' AND OLD.status = 'SCHEDULED' THEN
+        -- Team 1 player 1
+        INSERT INTO match_stats (match_id, tournament_id, player_id, goals, clean_sheet, points)
+        VALUES (
+            NEW.id,
+            NEW.tournament_id,
+            NEW.team1_player1_id,
+            NEW.team1_goals,
+            CASE WHEN NEW.team2_goals = 0 THEN TRUE ELSE FALSE END,
+            CASE
+                WHEN NEW.team1_goals > NEW.team2_goals THEN 6
+                WHEN NEW.team1_goals = NEW.team2_goals THEN 2
+                ELSE 0
+            END
+        );
+
+        -- Team 2 player 1
+        INSERT INTO match_stats (match_id, tournament_id, player_id, goals, clean_sheet, points)
+        VALUES (
+            NEW.id,
+            NEW.tournament_id,
+            NEW.team2_player1_id,
+            NEW.team2_goals,
+            CASE WHEN NEW.team1_goals = 0 THEN TRUE ELSE FALSE END,
+            CASE
+                WHEN NEW.team2_goals > NEW.team1_goals THEN 6
+                WHEN NEW.team2_goals = NEW.team1_goals THEN 2
+                ELSE 0
+            END
+        );
+    END IF;
+    RETURN NEW;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_table_change()
+RETURNS TRIGGER AS $func$
+DECLARE
+    changed_row JSONB;
+    score_changed BOOLEAN := FALSE;
+    changed_table TEXT := COALESCE(TG_ARGV[1], TG_TABLE_NAME);
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := to_jsonb(OLD);
+    ELSE
+        changed_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        score_changed := (to_jsonb(NEW) -> 'team1_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team1_goals')
+            OR (to_jsonb(NEW) -> 'team2_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team2_goals');
+    END IF;
+
+    UPDATE change_versions SET version = version + 1 WHERE table_name = changed_table;
+
+    PERFORM pg_notify(
+        'table_changes',
+        json_build_object(
+            'table', changed_table,
+            'id', (changed_row ->> TG_ARGV[0])::INT,
+            'tournament_id', (changed_row ->> 'tournament_id')::INT,
+            'operation', TG_OP,
+            'score_changed', score_changed
+        )::text
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_matches_timestamp
+    BEFORE UPDATE ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION update_timestamp();
+
+CREATE TRIGGER update_match_stats
+    AFTER UPDATE ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION update_player_stats();
+
+CREATE TRIGGER notify_matches_change
+    AFTER INSERT OR UPDATE OR DELETE ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('id', 'matches');
+
+-- Tournament participation, backfilled from the migrated matches
+CREATE TABLE tournament_players (
+    tournament_id INT NOT NULL REFERENCES tournaments(tournament_id) ON DELETE CASCADE,
+    player_id INT NOT NULL REFERENCES players(player_id) ON DELETE CASCADE,
+    PRIMARY KEY (tournament_id, player_id)
+);
+
+CREATE INDEX idx_tournament_players_player ON tournament_players(player_id);
+
+INSERT INTO tournament_players (tournament_id, player_id)
+SELECT DISTINCT m.tournament_id, s.player_id
+FROM matches m
+CROSS JOIN LATERAL unnest(ARRAY[
+    m.team1_player1_id, m.team1_player2_id, m.team2_player1_id, m.team2_player2_id
+]) AS s(player_id)
+WHERE s.player_id IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION record_tournament_players()
+RETURNS TRIGGER AS $func$
+BEGIN
+    INSERT INTO tournament_players (tournament_id, player_id)
+    SELECT NEW.tournament_id, player_id
+    FROM unnest(ARRAY[
+        NEW.team1_player1_id, NEW.team1_player2_id,
+        NEW.team2_player1_id, NEW.team2_player2_id
+    ]) AS player_id
+    WHERE player_id IS NOT NULL
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER record_tournament_players
+    AFTER INSERT OR UPDATE OF team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION record_tournament_players();
+
+INSERT INTO change_versions (table_name, version) VALUES ('tournaments', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE TRIGGER notify_tournaments_change
+    AFTER INSERT OR UPDATE OR DELETE ON tournaments
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('tournament_id');
+
+-- The new partitioned table starts with fresh statistics
+ANALYZE matches;
+
+COMMIT;
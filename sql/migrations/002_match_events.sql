@@ -0,0 +1,106 @@
+-- Adds the append-only match event log and makes match_stats follow every match write.
+-- Existing matches are seeded as one 'created' event each (their current state), and match_stats is
+-- recomputed for them, since the old trigger missed edits, 2v2 partners and matches created completed.
+BEGIN;
+
+CREATE TABLE match_events (
+    event_id BIGSERIAL PRIMARY KEY,
+    match_id INT NOT NULL,
+    tournament_id INT NOT NULL,
+    event_type VARCHAR(10) NOT NULL CHECK (event_type IN ('created', 'rescored', 'edited', 'deleted')),
+    payload JSONB NOT NULL,
+    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_match_events_match ON match_events(match_id, event_id);
+
+CREATE OR REPLACE FUNCTION reject_match_event_change()
+RETURNS TRIGGER AS $func$
+BEGIN
+    RAISE EXCEPTION 'match_events is append-only';
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE TRIGGER match_events_append_only
+    BEFORE UPDATE OR DELETE ON match_events
+    FOR EACH ROW
+    EXECUTE FUNCTION reject_match_event_change();
+
+CREATE TABLE match_event_snapshots (
+    last_event_id BIGINT PRIMARY KEY,
+    state JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO match_events (match_id, tournament_id, event_type, payload, recorded_at)
+SELECT m.id, m.tournament_id, 'created', to_jsonb(m), m.created_at
+FROM matches m
+ORDER BY m.created_at, m.id;
+
+CREATE OR REPLACE FUNCTION update_player_stats()
+RETURNS TRIGGER AS $func$
+BEGIN
+    DELETE FROM match_stats WHERE match_id = NEW.id AND tournament_id = NEW.tournament_id;
+
+    IF NEW.status = 'COMPLETED' AND NEW.team1_goals IS NOT NULL AND NEW.team2_goals IS NOT NULL THEN
+        INSERT INTO match_stats (match_id, tournament_id, player_id, goals, clean_sheet, points)
+        SELECT
+            NEW.id,
+            NEW.tournament_id,
+            s.player_id,
+            s.goals_for,
+            s.goals_against = 0,
+            CASE
+                WHEN s.goals_for > s.goals_against THEN CASE WHEN NEW.match_type = '2v2' THEN 3 ELSE 6 END
+                WHEN s.goals_for = s.goals_against THEN CASE WHEN NEW.match_type = '2v2' THEN 1 ELSE 2 END
+                ELSE 0
+            END
+        FROM (
+            VALUES
+                (NEW.team1_player1_id, NEW.team1_goals, NEW.team2_goals),
+                (NEW.team1_player2_id, NEW.team1_goals, NEW.team2_goals),
+                (NEW.team2_player1_id, NEW.team2_goals, NEW.team1_goals),
+                (NEW.team2_player2_id, NEW.team2_goals, NEW.team1_goals)
+        ) AS s(player_id, goals_for, goals_against)
+        WHERE s.player_id IS NOT NULL;
+    END IF;
+    RETURN NEW;
+END;
+$func$ LANGUAGE plpgsql;
+
+DROP TRIGGER update_match_stats ON matches;
+
+CREATE TRIGGER update_match_stats
+    AFTER INSERT OR UPDATE ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION update_player_stats();
+
+-- Recompute every match's rows with the new rules
+DELETE FROM match_stats;
+
+INSERT INTO match_stats (match_id, tournament_id, player_id, goals, clean_sheet, points)
+SELECT
+    m.id,
+    m.tournament_id,
+    s.player_id,
+    s.goals_for,
+    s.goals_against = 0,
+    CASE
+        WHEN s.goals_for > s.goals_against THEN CASE WHEN m.match_type = '2v2' THEN 3 ELSE 6 END
+        WHEN s.goals_for = s.goals_against THEN CASE WHEN m.match_type = '2v2' THEN 1 ELSE 2 END
+        ELSE 0
+    END
+FROM matches m
+CROSS JOIN LATERAL (
+    VALUES
+        (m.team1_player1_id, m.team1_goals, m.team2_goals),
+        (m.team1_player2_id, m.team1_goals, m.team2_goals),
+        (m.team2_player1_id, m.team2_goals, m.team1_goals),
+        (m.team2_player2_id, m.team2_goals, m.team1_goals)
+) AS s(player_id, goals_for, goals_against)
+WHERE m.status = 'COMPLETED'
+AND m.team1_goals IS NOT NULL
+AND m.team2_goals IS NOT NULL
+AND s.player_id IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- Trigram index for /players/search. Needs the pg_trgm extension (in contrib); where it cannot be
+-- installed the block only raises a notice, and the API falls back to its in-process prefix index.
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS idx_players_name_trgm ON players USING GIN (player_name gin_trgm_ops);
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'pg_trgm unavailable (%); player search uses the in-process prefix index', SQLERRM;
+END
+$$;
@@ -0,0 +1,70 @@
+-- Bumps change_versions once per statement instead of once per row. The per-row bump made every
+-- concurrent writer to a table queue on that table's counter row for the rest of its transaction, and
+-- left a dead tuple behind for every row written. Row-level NOTIFY payloads are unchanged.
+BEGIN;
+
+CREATE OR REPLACE FUNCTION notify_table_change()
+RETURNS TRIGGER AS $func$
+DECLARE
+    changed_row JSONB;
+    score_changed BOOLEAN := FALSE;
+    changed_table TEXT := COALESCE(TG_ARGV[1], TG_TABLE_NAME);
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_row := to_jsonb(OLD);
+    ELSE
+        changed_row := to_jsonb(NEW);
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        score_changed := (to_jsonb(NEW) -> 'team1_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team1_goals')
+            OR (to_jsonb(NEW) -> 'team2_goals') IS DISTINCT FROM (to_jsonb(OLD) -> 'team2_goals');
+    END IF;
+
+    PERFORM pg_notify(
+        'table_changes',
+        json_build_object(
+            'table', changed_table,
+            'id', (changed_row ->> TG_ARGV[0])::INT,
+            'tournament_id', (changed_row ->> 'tournament_id')::INT,
+            'operation', TG_OP,
+            'score_changed', score_changed
+        )::text
+    );
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION bump_change_version()
+RETURNS TRIGGER AS $func$
+BEGIN
+    UPDATE change_versions SET version = version + 1 WHERE table_name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+INSERT INTO change_versions (table_name, version)
+VALUES ('matches', 0), ('players', 0), ('format_rounds', 0), ('tournaments', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE TRIGGER bump_matches_version
+    AFTER INSERT OR UPDATE OR DELETE ON matches
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('matches');
+
+CREATE TRIGGER bump_players_version
+    AFTER INSERT OR UPDATE OR DELETE ON players
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('players');
+
+CREATE TRIGGER bump_format_rounds_version
+    AFTER INSERT OR UPDATE OR DELETE ON format_rounds
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('format_rounds');
+
+CREATE TRIGGER bump_tournaments_version
+    AFTER INSERT OR UPDATE OR DELETE ON tournaments
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('tournaments');
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- Broadcasts tournament_formats changes like format_rounds changes, so workers drop cached formats
+-- (and the overviews built on them) when a format is renamed, replaced or removed.
+BEGIN;
+
+INSERT INTO change_versions (table_name, version) VALUES ('tournament_formats', 0)
+ON CONFLICT (table_name) DO NOTHING;
+
+CREATE TRIGGER notify_tournament_formats_change
+    AFTER INSERT OR UPDATE OR DELETE ON tournament_formats
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('format_id');
+
+CREATE TRIGGER bump_tournament_formats_version
+    AFTER INSERT OR UPDATE OR DELETE ON tournament_formats
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_change_version('tournament_formats');
+
+COMMIT;
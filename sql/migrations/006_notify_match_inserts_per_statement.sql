@@ -0,0 +1,44 @@
+-- Match inserts notify once per statement and tournament instead of once per row, so a bulk fixture
+-- insert reaches workers and live subscribers as one change. Updates and deletes still notify per row.
+BEGIN;
+
+CREATE OR REPLACE FUNCTION notify_matches_inserted()
+RETURNS TRIGGER AS $func$
+DECLARE
+    batch RECORD;
+BEGIN
+    FOR batch IN
+        SELECT tournament_id, count(*) AS inserted_count, min(id) AS first_id
+        FROM inserted_matches
+        GROUP BY tournament_id
+    LOOP
+        PERFORM pg_notify(
+            'table_changes',
+            json_build_object(
+                'table', 'matches',
+                'id', CASE WHEN batch.inserted_count = 1 THEN batch.first_id END,
+                'tournament_id', batch.tournament_id,
+                'operation', 'INSERT',
+                'score_changed', FALSE,
+                'count', batch.inserted_count
+            )::text
+        );
+    END LOOP;
+    RETURN NULL;
+END;
+$func$ LANGUAGE plpgsql;
+
+DROP TRIGGER notify_matches_change ON matches;
+
+CREATE TRIGGER notify_matches_change
+    AFTER UPDATE OR DELETE ON matches
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_table_change('id', 'matches');
+
+CREATE TRIGGER notify_matches_insert
+    AFTER INSERT ON matches
+    REFERENCING NEW TABLE AS inserted_matches
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_matches_inserted();
+
+COMMIT;
@@ -0,0 +1,10 @@
+import pytest
+
+from app.cache import result_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    result_cache.clear()
+    yield
+    result_cache.clear()
@@ -0,0 +1,232 @@
+import os
+import shutil
+import subprocess
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+from app.database import ReplicaRouter, get_connection
+from app.player_directory import player_directory
+
+SCHEMA_FILE = Path(__file__).resolve().parents[2] / "sql" / "create.sql"
+
+
+# Without POSTGRES_HOST, starts a throwaway PostgreSQL cluster for the session when the server binaries
+# (initdb, pg_ctl) are on PATH or in PG_BIN. It listens only on a Unix socket in a temporary directory
+# and is stopped and deleted afterwards. initdb refuses to run as root, so root falls through to the
+# skip in `database` like a machine without the binaries.
+@pytest.fixture(scope="session", autouse=True)
+def ephemeral_postgres(tmp_path_factory):
+    bin_dir = os.environ.get("PG_BIN") or os.path.dirname(shutil.which("initdb") or "")
+    if (
+        os.environ.get("POSTGRES_HOST")
+        or not bin_dir
+        or not os.path.exists(os.path.join(bin_dir, "pg_ctl"))
+        or os.geteuid() == 0
+    ):
+        yield
+        return
+
+    root = tmp_path_factory.mktemp("postgres")
+    data = root / "data"
+    subprocess.run(
+        [os.path.join(bin_dir, "initdb"), "-D", str(data), "-A", "trust", "-U", "postgres", "--no-sync"],
+        check=True,
+        capture_output=True,
+    )
+    pg_ctl = os.path.join(bin_dir, "pg_ctl")
+    options = f"-k {root} -c listen_addresses='' -c fsync=off -c synchronous_commit=off"
+    subprocess.run(
+        [pg_ctl, "-D", str(data), "-l", str(root / "server.log"), "-o", options, "-w", "start"],
+        check=True,
+        capture_output=True,
+    )
+    env = {"POSTGRES_HOST": str(root), "POSTGRES_PORT": "5432", "POSTGRES_USER": "postgres", "POSTGRES_DB": "postgres"}
+    previous = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        subprocess.run([pg_ctl, "-D", str(data), "-m", "immediate", "stop"], capture_output=True)
+
+
+# Runs against the PostgreSQL configured through the POSTGRES_* variables. Every test gets its own
+# schema loaded from sql/create.sql, and PGOPTIONS points every get_connection() at it.
+@pytest.fixture
+def database(monkeypatch):
+    if not os.environ.get("POSTGRES_HOST"):
+        pytest.skip("POSTGRES_HOST is not set; skipping PostgreSQL integration tests")
+    try:
+        admin = get_connection()
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e}")
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+        cur.execute(f"SET search_path TO {schema}")
+        cur.execute(SCHEMA_FILE.read_text())
+    monkeypatch.setenv("PGOPTIONS", f"-c search_path={schema}")
+    # Names loaded for an earlier test's schema
+    player_directory.invalidate()
+
+    try:
+        yield admin
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+# A second, independent PostgreSQL instance (POSTGRES_REPLICA_HOST/POSTGRES_REPLICA_PORT) standing in for
+# the read replica. It is not replicating: it gets the same schema, so tests can tell which server
+# answered a query by the rows each one holds.
+@pytest.fixture
+def replica_database(database, monkeypatch):
+    host = os.environ.get("POSTGRES_REPLICA_HOST")
+    if not host:
+        pytest.skip("POSTGRES_REPLICA_HOST is not set; skipping read replica tests")
+    port = os.environ.get("POSTGRES_REPLICA_PORT", os.environ.get("POSTGRES_PORT", "5432"))
+    schema = os.environ["PGOPTIONS"].rsplit("=", 1)[1]
+
+    replica = psycopg2.connect(
+        dbname=os.environ.get("POSTGRES_DB"),
+        user=os.environ.get("POSTGRES_USER"),
+        password=os.environ.get("POSTGRES_PASSWORD"),
+        host=host,
+        port=port,
+        options="-c search_path=public",
+    )
+    replica.autocommit = True
+    with replica.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+        cur.execute(f"SET search_path TO {schema}")
+        cur.execute(SCHEMA_FILE.read_text())
+
+    router = ReplicaRouter(host=host, port=port)
+    monkeypatch.setattr("app.database.replica_router", router)
+    try:
+        yield replica
+    finally:
+        router.close()
+        with replica.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        replica.close()
+
+
+# What the app did against the database during one recorded block: each connection opened (numbered from 1)
+# and each statement executed, with the number of the connection it ran on
+class Recording:
+    def __init__(self):
+        self.connections = 0
+        self.statements: List[Tuple[Optional[int], str]] = []
+        self._lock = threading.Lock()
+
+    def connection_opened(self) -> int:
+        with self._lock:
+            self.connections += 1
+            return self.connections
+
+    def statement(self, connection: Optional[int], query: str) -> None:
+        with self._lock:
+            self.statements.append((connection, " ".join(query.split())))
+
+    def statements_on(self, connection: int) -> List[str]:
+        return [query for number, query in self.statements if number == connection]
+
+    def assert_budget(self, connections: Optional[int] = None, statements: Optional[int] = None) -> None:
+        report = "\n".join(f"  [{number}] {query[:300]}" for number, query in self.statements)
+        if connections is not None:
+            assert (
+                self.connections <= connections
+            ), f"{self.connections} connections opened, budget is {connections}; statements:\n{report}"
+        if statements is not None:
+            assert (
+                len(self.statements) <= statements
+            ), f"{len(self.statements)} statements executed, budget is {statements}:\n{report}"
+
+
+# Wraps psycopg2.connect, so every connection the app opens (directly or through a pool) records into the
+# active Recording. Connections opened before the recorder was set up, like the test's own admin
+# connection, are not recorded.
+class QueryRecorder:
+    def __init__(self):
+        self.current: Optional[Recording] = None
+        self._connect = psycopg2.connect
+        self._connection_classes: Dict[type, Type] = {}
+        self._cursor_classes: Dict[type, Type] = {}
+
+    def connect(self, *args, connection_factory=None, **kwargs):
+        base = connection_factory or psycopg2.extensions.connection
+        conn = self._connect(*args, connection_factory=self._connection_class(base), **kwargs)
+        recording = self.current
+        conn.number = recording.connection_opened() if recording else None
+        return conn
+
+    @contextmanager
+    def record(self):
+        self.current = recording = Recording()
+        try:
+            yield recording
+        finally:
+            self.current = None
+
+    def _connection_class(self, base: type) -> Type:
+        cls = self._connection_classes.get(base)
+        if cls is None:
+            recorder = self
+
+            def cursor(conn, *args, cursor_factory=None, **kwargs):
+                factory = cursor_factory or conn.cursor_factory or psycopg2.extensions.cursor
+                return base.cursor(conn, *args, cursor_factory=recorder._cursor_class(factory), **kwargs)
+
+            cls = self._connection_classes[base] = type(f"Recording{base.__name__}", (base,), {"cursor": cursor})
+        return cls
+
+    def _cursor_class(self, base: type) -> Type:
+        cls = self._cursor_classes.get(base)
+        if cls is None:
+            recorder = self
+
+            def execute(cur, query, vars=None):
+                recorder._record(cur, query)
+                return base.execute(cur, query, vars)
+
+            def executemany(cur, query, vars_list):
+                recorder._record(cur, query)
+                return base.executemany(cur, query, vars_list)
+
+            cls = self._cursor_classes[base] = type(
+                f"Recording{base.__name__}", (base,), {"execute": execute, "executemany": executemany}
+            )
+        return cls
+
+    def _record(self, cur, query) -> None:
+        recording = self.current
+        if recording is None:
+            return
+        if isinstance(query, bytes):
+            query = query.decode()
+        elif not isinstance(query, str):
+            # psycopg2.sql.Composed
+            query = query.as_string(cur.connection)
+        recording.statement(getattr(cur.connection, "number", None), query)
+
+
+@pytest.fixture
+def query_recorder(database, monkeypatch):
+    recorder = QueryRecorder()
+    monkeypatch.setattr(psycopg2, "connect", recorder.connect)
+    return recorder
@@ -0,0 +1,132 @@
+import threading
+import time
+
+from app.notifications import RESYNC_CHANGE, ChangeListener, VersionPoller
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class Recorder:
+    def __init__(self):
+        self.changes = []
+        self.lock = threading.Lock()
+
+    def __call__(self, change):
+        with self.lock:
+            self.changes.append(change)
+
+    def seen(self, **expected):
+        with self.lock:
+            return any(all(change.get(k) == v for k, v in expected.items()) for change in self.changes)
+
+
+def insert_player(database, name="Test Player"):
+    with database.cursor() as cur:
+        cur.execute("INSERT INTO players (player_name) VALUES (%s) RETURNING player_id", (name,))
+        return cur.fetchone()[0]
+
+
+def test_listener_receives_player_and_match_changes(database):
+    recorder = Recorder()
+    listener = ChangeListener(poll_timeout=0.2)
+    listener.subscribe(recorder)
+    listener.start()
+    try:
+        assert listener.connected.wait(5)
+        player1, player2 = insert_player(database), insert_player(database)
+        with database.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO matches (round, match_type, team1_player1_id, team2_player1_id, match_date, scheduled_date)
+                VALUES ('Round 1', '1v1', %s, %s, now(), now())
+                RETURNING id
+                """,
+                (player1, player2),
+            )
+            match_id = cur.fetchone()[0]
+            cur.execute("UPDATE matches SET team1_goals = 2, team2_goals = 1 WHERE id = %s", (match_id,))
+
+        assert wait_for(lambda: recorder.seen(table="players", id=player2, operation="INSERT"))
+        assert wait_for(lambda: recorder.seen(table="matches", id=match_id, operation="INSERT"))
+        assert wait_for(lambda: recorder.seen(table="matches", id=match_id, operation="UPDATE", score_changed=True))
+    finally:
+        listener.stop()
+
+
+def test_listener_reconnects_and_resyncs(database):
+    recorder = Recorder()
+    listener = ChangeListener(poll_timeout=0.2, max_backoff=0.5)
+    listener.subscribe(recorder)
+    listener.start()
+    try:
+        assert listener.connected.wait(5)
+        with database.cursor() as cur:
+            cur.execute(
+                """
+                SELECT pg_terminate_backend(pid) FROM pg_stat_activity
+                WHERE query LIKE 'LISTEN %%' AND pid <> pg_backend_pid()
+                """
+            )
+        assert wait_for(lambda: recorder.changes.count(RESYNC_CHANGE) >= 2)
+        assert listener.connected.wait(5)
+
+        player_id = insert_player(database)
+        assert wait_for(lambda: recorder.seen(table="players", id=player_id))
+    finally:
+        listener.stop()
+
+
+def test_version_poller_detects_changes(database):
+    recorder = Recorder()
+    poller = VersionPoller()
+    poller.subscribe(recorder)
+
+    poller.poll()
+    insert_player(database)
+    poller.poll()
+
+    assert recorder.changes == [{"table": "players", "id": None, "operation": "VERSION"}]
+
+
+def test_versions_are_bumped_once_per_statement(database):
+    def version():
+        with database.cursor() as cur:
+            cur.execute("SELECT version FROM change_versions WHERE table_name = 'players'")
+            return cur.fetchone()[0]
+
+    before = version()
+    with database.cursor() as cur:
+        cur.execute("INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, 5) n")
+
+    assert version() == before + 1
+
+
+def test_bulk_match_insert_notifies_once(database):
+    recorder = Recorder()
+    listener = ChangeListener(poll_timeout=0.2)
+    listener.subscribe(recorder)
+    listener.start()
+    try:
+        assert listener.connected.wait(5)
+        player1, player2 = insert_player(database), insert_player(database)
+        with database.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO matches (round, match_type, team1_player1_id, team2_player1_id, match_date, scheduled_date)
+                SELECT 'Round 1', '1v1', %s, %s, now(), now() FROM generate_series(1, 30)
+                """,
+                (player1, player2),
+            )
+
+        assert wait_for(lambda: recorder.seen(table="matches", id=None, operation="INSERT", count=30))
+        time.sleep(0.3)
+        assert len([change for change in recorder.changes if change.get("table") == "matches"]) == 1
+    finally:
+        listener.stop()
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import MatchCreate
+from app.repositories.match_repository import MatchRepository
+from app.repositories.player_repository import PlayerRepository
+from app.services.match_event_service import MatchEventService
+
+
+def create_players(database, count):
+    with database.cursor() as cur:
+        cur.execute(
+            "INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, %s) n RETURNING player_id",
+            (count,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def scheduled_match(player_ids):
+    return MatchCreate(
+        round="Round 1",
+        match_type="1v1",
+        team1_player1_id=player_ids[0],
+        team2_player1_id=player_ids[1],
+        match_date=datetime.now() + timedelta(days=1),
+    )
+
+
+def create_scheduled_match(repository, player_ids):
+    # MatchService passes the match date when no scheduled date is given; scheduled_date is NOT NULL
+    match = scheduled_match(player_ids)
+    return asyncio.run(repository.create_match(match, 1, match.match_date, "SCHEDULED", None))
+
+
+def test_update_match_score_returns_previous_and_updated_rows(database):
+    player_ids = create_players(database, 2)
+    repository = MatchRepository()
+    match = create_scheduled_match(repository, player_ids)
+
+    previous, updated = asyncio.run(repository.update_match_score(match["id"], 1, 2, 1, "Team1"))
+
+    assert previous == {
+        "id": match["id"],
+        "match_date": match["match_date"],
+        "status": "SCHEDULED",
+        "team1_goals": None,
+        "team2_goals": None,
+    }
+    assert updated["status"] == "COMPLETED"
+    assert updated["team1_goals"] == 2
+    assert not any(column.startswith("previous_") for column in updated)
+    payload = MatchEventService().get_events(match["id"])[-1]["payload"]
+    assert not any(key.startswith("previous_") for key in payload)
+
+
+def test_conditional_match_writes_report_missing_matches(database):
+    player_ids = create_players(database, 2)
+    repository = MatchRepository()
+    match = create_scheduled_match(repository, player_ids)
+
+    # Right id, wrong tournament
+    assert asyncio.run(repository.update_match_score(match["id"], 2, 2, 1, "Team1")) is None
+    assert asyncio.run(repository.update_match(match["id"], 2, scheduled_match(player_ids), "SCHEDULED", None)) is None
+    assert asyncio.run(repository.delete_match(match["id"], 2)) is None
+    assert [event["event_type"] for event in MatchEventService().get_events(match["id"])] == ["created"]
+
+
+def test_delete_player_in_one_statement(database):
+    player_ids = create_players(database, 3)
+    create_scheduled_match(MatchRepository(), player_ids)
+    repository = PlayerRepository()
+
+    with pytest.raises(ValueError, match="as they have 1 matches associated"):
+        repository.delete_player(player_ids[0])
+    assert repository.delete_player(player_ids[2])["player_id"] == player_ids[2]
+    assert repository.delete_player(player_ids[2]) is None
@@ -0,0 +1,50 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import FixtureRequest, MatchType
+from app.services.fixture_service import FixtureService
+
+
+def insert_players(database, count):
+    with database.cursor() as cur:
+        cur.execute(
+            "INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, %s) n RETURNING player_id",
+            (count,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def test_bulk_inserts_full_round_robin(database):
+    player_ids = insert_players(database, 40)
+    request = FixtureRequest(
+        round="Round 1",
+        match_type=MatchType.ONE_V_ONE,
+        player_ids=player_ids,
+        start_date=datetime.now() + timedelta(days=1),
+    )
+
+    created = asyncio.run(FixtureService().create_fixtures(request))
+
+    assert len(created) == 40 * 39 // 2
+    with database.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM matches WHERE status = 'SCHEDULED'")
+        assert cur.fetchone()[0] == len(created)
+
+
+def test_unknown_player_inserts_nothing(database):
+    player_ids = insert_players(database, 3)
+    request = FixtureRequest(
+        round="Round 2",
+        match_type=MatchType.TWO_V_TWO,
+        player_ids=player_ids + [max(player_ids) + 1],
+        start_date=datetime.now() + timedelta(days=1),
+    )
+
+    with pytest.raises(Exception):
+        asyncio.run(FixtureService().create_fixtures(request))
+
+    with database.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM matches")
+        assert cur.fetchone()[0] == 0
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import psycopg2
+import pytest
+
+from app.models import MatchCreate
+from app.repositories.match_event_repository import MatchEventRepository
+from app.repositories.match_repository import MatchRepository
+from app.services.match_event_service import MatchEventService
+
+
+def create_players(database, count):
+    with database.cursor() as cur:
+        cur.execute(
+            "INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, %s) n RETURNING player_id",
+            (count,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+
+def scheduled_match(player_ids):
+    return MatchCreate(
+        round="Round 1",
+        match_type="1v1",
+        team1_player1_id=player_ids[0],
+        team2_player1_id=player_ids[1],
+        match_date=datetime.now() + timedelta(days=1),
+    )
+
+
+def create_scheduled_match(repository, player_ids):
+    # MatchService passes the match date when no scheduled date is given; scheduled_date is NOT NULL
+    match = scheduled_match(player_ids)
+    return asyncio.run(repository.create_match(match, 1, match.match_date, "SCHEDULED", None))
+
+
+def test_match_writes_append_events(database):
+    player_ids = create_players(database, 2)
+    repository = MatchRepository()
+
+    match = create_scheduled_match(repository, player_ids)
+    asyncio.run(repository.update_match_score(match["id"], 1, 2, 1, "Team1"))
+    asyncio.run(repository.delete_match(match["id"], 1))
+
+    events = MatchEventService().get_events(match["id"])
+    assert [event["event_type"] for event in events] == ["created", "rescored", "deleted"]
+    assert events[1]["payload"]["team1_goals"] == 2
+
+
+def test_rescoring_a_completed_match_updates_match_stats(database):
+    player_ids = create_players(database, 2)
+    repository = MatchRepository()
+    match = create_scheduled_match(repository, player_ids)
+
+    asyncio.run(repository.update_match_score(match["id"], 1, 2, 1, "Team1"))
+    asyncio.run(repository.update_match_score(match["id"], 1, 0, 3, "Team2"))
+
+    with database.cursor() as cur:
+        cur.execute("SELECT player_id, goals, points FROM match_stats ORDER BY player_id")
+        assert cur.fetchall() == [(player_ids[0], 0, 0), (player_ids[1], 3, 6)]
+
+
+def test_replay_matches_trigger_maintained_stats(database):
+    player_ids = create_players(database, 2)
+    repository = MatchRepository()
+    match = create_scheduled_match(repository, player_ids)
+    asyncio.run(repository.update_match_score(match["id"], 1, 1, 1, "Draw"))
+
+    with database.cursor() as cur:
+        cur.execute("SELECT match_id, player_id, goals, clean_sheet, points FROM match_stats ORDER BY player_id")
+        before = cur.fetchall()
+
+    result = MatchEventService().replay()
+
+    assert result["persisted"] is True
+    with database.cursor() as cur:
+        cur.execute("SELECT match_id, player_id, goals, clean_sheet, points FROM match_stats ORDER BY player_id")
+        assert cur.fetchall() == before
+        cur.execute("SELECT COUNT(*) FROM match_event_snapshots")
+        assert cur.fetchone()[0] == 1
+
+
+def test_match_write_during_replay_keeps_its_stats(database, monkeypatch):
+    player_ids = create_players(database, 4)
+    repository = MatchRepository()
+    first = create_scheduled_match(repository, player_ids[:2])
+    second = create_scheduled_match(repository, player_ids[2:])
+    asyncio.run(repository.update_match_score(first["id"], 1, 2, 0, "Team1"))
+
+    # Hold the replay after its first event until the write has had its chance to run
+    streaming, proceed = threading.Event(), threading.Event()
+    stream_events = MatchEventRepository.stream_events
+
+    def paused_stream(self, *args, **kwargs):
+        for number, event in enumerate(stream_events(self, *args, **kwargs)):
+            yield event
+            if number == 0:
+                streaming.set()
+                proceed.wait(10)
+
+    monkeypatch.setattr(MatchEventRepository, "stream_events", paused_stream)
+    replay = threading.Thread(target=MatchEventService().replay)
+    replay.start()
+    assert streaming.wait(10)
+
+    write = threading.Thread(target=lambda: asyncio.run(repository.update_match_score(second["id"], 1, 1, 3, "Team2")))
+    write.start()
+    write.join(1)
+    # The write waits for the replay's lock on matches instead of committing under it
+    assert write.is_alive()
+    proceed.set()
+    replay.join(10)
+    write.join(10)
+    assert not replay.is_alive() and not write.is_alive()
+
+    with database.cursor() as cur:
+        cur.execute("SELECT match_id, player_id, goals FROM match_stats ORDER BY match_id, player_id")
+        assert cur.fetchall() == [
+            (first["id"], player_ids[0], 2),
+            (first["id"], player_ids[1], 0),
+            (second["id"], player_ids[2], 1),
+            (second["id"], player_ids[3], 3),
+        ]
+
+
+def test_match_events_are_append_only(database):
+    player_ids = create_players(database, 2)
+    create_scheduled_match(MatchRepository(), player_ids)
+
+    with database.cursor() as cur:
+        with pytest.raises(psycopg2.Error):
+            cur.execute("DELETE FROM match_events")
@@ -0,0 +1,37 @@
+import pytest
+
+from app.repositories.player_repository import PlayerRepository
+from app.services.player_service import PlayerService
+
+
+def add_players(database, *names):
+    with database.cursor() as cur:
+        for name in names:
+            cur.execute("INSERT INTO players (player_name) VALUES (%s)", (name,))
+
+
+def trigram_installed(database):
+    with database.cursor() as cur:
+        cur.execute("SELECT to_regclass('idx_players_name_trgm') IS NOT NULL")
+        return cur.fetchone()[0]
+
+
+def test_trigram_search_ranks_prefix_then_similarity(database):
+    if not trigram_installed(database):
+        pytest.skip("pg_trgm is not available on this server")
+    add_players(database, "Samuel Eto'o", "Sami Hyypia", "Hasan Salihamidzic", "Thierry Henry", "100%_Player")
+
+    names = [row["player_name"] for row in PlayerRepository().search_players("sam", 10)]
+
+    assert names[:2] == ["Sami Hyypia", "Samuel Eto'o"]
+    assert "Thierry Henry" not in names
+    # A typo still finds the player, and LIKE wildcards in the query are matched literally
+    assert [row["player_name"] for row in PlayerRepository().search_players("thiery", 10)] == ["Thierry Henry"]
+    assert [row["player_name"] for row in PlayerRepository().search_players("%_", 10)] == ["100%_Player"]
+
+
+def test_search_falls_back_to_prefix_index(database, monkeypatch):
+    add_players(database, "Samuel Eto'o", "Thierry Henry")
+    monkeypatch.setattr(PlayerService, "trigram_search", False)
+
+    assert [row["player_name"] for row in PlayerService().search_players("henry", 10)] == ["Thierry Henry"]
@@ -0,0 +1,133 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from psycopg2.extras import execute_values
+
+from app.cache import result_cache
+from app.main import app
+from app.player_directory import player_directory
+
+# Statement and connection budgets are the exact counts measured against PostgreSQL 16, so any extra query
+# fails. p95 latency budget for a cold GET /matches over 10k matches (about 300 ms measured locally); loose
+# by default so slow CI machines pass, tightened locally through the environment
+MATCHES_P95_BUDGET_MS = float(os.environ.get("MATCHES_P95_BUDGET_MS", "500"))
+
+
+def result(goals):
+    team1_goals, team2_goals = goals
+    if team1_goals is None:
+        return None
+    return "Team1" if team1_goals > team2_goals else "Team2" if team2_goals > team1_goals else "Draw"
+
+
+def seed(database, matches, players=8, status="COMPLETED"):
+    # Alternating 1v1/2v2 matches an hour apart, starting yesterday for completed matches and tomorrow for
+    # scheduled ones
+    with database.cursor() as cur:
+        cur.execute(
+            "INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, %s) n RETURNING player_id",
+            (players,),
+        )
+        ids = [row[0] for row in cur.fetchall()]
+        completed = status == "COMPLETED"
+        start = datetime.now() + (timedelta(days=-1) - timedelta(hours=matches) if completed else timedelta(days=1))
+        rows = []
+        for i in range(matches):
+            date = start + timedelta(hours=i)
+            a, b, c, d = (ids[(i + k) % len(ids)] for k in range(4))
+            goals = (i % 5, i % 3) if completed else (None, None)
+            if i % 2:
+                rows.append(("Round 2", "2v2", a, b, c, d, date, date, *goals, status, result(goals)))
+            else:
+                rows.append(("Round 1", "1v1", a, None, c, None, date, date, *goals, status, result(goals)))
+        execute_values(
+            cur,
+            """
+            INSERT INTO matches (
+                round, match_type, team1_player1_id, team1_player2_id, team2_player1_id, team2_player2_id,
+                match_date, scheduled_date, team1_goals, team2_goals, status, result
+            ) VALUES %s
+            """,
+            rows,
+            page_size=1000,
+        )
+        cur.execute("ANALYZE")
+    # Loaded once per process in production, so it is not part of any request's budget
+    player_directory.names()
+
+
+@pytest.fixture
+def client(query_recorder):
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path, cold, warm",
+    [
+        # Format, matches per round, totals, leaderboard aggregates, latest match, highest scoring, streak
+        ("/overview", 7, 0),
+        # Round 1 and round 2 tables
+        ("/standings", 2, 0),
+        ("/matches", 1, 0),
+        # Batched lookups are not cached: one query each time, whatever the number of ids
+        ("/matches?ids=1,2,3", 1, 1),
+        ("/players", 1, 0),
+    ],
+)
+def test_read_budgets(database, query_recorder, client, path, cold, warm):
+    seed(database, 40)
+
+    # Every query on its own connection, so both budgets are the query count
+    with query_recorder.record() as recording:
+        assert client.get(path).status_code == 200
+    recording.assert_budget(connections=cold, statements=cold)
+
+    # The result cache serves the second request
+    with query_recorder.record() as recording:
+        assert client.get(path).status_code == 200
+    recording.assert_budget(connections=warm, statements=warm)
+
+
+def test_score_update_budget(database, query_recorder, client):
+    seed(database, 4, status="SCHEDULED")
+
+    with query_recorder.record() as recording:
+        response = client.put("/matches/1/score", json={"team1_goals": 2, "team2_goals": 1})
+    assert response.status_code == 200
+
+    # The match write is one conditional statement on its own connection; the rest is the rating replay
+    # (lock, roll back, prune, completed matches, ratings, history insert, ratings upsert)
+    assert len(recording.statements_on(1)) == 1
+    recording.assert_budget(connections=2, statements=8)
+
+
+def test_missing_match_write_budget(database, query_recorder, client):
+    seed(database, 2, status="SCHEDULED")
+
+    # The router lets "Match not found" propagate, and TestClient re-raises it
+    with query_recorder.record() as recording, pytest.raises(ValueError, match="Match not found"):
+        client.put("/matches/999/score", json={"team1_goals": 2, "team2_goals": 1})
+
+    # No separate existence check, and no rating replay for a write that did not happen
+    recording.assert_budget(connections=1, statements=1)
+
+
+def test_matches_latency_budget(database, query_recorder, client):
+    seed(database, 10_000, players=40)
+
+    timings = []
+    for _ in range(20):
+        result_cache.clear()
+        start = time.perf_counter()
+        with query_recorder.record() as recording:
+            response = client.get("/matches")
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+        recording.assert_budget(connections=1, statements=1)
+    assert len(response.json()) == 10_000
+
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    assert p95 <= MATCHES_P95_BUDGET_MS, f"GET /matches p95 {p95:.1f} ms over budget {MATCHES_P95_BUDGET_MS} ms"
@@ -0,0 +1,45 @@
+import asyncio
+
+import app.database as routing
+from app.repositories.match_repository import MatchRepository
+from app.repositories.player_repository import PlayerRepository
+
+
+def add_player(connection, name):
+    with connection.cursor() as cur:
+        cur.execute("INSERT INTO players (player_name) VALUES (%s)", (name,))
+
+
+def player_names():
+    return [player["player_name"] for player in PlayerRepository().get_all_players()]
+
+
+def test_listings_read_from_replica(database, replica_database):
+    add_player(database, "On primary")
+    add_player(replica_database, "On replica")
+
+    assert player_names() == ["On replica"]
+    assert asyncio.run(MatchRepository().get_matches(1)) == []
+    assert routing.metrics.get("db_reads", "replica") >= 2
+
+
+def test_pinned_reads_and_lookups_use_primary(database, replica_database):
+    add_player(database, "On primary")
+    add_player(replica_database, "On replica")
+
+    token = routing.primary_pinned.set(True)
+    try:
+        assert player_names() == ["On primary"]
+    finally:
+        routing.primary_pinned.reset(token)
+    # Single-row lookups used by write flows never leave the primary
+    assert PlayerRepository().get_player_by_id(1)["player_name"] == "On primary"
+
+
+def test_recent_change_reads_from_primary(database, replica_database):
+    add_player(database, "On primary")
+    add_player(replica_database, "On replica")
+
+    routing.replica_router.note_change({"table": "players", "id": 1})
+
+    assert player_names() == ["On primary"]
@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import FixtureRequest, MatchType, TournamentCreate
+from app.repositories.match_repository import MatchRepository
+from app.services.fixture_service import FixtureService
+from app.services.tournament_service import TournamentService
+
+
+def test_new_tournament_gets_its_own_partition(database):
+    tournament = TournamentService().create_tournament(TournamentCreate(name="Spring"))
+    with database.cursor() as cur:
+        cur.execute(
+            "INSERT INTO players (player_name) SELECT 'Player ' || n FROM generate_series(1, 4) n RETURNING player_id"
+        )
+        player_ids = [row[0] for row in cur.fetchall()]
+
+    request = FixtureRequest(
+        round="Round 1",
+        match_type=MatchType.ONE_V_ONE,
+        player_ids=player_ids,
+        start_date=datetime.now() + timedelta(days=1),
+    )
+    created = asyncio.run(FixtureService().create_fixtures(request, tournament.tournament_id))
+
+    with database.cursor() as cur:
+        cur.execute("SELECT tableoid::regclass::text, COUNT(*) FROM matches GROUP BY 1")
+        assert cur.fetchall() == [(f"matches_tournament_{tournament.tournament_id}", len(created))]
+        cur.execute("SELECT COUNT(*) FROM tournament_players WHERE tournament_id = %s", (tournament.tournament_id,))
+        assert cur.fetchone()[0] == 4
+
+    repository = MatchRepository()
+    assert len(asyncio.run(repository.get_matches(tournament.tournament_id))) == len(created)
+    assert asyncio.run(repository.get_matches(1)) == []
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.fixture_router import get_fixture_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_create_fixtures():
+    now = datetime.now()
+    mock_fixture_service = Mock()
+    mock_fixture_service.create_fixtures = AsyncMock(
+        return_value=[
+            {
+                "id": 1,
+                "round": "Round 1",
+                "match_type": "1v1",
+                "team1_player1_id": 1,
+                "team2_player1_id": 2,
+                "match_date": now,
+                "scheduled_date": now,
+                "status": "SCHEDULED",
+                "created_at": now,
+                "updated_at": now,
+            }
+        ]
+    )
+    app.dependency_overrides[get_fixture_service] = lambda: mock_fixture_service
+
+    response = client.post(
+        "/fixtures",
+        json={
+            "round": "Round 1",
+            "match_type": "1v1",
+            "player_ids": [1, 2],
+            "start_date": (now + timedelta(days=1)).isoformat(),
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json()[0]["status"] == "SCHEDULED"
+    mock_fixture_service.create_fixtures.assert_awaited_once()
+
+
+def test_create_fixtures_needs_four_players_for_2v2():
+    app.dependency_overrides[get_fixture_service] = lambda: Mock()
+
+    response = client.post(
+        "/fixtures",
+        json={
+            "round": "Round 2",
+            "match_type": "2v2",
+            "player_ids": [1, 2, 3],
+            "start_date": (datetime.now() + timedelta(days=1)).isoformat(),
+        },
+    )
+
+    assert response.status_code == 422
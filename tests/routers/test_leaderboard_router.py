@@ -0,0 +1,48 @@
+from unittest.mock import Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models import LeaderboardMetric
+from app.routers.leaderboard_router import get_leaderboard_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+mock_entry = {
+    "rank": 1,
+    "player_id": 1,
+    "player_name": "Ann",
+    "value": 6,
+    "matches_played": 4,
+    "wins": 3,
+    "draws": 0,
+    "losses": 1,
+    "goals_scored": 6,
+    "goals_against": 2,
+    "clean_sheets": 2,
+    "matches": [],
+}
+
+
+def test_get_leaderboard_with_filters():
+    mock_leaderboard_service = Mock()
+    mock_leaderboard_service.get_leaderboard.return_value = [mock_entry]
+    app.dependency_overrides[get_leaderboard_service] = lambda: mock_leaderboard_service
+
+    response = client.get("/leaderboards/clean-sheets?limit=5&round=Round 1&match_type=2v2")
+
+    assert response.status_code == 200
+    assert response.json()[0]["player_name"] == "Ann"
+    mock_leaderboard_service.get_leaderboard.assert_called_once_with(
+        LeaderboardMetric.CLEAN_SHEETS, 5, "Round 1", "2v2", 1
+    )
+
+
+def test_get_leaderboard_unknown_metric():
+    app.dependency_overrides[get_leaderboard_service] = lambda: Mock()
+
+    response = client.get("/leaderboards/assists")
+
+    assert response.status_code == 422
@@ -0,0 +1,40 @@
+from unittest.mock import Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.live_router import get_live_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_stream_live_events():
+    async def events():
+        yield b"event: match_created\ndata: {}\n\n"
+
+    mock_live_service = Mock()
+    mock_live_service.subscribe.return_value = events()
+    app.dependency_overrides[get_live_service] = lambda: mock_live_service
+
+    response = client.get("/live")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "event: match_created" in response.text
+    mock_live_service.subscribe.assert_called_once_with(1)
+
+
+def test_stream_live_events_for_tournament():
+    async def events():
+        yield b"retry: 3000\n\n"
+
+    mock_live_service = Mock()
+    mock_live_service.subscribe.return_value = events()
+    app.dependency_overrides[get_live_service] = lambda: mock_live_service
+
+    response = client.get("/live?tournament_id=3")
+
+    assert response.status_code == 200
+    mock_live_service.subscribe.assert_called_once_with(3)
@@ -0,0 +1,63 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.match_event_router import get_match_event_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_get_match_events():
+    mock_match_event_service = Mock()
+    mock_match_event_service.get_events.return_value = [
+        {
+            "event_id": 4,
+            "match_id": 2,
+            "tournament_id": 1,
+            "event_type": "rescored",
+            "payload": {"id": 2, "team1_goals": 1, "team2_goals": 0},
+            "recorded_at": datetime(2024, 1, 1),
+        }
+    ]
+    app.dependency_overrides[get_match_event_service] = lambda: mock_match_event_service
+
+    response = client.get("/match-events?match_id=2&after=3")
+
+    assert response.status_code == 200
+    assert response.json()[0]["event_type"] == "rescored"
+    mock_match_event_service.get_events.assert_called_once_with(2, 3, 100)
+
+
+def test_get_match_events_rejects_large_limit():
+    app.dependency_overrides[get_match_event_service] = lambda: Mock()
+
+    response = client.get("/match-events?limit=5000")
+
+    assert response.status_code == 422
+
+
+def test_replay_defaults_to_head():
+    mock_match_event_service = Mock()
+    mock_match_event_service.replay.return_value = {"last_event_id": 10, "persisted": True}
+    app.dependency_overrides[get_match_event_service] = lambda: mock_match_event_service
+
+    response = client.post("/match-events/replay")
+
+    assert response.status_code == 200
+    assert response.json()["persisted"] is True
+    mock_match_event_service.replay.assert_called_once_with(None)
+
+
+def test_replay_to_checkpoint():
+    mock_match_event_service = Mock()
+    mock_match_event_service.replay.return_value = {"last_event_id": 5, "persisted": False}
+    app.dependency_overrides[get_match_event_service] = lambda: mock_match_event_service
+
+    response = client.post("/match-events/replay?until_event_id=5")
+
+    assert response.status_code == 200
+    mock_match_event_service.replay.assert_called_once_with(5)
@@ -4,9 +4,11 @@ from unittest.mock import AsyncMock
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from models import MatchType, ScoreUpdate
+from models import Match, MatchType, ScoreUpdate
 from routers.match_router import get_match_service, router
 
+from app.serialization import RowEncoder
+
 app = FastAPI()
 app.include_router(router)
 
@@ -44,13 +46,14 @@ def sample_match():
 class TestMatchRouter:
     async def test_get_matches(self, client, mock_match_service, sample_match):
         app.dependency_overrides[get_match_service] = lambda: mock_match_service
-        mock_match_service.get_matches.return_value = [sample_match]
+        mock_match_service.get_matches_json.return_value = RowEncoder(Match).encode([sample_match])
 
         response = client.get("/matches")
 
         assert response.status_code == 200
         assert len(response.json()) == 1
-        mock_match_service.get_matches.assert_called_once()
+        assert response.json()[0] == Match(**sample_match).model_dump(mode="json")
+        mock_match_service.get_matches_json.assert_called_once()
 
     async def test_create_match(self, client, mock_match_service, sample_match):
         app.dependency_overrides[get_match_service] = lambda: mock_match_service
@@ -78,7 +81,7 @@ class TestMatchRouter:
 
         assert response.status_code == 200
         assert response.json()["id"] == 1
-        mock_match_service.get_match_by_id.assert_called_once_with(1)
+        mock_match_service.get_match_by_id.assert_called_once_with(1, 1)
 
     async def test_update_match(self, client, mock_match_service, sample_match):
         app.dependency_overrides[get_match_service] = lambda: mock_match_service
@@ -117,4 +120,56 @@ class TestMatchRouter:
 
         assert response.status_code == 200
         assert response.json()["id"] == 1
-        mock_match_service.delete_match.assert_called_once_with(1)
+        mock_match_service.delete_match.assert_called_once_with(1, 1)
+
+    async def test_get_matches_sparse_fields(self, client, mock_match_service):
+        app.dependency_overrides[get_match_service] = lambda: mock_match_service
+        mock_match_service.get_matches_json.return_value = b'[{"id":1,"team1_goals":2}]'
+
+        response = client.get("/matches", params={"fields": "team1_goals, id"})
+
+        assert response.status_code == 200
+        mock_match_service.get_matches_json.assert_called_once_with(("id", "team1_goals"), 1)
+
+    async def test_get_matches_for_tournament(self, client, mock_match_service):
+        app.dependency_overrides[get_match_service] = lambda: mock_match_service
+        mock_match_service.get_matches_json.return_value = b"[]"
+
+        response = client.get("/matches", params={"tournament_id": 3})
+
+        assert response.status_code == 200
+        mock_match_service.get_matches_json.assert_called_once_with(None, 3)
+
+    async def test_get_matches_rejects_invalid_tournament(self, client, mock_match_service):
+        app.dependency_overrides[get_match_service] = lambda: mock_match_service
+
+        response = client.get("/matches", params={"tournament_id": 0})
+
+        assert response.status_code == 422
+
+    async def test_get_matches_by_ids(self, client, mock_match_service):
+        app.dependency_overrides[get_match_service] = lambda: mock_match_service
+        mock_match_service.get_matches_by_ids_json.return_value = b'{"matches":[],"missing_ids":[4]}'
+
+        response = client.get("/matches?ids=4,2,4&fields=id")
+
+        assert response.status_code == 200
+        assert response.json() == {"matches": [], "missing_ids": [4]}
+        mock_match_service.get_matches_by_ids_json.assert_called_once_with([4, 2], ("id",), 1)
+        mock_match_service.get_matches_json.assert_not_called()
+
+    async def test_get_matches_by_ids_rejects_non_integer_ids(self, client, mock_match_service):
+        app.dependency_overrides[get_match_service] = lambda: mock_match_service
+
+        response = client.get("/matches?ids=1,x")
+
+        assert response.status_code == 400
+
+    async def test_get_matches_unknown_field(self, client, mock_match_service):
+        app.dependency_overrides[get_match_service] = lambda: mock_match_service
+
+        response = client.get("/matches", params={"fields": "id,password"})
+
+        assert response.status_code == 400
+        assert "password" in response.json()["detail"]
+        mock_match_service.get_matches_json.assert_not_called()
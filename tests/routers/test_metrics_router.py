@@ -0,0 +1,29 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.metrics import metrics
+from app.routers.metrics_router import router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_get_metrics():
+    metrics.reset()
+    metrics.increment("singleflight_executed", "standings")
+    metrics.increment("singleflight_coalesced", "standings", 4)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.json()["counters"] == {
+        "singleflight_executed": {"standings": 1},
+        "singleflight_coalesced": {"standings": 4},
+    }
+
+
+def test_get_profiles_unknown_route():
+    response = client.get("/metrics/profiles/speedscope", params={"route": "GET /nowhere"})
+
+    assert response.status_code == 404
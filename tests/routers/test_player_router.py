@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 
 from app.models import Player, PlayerCreate
 from app.routers.player_router import router
+from app.serialization import RowEncoder
 
 # Setup test app
 app = FastAPI()
@@ -36,7 +37,7 @@ def mock_player_service():
 # Test GET /players
 def test_get_players_success(mock_player_service):
     # Arrange
-    mock_player_service.get_all_players.return_value = [mock_player]
+    mock_player_service.get_all_players_json.return_value = RowEncoder(Player).encode([mock_player_data])
 
     # Act
     response = client.get("/players")
@@ -45,12 +46,12 @@ def test_get_players_success(mock_player_service):
     assert response.status_code == 200
     assert len(response.json()) == 1
     assert response.json()[0]["player_name"] == mock_player_data["player_name"]
-    mock_player_service.get_all_players.assert_called_once()
+    mock_player_service.get_all_players_json.assert_called_once()
 
 
 def test_get_players_empty(mock_player_service):
     # Arrange
-    mock_player_service.get_all_players.return_value = []
+    mock_player_service.get_all_players_json.return_value = b"[]"
 
     # Act
     response = client.get("/players")
@@ -58,7 +59,7 @@ def test_get_players_empty(mock_player_service):
     # Assert
     assert response.status_code == 200
     assert response.json() == []
-    mock_player_service.get_all_players.assert_called_once()
+    mock_player_service.get_all_players_json.assert_called_once()
 
 
 # Test POST /players
@@ -162,7 +163,7 @@ def test_delete_player_with_matches(mock_player_service):
 # Test error handling
 def test_internal_server_error(mock_player_service):
     # Arrange
-    mock_player_service.get_all_players.side_effect = HTTPException(status_code=500, detail="Database error")
+    mock_player_service.get_all_players_json.side_effect = HTTPException(status_code=500, detail="Database error")
 
     # Act
     response = client.get("/players")
@@ -170,4 +171,48 @@ def test_internal_server_error(mock_player_service):
     # Assert
     assert response.status_code == 500
     assert response.json()["detail"] == "Database error"
-    mock_player_service.get_all_players.assert_called_once()
+    mock_player_service.get_all_players_json.assert_called_once()
+
+
+def test_get_players_by_ids():
+    from app.routers.player_router import get_player_service
+
+    service = Mock()
+    service.get_players_by_ids_json.return_value = b'{"players":[],"missing_ids":[3]}'
+    app.dependency_overrides[get_player_service] = lambda: service
+    try:
+        response = client.get("/players?ids=3")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == {"players": [], "missing_ids": [3]}
+    service.get_players_by_ids_json.assert_called_once_with([3], None)
+    service.get_all_players_json.assert_not_called()
+
+
+def test_get_players_by_ids_rejects_too_many_ids():
+    response = client.get("/players?ids=" + ",".join(str(i) for i in range(1, 102)))
+
+    assert response.status_code == 400
+
+
+def test_search_players():
+    from app.routers.player_router import get_player_service
+
+    service = Mock()
+    service.search_players_json.return_value = b'[{"player_id":3,"player_name":"Sam"}]'
+    app.dependency_overrides[get_player_service] = lambda: service
+    try:
+        response = client.get("/players/search?q=sa&limit=5")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == [{"player_id": 3, "player_name": "Sam"}]
+    service.search_players_json.assert_called_once_with("sa", 5)
+
+
+def test_search_players_requires_query():
+    assert client.get("/players/search").status_code == 422
+    assert client.get("/players/search?q=a&limit=0").status_code == 422
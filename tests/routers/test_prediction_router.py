@@ -0,0 +1,34 @@
+from unittest.mock import Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers.prediction_router import get_prediction_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_get_predictions():
+    mock_prediction_service = Mock()
+    mock_prediction_service.get_predictions.return_value = {"iterations": 20000, "remaining_matches": 0, "players": []}
+    app.dependency_overrides[get_prediction_service] = lambda: mock_prediction_service
+
+    response = client.get("/predictions")
+
+    assert response.status_code == 200
+    assert response.json()["iterations"] == 20000
+    mock_prediction_service.get_predictions.assert_called_once_with(settings.PREDICTION_ITERATIONS, 1)
+
+
+def test_get_predictions_ignores_client_iterations():
+    mock_prediction_service = Mock()
+    mock_prediction_service.get_predictions.return_value = {"iterations": 20000, "remaining_matches": 0, "players": []}
+    app.dependency_overrides[get_prediction_service] = lambda: mock_prediction_service
+
+    response = client.get("/predictions?iterations=1000000")
+
+    assert response.status_code == 200
+    mock_prediction_service.get_predictions.assert_called_once_with(settings.PREDICTION_ITERATIONS, 1)
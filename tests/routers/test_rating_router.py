@@ -0,0 +1,59 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models import Rating, RatingHistoryEntry, RatingType
+from app.routers.rating_router import get_rating_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_get_ratings_defaults_to_players():
+    mock_rating_service = Mock()
+    mock_rating_service.get_leaderboard.return_value = [
+        Rating(entity_type="player", entity_key="1", player_ids=[1], name="Ann", rating=1516.0, matches_played=1)
+    ]
+    app.dependency_overrides[get_rating_service] = lambda: mock_rating_service
+
+    response = client.get("/ratings")
+
+    assert response.status_code == 200
+    assert response.json()[0]["rating"] == 1516.0
+    mock_rating_service.get_leaderboard.assert_called_once_with(RatingType.PLAYER, 50)
+
+
+def test_get_ratings_rejects_unknown_type():
+    app.dependency_overrides[get_rating_service] = lambda: Mock()
+
+    response = client.get("/ratings?type=club")
+
+    assert response.status_code == 422
+
+
+def test_get_rating_history():
+    mock_rating_service = Mock()
+    mock_rating_service.get_history.return_value = [
+        RatingHistoryEntry(match_id=1, match_date=datetime(2024, 1, 1), rating_before=1500.0, rating_after=1516.0)
+    ]
+    app.dependency_overrides[get_rating_service] = lambda: mock_rating_service
+
+    response = client.get("/ratings/team/1-2/history")
+
+    assert response.status_code == 200
+    assert response.json()[0]["rating_after"] == 1516.0
+    mock_rating_service.get_history.assert_called_once_with(RatingType.TEAM, "1-2")
+
+
+def test_rebuild_ratings():
+    mock_rating_service = Mock()
+    mock_rating_service.rebuild.return_value = {"replayed": 12}
+    app.dependency_overrides[get_rating_service] = lambda: mock_rating_service
+
+    response = client.post("/ratings/rebuild")
+
+    assert response.status_code == 200
+    assert response.json() == {"replayed": 12}
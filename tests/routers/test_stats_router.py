@@ -0,0 +1,22 @@
+from unittest.mock import Mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers.stats_router import get_stats_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_get_head_to_head():
+    mock_stats_service = Mock()
+    mock_stats_service.get_head_to_head_json.return_value = b'{"1v1":{"size":0},"2v2":{"size":0}}'
+    app.dependency_overrides[get_stats_service] = lambda: mock_stats_service
+
+    response = client.get("/stats/head-to-head")
+
+    assert response.status_code == 200
+    assert response.json()["1v1"]["size"] == 0
+    mock_stats_service.get_head_to_head_json.assert_called_once()
@@ -0,0 +1,67 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.routers.tournament_router import get_tournament_service, router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def sample_tournament(**overrides):
+    return {
+        "tournament_id": 2,
+        "name": "Spring 2026",
+        "format_id": 1,
+        "starts_on": "2026-03-01",
+        "created_at": datetime.now(),
+        **overrides,
+    }
+
+
+def test_get_tournaments():
+    mock_tournament_service = Mock()
+    mock_tournament_service.get_tournaments.return_value = [sample_tournament(tournament_id=1, name="Default")]
+    app.dependency_overrides[get_tournament_service] = lambda: mock_tournament_service
+
+    response = client.get("/tournaments")
+
+    assert response.status_code == 200
+    assert response.json()[0]["name"] == "Default"
+
+
+def test_create_tournament():
+    mock_tournament_service = Mock()
+    mock_tournament_service.create_tournament.return_value = sample_tournament()
+    app.dependency_overrides[get_tournament_service] = lambda: mock_tournament_service
+
+    response = client.post("/tournaments", json={"name": " Spring 2026 ", "starts_on": "2026-03-01"})
+
+    assert response.status_code == 201
+    assert response.json()["tournament_id"] == 2
+    created = mock_tournament_service.create_tournament.call_args.args[0]
+    assert created.name == "Spring 2026"
+    assert created.format_id == 1
+
+
+def test_create_tournament_requires_name():
+    app.dependency_overrides[get_tournament_service] = lambda: Mock()
+
+    response = client.post("/tournaments", json={"name": "  "})
+
+    assert response.status_code == 422
+
+
+def test_get_tournament_not_found():
+    mock_tournament_service = Mock()
+    mock_tournament_service.get_tournament_by_id.side_effect = HTTPException(
+        status_code=404, detail="Tournament with ID 9 not found"
+    )
+    app.dependency_overrides[get_tournament_service] = lambda: mock_tournament_service
+
+    response = client.get("/tournaments/9")
+
+    assert response.status_code == 404
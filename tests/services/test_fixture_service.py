@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from itertools import chain
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import FixtureRequest, MatchType
+from app.services.fixture_service import FixtureService, generate_fixtures, round_robin
+
+
+@pytest.fixture
+def fixture_service():
+    service = FixtureService()
+    service.repository = Mock()
+    service.repository.create_matches = AsyncMock(
+        side_effect=lambda tournament_id, rows: [{"id": i} for i, _ in enumerate(rows)]
+    )
+    return service
+
+
+def players_in(matches):
+    return [player_id for team1, team2 in matches for player_id in team1 + team2]
+
+
+class TestFixtureGeneration:
+    @pytest.mark.parametrize("count", [2, 5, 6, 11])
+    def test_round_robin_meets_every_pair_once(self, count):
+        rounds = round_robin(range(count))
+
+        pairs = [frozenset(pair) for pair in chain.from_iterable(rounds)]
+        assert len(pairs) == len(set(pairs)) == count * (count - 1) // 2
+        for pairs_in_round in rounds:
+            players = [p for pair in pairs_in_round for p in pair]
+            assert len(players) == len(set(players))
+
+    @pytest.mark.parametrize("count", [4, 5, 6, 7, 8, 9, 10])
+    def test_2v2_rotates_partners(self, count):
+        rounds = generate_fixtures(list(range(1, count + 1)), MatchType.TWO_V_TWO)
+
+        teams = [team for team1, team2 in chain.from_iterable(rounds) for team in (team1, team2)]
+        partnerships = count * (count - 1) // 2
+        # Every player partners every other player; with an odd number of partnerships one of them has to
+        # play a second match, as the opponent of the last one
+        assert len(set(teams)) == partnerships
+        assert len(teams) == partnerships + partnerships % 2
+        for matches in rounds:
+            assert len(players_in(matches)) == len(set(players_in(matches)))
+
+    def test_2v2_needs_four_players(self):
+        with pytest.raises(ValueError):
+            generate_fixtures([1, 2, 3], MatchType.TWO_V_TWO)
+
+
+class TestFixtureService:
+    @pytest.mark.asyncio
+    async def test_create_fixtures_assigns_slots(self, fixture_service):
+        start = datetime.now() + timedelta(days=1)
+        request = FixtureRequest(
+            round="Round 1",
+            match_type=MatchType.ONE_V_ONE,
+            player_ids=[1, 2, 3, 4],
+            start_date=start,
+            slot_minutes=20,
+            matches_per_slot=2,
+        )
+
+        created = await fixture_service.create_fixtures(request)
+
+        rows = fixture_service.repository.create_matches.call_args.args[1]
+        assert len(created) == len(rows) == 6
+        # Three rounds of two simultaneous matches
+        assert sorted({row[6] for row in rows}) == [start + timedelta(minutes=20 * i) for i in range(3)]
+        assert all(row[3] is None and row[5] is None for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_create_fixtures_unknown_player(self, fixture_service):
+        fixture_service.repository.create_matches = AsyncMock(
+            side_effect=ValueError("One or more players not found in database")
+        )
+        request = FixtureRequest(
+            round="Round 2",
+            match_type=MatchType.TWO_V_TWO,
+            player_ids=[1, 2, 3, 99],
+            start_date=datetime.now() + timedelta(days=1),
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await fixture_service.create_fixtures(request)
+
+        assert exc_info.value.status_code == 400
+
+    def test_request_rejects_duplicate_players(self):
+        with pytest.raises(ValueError):
+            FixtureRequest(
+                round="Round 1",
+                match_type=MatchType.ONE_V_ONE,
+                player_ids=[1, 1, 2],
+                start_date=datetime.now() + timedelta(days=1),
+            )
@@ -0,0 +1,104 @@
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+
+from app.models import LeaderboardMetric
+from app.player_directory import PlayerDirectory
+from app.services.leaderboard_service import LeaderboardService
+
+
+def log_entry(match_id, goals_for, goals_against):
+    return {
+        "match_id": match_id,
+        "match_date": f"2024-01-{match_id:02d}",
+        "match_type": "1v1",
+        "goals_for": goals_for,
+        "goals_against": goals_against,
+        "opponent1_id": 9,
+        "opponent2_id": None,
+    }
+
+
+def aggregate(player_id, log):
+    return {
+        "player_id": player_id,
+        "matches_played": len(log),
+        "wins": sum(1 for m in log if m["goals_for"] > m["goals_against"]),
+        "draws": sum(1 for m in log if m["goals_for"] == m["goals_against"]),
+        "losses": sum(1 for m in log if m["goals_for"] < m["goals_against"]),
+        "goals_scored": sum(m["goals_for"] for m in log),
+        "goals_against": sum(m["goals_against"] for m in log),
+        "clean_sheets": sum(1 for m in log if m["goals_against"] == 0),
+        "match_log": log,
+    }
+
+
+@pytest.fixture
+def leaderboard_service():
+    service = LeaderboardService()
+    service.repository = Mock()
+    service.directory = PlayerDirectory(lambda: {1: "Ann", 2: "Bob", 3: "Cat", 9: "Someone"})
+    # Logs are newest first, as the repository returns them
+    service.repository.get_player_aggregates.return_value = [
+        aggregate(1, [log_entry(4, 3, 0), log_entry(3, 2, 1), log_entry(2, 0, 1), log_entry(1, 1, 0)]),
+        aggregate(2, [log_entry(4, 0, 3), log_entry(3, 1, 2), log_entry(2, 1, 0)]),
+        aggregate(3, [log_entry(5, 1, 1), log_entry(2, 0, 0), log_entry(1, 0, 1)]),
+    ]
+    return service
+
+
+class TestLeaderboardService:
+    def test_goals(self, leaderboard_service):
+        board = leaderboard_service.get_leaderboard(LeaderboardMetric.GOALS)
+
+        assert [(e["player_name"], e["value"]) for e in board] == [("Ann", 6), ("Bob", 2), ("Cat", 1)]
+        assert board[0]["rank"] == 1
+
+    def test_goals_against_requires_minimum_matches(self, leaderboard_service):
+        board = leaderboard_service.get_leaderboard(LeaderboardMetric.GOALS_AGAINST)
+
+        assert [(e["player_name"], e["value"]) for e in board] == [("Ann", 2), ("Cat", 2), ("Bob", 5)]
+        # Ann has played more matches for the same record, so ranks ahead; ties only share a rank
+        # when every ranking field is equal
+        assert [e["rank"] for e in board] == [1, 2, 3]
+
+    def test_clean_sheets_lists_only_clean_sheet_matches(self, leaderboard_service):
+        board = leaderboard_service.get_leaderboard(LeaderboardMetric.CLEAN_SHEETS)
+
+        assert board[0]["player_name"] == "Ann"
+        assert [m["match_id"] for m in board[0]["matches"]] == [4, 1]
+
+    def test_win_percentage(self, leaderboard_service):
+        board = leaderboard_service.get_leaderboard(LeaderboardMetric.WIN_PERCENTAGE)
+
+        assert [(e["player_name"], e["value"]) for e in board] == [("Ann", 75.0), ("Bob", 33.3), ("Cat", 0.0)]
+
+    def test_streak_counts_current_run_of_wins(self, leaderboard_service):
+        board = leaderboard_service.get_leaderboard(LeaderboardMetric.STREAK)
+
+        assert [(e["player_name"], e["value"]) for e in board] == [("Ann", 2)]
+        assert [m["match_id"] for m in board[0]["matches"]] == [4, 3]
+
+    def test_names_come_from_the_player_directory(self, leaderboard_service):
+        board = leaderboard_service.get_leaderboard(LeaderboardMetric.GOALS)
+
+        assert board[0]["matches"][0]["opponent"] == "Someone"
+        assert "opponent1_id" not in board[0]["matches"][0]
+
+    def test_all_metrics_share_one_query_per_filter(self, leaderboard_service):
+        for metric in LeaderboardMetric:
+            leaderboard_service.get_leaderboard(metric, limit=1, match_type="1v1")
+
+        leaderboard_service.repository.get_player_aggregates.assert_called_once_with(1, None, "1v1")
+
+    def test_limit(self, leaderboard_service):
+        assert len(leaderboard_service.get_leaderboard(LeaderboardMetric.GOALS, limit=2)) == 2
+
+    def test_repository_error(self, leaderboard_service):
+        leaderboard_service.repository.get_player_aggregates.side_effect = Exception("Database error")
+
+        with pytest.raises(HTTPException) as exc_info:
+            leaderboard_service.get_leaderboard(LeaderboardMetric.GOALS)
+
+        assert exc_info.value.status_code == 500
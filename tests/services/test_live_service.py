@@ -0,0 +1,204 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.services.live_service import LiveService
+
+
+@pytest.fixture
+def live_service():
+    service = LiveService(queue_size=10, heartbeat=0.05, batch_window=0.01, max_match_events=3)
+    service.match_repository = Mock()
+    service.standing_service = AsyncMock()
+    return service
+
+
+def standings(points):
+    return {
+        "tournament": [{"player_id": 1, "player_name": "John Doe", "points": points}],
+        "round1": [{"player_id": 1, "player_name": "John Doe", "points": points}],
+        "round2": [],
+    }
+
+
+async def next_frame(stream):
+    frame = await stream.__anext__()
+    while frame.startswith(b":"):
+        frame = await stream.__anext__()
+    return frame
+
+
+@pytest.mark.asyncio
+class TestLiveService:
+    async def test_publish_fans_out_same_frame(self, live_service):
+        first, second = live_service.subscribe(1), live_service.subscribe(1)
+        await next_frame(first)
+        await next_frame(second)
+
+        live_service.publish(1, "match_created", {"id": 1})
+
+        frame1, frame2 = await next_frame(first), await next_frame(second)
+        assert frame1 is frame2
+        assert b"event: match_created" in frame1
+        await first.aclose()
+        await second.aclose()
+        assert not live_service.subscribers
+
+    async def test_handle_change_computes_once_for_all_subscribers(self, live_service):
+        live_service.match_repository.get_matches_by_ids.return_value = [{"id": 7, "team1_goals": 2}]
+        live_service.standing_service.get_standings.return_value = standings(6)
+        streams = [live_service.subscribe(1) for _ in range(3)]
+        for stream in streams:
+            await next_frame(stream)
+
+        await live_service.handle_changes([{"table": "matches", "id": 7, "operation": "UPDATE", "score_changed": True}])
+
+        for stream in streams:
+            assert b"event: score_updated" in await next_frame(stream)
+            assert b"event: standings_delta" in await next_frame(stream)
+            await stream.aclose()
+        live_service.match_repository.get_matches_by_ids.assert_called_once_with([7], 1)
+        live_service.standing_service.get_standings.assert_called_once()
+
+    async def test_changes_within_a_window_are_published_together(self, live_service):
+        live_service._loop = asyncio.get_running_loop()
+        live_service.match_repository.get_matches_by_ids.return_value = [{"id": 7}, {"id": 8}]
+        live_service.standing_service.get_standings.return_value = standings(6)
+        stream = live_service.subscribe(1)
+        await next_frame(stream)
+
+        for match_id in (7, 8, 7):
+            live_service._on_change({"table": "matches", "id": match_id, "tournament_id": 1, "operation": "INSERT"})
+        frames = [await next_frame(stream) for _ in range(3)]
+
+        assert [frame.split(b"\n")[1] for frame in frames] == [
+            b"event: match_created",
+            b"event: match_created",
+            b"event: standings_delta",
+        ]
+        live_service.match_repository.get_matches_by_ids.assert_called_once_with([8, 7], 1)
+        live_service.standing_service.get_standings.assert_called_once()
+        await stream.aclose()
+
+    async def test_burst_is_published_as_one_event(self, live_service):
+        live_service.standing_service.get_standings.return_value = standings(6)
+        stream = live_service.subscribe(1)
+        await next_frame(stream)
+
+        await live_service.handle_changes(
+            [{"table": "matches", "id": match_id, "operation": "INSERT"} for match_id in range(50)]
+        )
+
+        frame = await next_frame(stream)
+        assert b"event: matches_changed" in frame
+        assert b'"count": 50' in frame
+        assert b"event: standings_delta" in await next_frame(stream)
+        assert live_service.subscribers
+        live_service.match_repository.get_matches_by_ids.assert_not_called()
+        await stream.aclose()
+
+    async def test_bulk_insert_is_published_as_one_event(self, live_service):
+        live_service.standing_service.get_standings.return_value = standings(6)
+        stream = live_service.subscribe(1)
+        await next_frame(stream)
+
+        await live_service.handle_changes([{"table": "matches", "id": None, "operation": "INSERT", "count": 45}])
+
+        assert b'"count": 45' in await next_frame(stream)
+        assert b"event: standings_delta" in await next_frame(stream)
+        live_service.match_repository.get_matches_by_ids.assert_not_called()
+        await stream.aclose()
+
+    async def test_changes_reach_only_their_tournament(self, live_service):
+        live_service.match_repository.get_matches_by_ids.side_effect = lambda ids, tournament_id: [{"id": ids[0]}]
+        live_service.standing_service.get_standings.return_value = standings(6)
+        first, second = live_service.subscribe(1), live_service.subscribe(2)
+        await next_frame(first)
+        await next_frame(second)
+
+        await live_service.handle_changes(
+            [
+                {"table": "matches", "id": 7, "tournament_id": 2, "operation": "UPDATE"},
+                {"table": "matches", "id": 8, "tournament_id": 3, "operation": "UPDATE"},
+            ]
+        )
+
+        assert b'"id": 7' in await next_frame(second)
+        assert b"event: standings_delta" in await next_frame(second)
+        live_service.match_repository.get_matches_by_ids.assert_called_once_with([7], 2)
+        live_service.standing_service.get_standings.assert_called_once_with(2)
+        assert await first.__anext__() == b": keep-alive\n\n"
+        await first.aclose()
+        await second.aclose()
+        assert not live_service.subscribers
+
+    async def test_resync_refreshes_every_followed_tournament(self, live_service):
+        live_service.standing_service.get_standings.return_value = standings(6)
+        streams = [live_service.subscribe(1), live_service.subscribe(2)]
+        for stream in streams:
+            await next_frame(stream)
+
+        await live_service.handle_changes([{"table": "*", "id": None, "operation": "RESYNC"}])
+
+        for stream in streams:
+            assert b"event: standings_delta" in await next_frame(stream)
+            await stream.aclose()
+        assert sorted(call.args[0] for call in live_service.standing_service.get_standings.call_args_list) == [1, 2]
+
+    async def test_handle_change_without_subscribers_does_no_work(self, live_service):
+        await live_service.handle_changes([{"table": "matches", "id": 7, "operation": "INSERT"}])
+
+        live_service.match_repository.get_matches_by_ids.assert_not_called()
+        live_service.standing_service.get_standings.assert_not_called()
+
+    async def test_delete_skips_match_lookup(self, live_service):
+        live_service.standing_service.get_standings.return_value = standings(0)
+        stream = live_service.subscribe(1)
+        await next_frame(stream)
+
+        await live_service.handle_changes([{"table": "matches", "id": 7, "operation": "DELETE"}])
+
+        assert b"event: match_deleted" in await next_frame(stream)
+        live_service.match_repository.get_matches_by_ids.assert_not_called()
+        await stream.aclose()
+
+    async def test_slow_subscriber_is_dropped(self, live_service):
+        stream = live_service.subscribe(1)
+        await next_frame(stream)
+
+        for i in range(live_service.queue_size + 1):
+            live_service.publish(1, "match_updated", {"id": i})
+
+        assert not live_service.subscribers
+        await stream.aclose()
+
+    async def test_heartbeat_when_idle(self, live_service):
+        stream = live_service.subscribe(1)
+        await stream.__anext__()
+
+        assert await asyncio.wait_for(stream.__anext__(), timeout=1) == b": keep-alive\n\n"
+        await stream.aclose()
+
+
+class TestStandingsDelta:
+    def test_only_changed_rows_are_sent(self):
+        previous = standings(6)
+        current = standings(6)
+        current["round2"] = [{"player_id": 2, "player_name": "Jane", "points": 3}]
+
+        delta = LiveService._standings_delta(previous, current)
+
+        assert list(delta) == ["round2"]
+        assert delta["round2"]["updated"][0]["position"] == 1
+
+    def test_removed_players_are_reported(self):
+        delta = LiveService._standings_delta(standings(6), {"tournament": [], "round1": [], "round2": []})
+
+        assert delta["tournament"]["removed"] == [1]
+        assert delta["round1"]["removed"] == [1]
+
+    def test_first_delta_is_full_table(self):
+        delta = LiveService._standings_delta(None, standings(6))
+
+        assert len(delta["tournament"]["updated"]) == 1
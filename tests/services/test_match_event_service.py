@@ -0,0 +1,188 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from app.services.match_event_service import MatchEventService, ReplayState
+
+
+def make_payload(match_id, goals=(None, None), status="SCHEDULED", players=(1, None, 2, None), **overrides):
+    payload = {
+        "id": match_id,
+        "tournament_id": 1,
+        "round": "Round 1",
+        "match_type": "1v1",
+        "match_date": f"2024-01-{match_id:02d}T10:00:00",
+        "team1_player1_id": players[0],
+        "team1_player2_id": players[1],
+        "team2_player1_id": players[2],
+        "team2_player2_id": players[3],
+        "team1_goals": goals[0],
+        "team2_goals": goals[1],
+        "status": status,
+        "result": None,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def make_event(event_id, event_type, payload):
+    return {"event_id": event_id, "match_id": payload["id"], "event_type": event_type, "payload": payload}
+
+
+def completed(match_id, goals, **overrides):
+    return make_payload(match_id, goals=goals, status="COMPLETED", **overrides)
+
+
+@pytest.fixture
+def match_event_service():
+    service = MatchEventService()
+    service.repository = MagicMock()
+    service.repository.get_latest_snapshot.return_value = None
+    service.cache = Mock()
+    return service
+
+
+class TestReplayState:
+    def test_scheduled_match_has_no_totals(self):
+        state = ReplayState()
+
+        state.apply(make_event(1, "created", make_payload(1)))
+
+        assert state.totals == {}
+        assert state.last_event_id == 1
+
+    def test_rescore_replaces_the_previous_result(self):
+        state = ReplayState()
+
+        state.apply(make_event(1, "created", make_payload(1)))
+        state.apply(make_event(2, "rescored", completed(1, (3, 1))))
+        state.apply(make_event(3, "rescored", completed(1, (0, 2))))
+
+        assert state.totals[(1, 1)] == [1, 0, 0, 1, 0, 2, 0]
+        assert state.totals[(1, 2)] == [1, 1, 0, 0, 2, 0, 1]
+
+    def test_edit_moving_a_match_to_another_player_retracts_the_old_one(self):
+        state = ReplayState()
+
+        state.apply(make_event(1, "created", completed(1, (1, 1))))
+        state.apply(make_event(2, "edited", completed(1, (1, 1), players=(1, None, 3, None))))
+
+        assert (1, 2) not in state.totals
+        assert state.totals[(1, 3)][2] == 1
+
+    def test_delete_removes_the_match(self):
+        state = ReplayState()
+
+        state.apply(make_event(1, "created", completed(1, (2, 0))))
+        state.apply(make_event(2, "deleted", completed(1, (2, 0))))
+
+        assert state.totals == {}
+        assert state.matches == {}
+
+    def test_snapshot_round_trip(self):
+        state = ReplayState()
+        state.apply(make_event(1, "created", completed(1, (2, 0))))
+
+        restored = ReplayState.from_snapshot(1, state.to_snapshot())
+
+        assert restored.matches == state.matches
+        assert restored.totals == state.totals
+        assert restored.last_event_id == 1
+
+    def test_snapshot_from_other_version_is_ignored(self):
+        assert ReplayState.from_snapshot(1, {"version": 0, "matches": [], "totals": []}) is None
+
+
+class TestReplay:
+    def test_replay_to_head_persists_derived_tables(self, match_event_service):
+        match_event_service.repository.stream_events.return_value = iter(
+            [
+                make_event(1, "created", completed(1, (2, 0))),
+                make_event(2, "created", completed(2, (1, 0))),
+                make_event(3, "created", completed(3, (0, 1))),
+            ]
+        )
+
+        result = match_event_service.replay()
+
+        assert result["persisted"] is True
+        assert result["events_replayed"] == 3
+        players = {row["player_id"]: row for row in result["players"]}
+        assert players[1]["wins"] == 2 and players[1]["losses"] == 1
+        assert players[1]["current_streak"] == 0 and players[1]["best_streak"] == 2
+        assert players[2]["current_streak"] == 1
+
+        match_stats, history, ratings = match_event_service.repository.replace_derived.call_args[0]
+        assert (1, 1, 1, 2, True, 6) in match_stats
+        assert (1, 1, 2, 0, False, 0) in match_stats
+        assert len(history) == 6
+        assert {row[:2] + row[3:] for row in ratings} == {("player", "1", 3), ("player", "2", 3)}
+        match_event_service.cache.invalidate.assert_called_once_with("ratings")
+        # The log is read and the derived tables replaced inside the same locked transaction
+        conn = match_event_service.repository.head_replay.return_value.__enter__.return_value
+        assert match_event_service.repository.stream_events.call_args.kwargs["conn"] is conn
+        assert match_event_service.repository.replace_derived.call_args.kwargs["conn"] is conn
+
+    def test_ratings_follow_match_date_not_log_order(self, match_event_service):
+        # Match 2 was logged first but played second
+        match_event_service.repository.stream_events.return_value = iter(
+            [
+                make_event(1, "created", completed(2, (0, 1))),
+                make_event(2, "created", completed(1, (1, 0))),
+            ]
+        )
+
+        match_event_service.replay()
+
+        history = match_event_service.repository.replace_derived.call_args[0][1]
+        assert [row[0] for row in history] == [1, 1, 2, 2]
+
+    def test_replay_from_snapshot_streams_only_later_events(self, match_event_service):
+        earlier = ReplayState()
+        earlier.apply(make_event(1, "created", completed(1, (2, 0))))
+        match_event_service.repository.get_latest_snapshot.return_value = {
+            "last_event_id": 1,
+            "state": earlier.to_snapshot(),
+        }
+        match_event_service.repository.stream_events.return_value = iter(
+            [make_event(2, "rescored", completed(1, (0, 2)))]
+        )
+
+        result = match_event_service.replay()
+
+        match_event_service.repository.stream_events.assert_called_once()
+        assert match_event_service.repository.stream_events.call_args[0][:2] == (1, None)
+        assert result["started_from_event_id"] == 1
+        assert result["events_replayed"] == 1
+        assert {row["player_id"]: row["wins"] for row in result["players"]} == {1: 0, 2: 1}
+
+    def test_replay_to_checkpoint_does_not_persist(self, match_event_service):
+        match_event_service.repository.stream_events.return_value = iter(
+            [make_event(1, "created", completed(1, (2, 0)))]
+        )
+
+        result = match_event_service.replay(until_event_id=1)
+
+        assert result["persisted"] is False
+        match_event_service.repository.get_latest_snapshot.assert_called_once_with(1)
+        match_event_service.repository.replace_derived.assert_not_called()
+        match_event_service.repository.head_replay.assert_not_called()
+        match_event_service.cache.invalidate.assert_not_called()
+
+    def test_snapshots_every_interval_and_at_the_end(self, match_event_service):
+        match_event_service.repository.stream_events.return_value = iter(
+            [make_event(event_id, "created", make_payload(event_id)) for event_id in range(1, 6)]
+        )
+
+        match_event_service.replay(snapshot_interval=2)
+
+        saved = [call[0][0] for call in match_event_service.repository.save_snapshot.call_args_list]
+        assert saved == [2, 4, 5]
+
+    def test_no_new_events_writes_no_snapshot(self, match_event_service):
+        match_event_service.repository.stream_events.return_value = iter([])
+
+        result = match_event_service.replay()
+
+        assert result["events_replayed"] == 0
+        match_event_service.repository.save_snapshot.assert_not_called()
@@ -1,8 +1,13 @@
+import asyncio
+import json
 from datetime import datetime, timedelta
+from typing import List
 from unittest.mock import AsyncMock, Mock
 
 import pytest
-from models import MatchCreate, MatchType
+from fastapi import HTTPException
+from models import Match, MatchCreate, MatchType
+from pydantic import TypeAdapter
 from services.match_service import MatchService
 
 
@@ -10,6 +15,7 @@ from services.match_service import MatchService
 def match_service():
     service = MatchService()
     service.repository = Mock()
+    service.rating_service = AsyncMock()
     return service
 
 
@@ -119,23 +125,100 @@ class TestMatchService:
         match_service.repository = AsyncMock()
         match_id = 1
         score = Mock(team1_goals=2, team2_goals=1)
-        match_service.repository.get_match_by_id.return_value = {"id": match_id}
-        match_service.repository.update_match_score.return_value = {
-            "id": match_id,
-            "team1_goals": 2,
-            "team2_goals": 1,
-            "result": "Team1",
-        }
+        previous = {"id": match_id, "status": "SCHEDULED", "team1_goals": None, "team2_goals": None}
+        updated = {"id": match_id, "team1_goals": 2, "team2_goals": 1, "result": "Team1"}
+        match_service.repository.update_match_score.return_value = (previous, updated)
 
         result = await match_service.update_match_score(match_id, score)
 
         assert result["result"] == "Team1"
         assert result["team1_goals"] == 2
-        match_service.repository.update_match_score.assert_called_once()
+        # The write itself is the existence check
+        match_service.repository.update_match_score.assert_called_once_with(match_id, 1, 2, 1, "Team1")
+        match_service.repository.get_matches_by_ids.assert_not_called()
+        match_service.rating_service.on_match_written.assert_called_once_with(previous, updated)
 
     async def test_update_match_score_not_found(self, match_service):
         match_service.repository = AsyncMock()
-        match_service.repository.get_match_by_id.return_value = None
+        match_service.repository.update_match_score.return_value = None
 
         with pytest.raises(ValueError, match="Match not found"):
-            await match_service.update_match_score(1, Mock())
+            await match_service.update_match_score(1, Mock(team1_goals=1, team2_goals=0))
+        match_service.rating_service.on_match_written.assert_not_called()
+
+    async def test_delete_match_not_found(self, match_service):
+        match_service.repository = AsyncMock()
+        match_service.repository.delete_match.return_value = None
+
+        with pytest.raises(ValueError, match="Match not found"):
+            await match_service.delete_match(1)
+        match_service.repository.delete_match.assert_called_once_with(1, 1)
+
+    async def test_get_match_by_id_not_found(self, match_service):
+        match_service.repository.get_matches_by_ids.return_value = []
+
+        with pytest.raises(HTTPException) as exc:
+            await match_service.get_match_by_id(5)
+        assert exc.value.status_code == 404
+
+    async def test_concurrent_lookups_share_one_query(self, match_service):
+        match_service.repository.get_matches_by_ids.return_value = [{"id": 1}, {"id": 2}]
+
+        first, second = await asyncio.gather(match_service.get_match_by_id(1), match_service.get_match_by_id(2))
+
+        assert (first["id"], second["id"]) == (1, 2)
+        match_service.repository.get_matches_by_ids.assert_called_once_with([1, 2], 1)
+
+    async def test_get_matches_by_ids_keeps_order_and_reports_missing(self, match_service):
+        rows = {
+            match_id: {
+                "id": match_id,
+                "round": "Round 1",
+                "match_type": "1v1",
+                "team1_player1_id": 1,
+                "team2_player1_id": 2,
+                "match_date": datetime(2024, 1, match_id),
+                "scheduled_date": datetime(2024, 1, match_id),
+                "status": "SCHEDULED",
+                "created_at": datetime(2024, 1, 1),
+                "updated_at": datetime(2024, 1, 1),
+            }
+            for match_id in (3, 7)
+        }
+        match_service.repository.get_matches_by_ids.return_value = list(rows.values())
+
+        payload = await match_service.get_matches_by_ids_json([7, 5, 3], ("id", "match_date"), tournament_id=2)
+
+        assert json.loads(payload) == {
+            "matches": [{"id": 7, "match_date": "2024-01-07T00:00:00"}, {"id": 3, "match_date": "2024-01-03T00:00:00"}],
+            "missing_ids": [5],
+        }
+        match_service.repository.get_matches_by_ids.assert_called_once_with([7, 5, 3], 2)
+
+    async def test_get_matches_json_matches_response_model(self, match_service):
+        match_service.repository = AsyncMock()
+        row = {
+            "id": 1,
+            "round": "Round 1",
+            "match_type": "1v1",
+            "team1_player1_id": 1,
+            "team1_player2_id": None,
+            "team2_player1_id": 2,
+            "team2_player2_id": None,
+            "match_date": datetime(2024, 1, 1, 18, 30),
+            "scheduled_date": datetime(2024, 1, 1, 18, 30),
+            "team1_goals": 2,
+            "team2_goals": 1,
+            "status": "COMPLETED",
+            "result": "Team1",
+            "created_at": datetime(2024, 1, 1, 12, 0, 0, 123456),
+            "updated_at": datetime(2024, 1, 1, 12, 0),
+            "team1_player1_name": "John Doe",
+        }
+        match_service.repository.get_matches.return_value = [row]
+
+        payload = await match_service.get_matches_json()
+        await match_service.get_matches_json()
+
+        assert payload == TypeAdapter(List[Match]).dump_json([Match(**row)])
+        match_service.repository.get_matches.assert_called_once()
@@ -1,3 +1,5 @@
+import threading
+import time
 from datetime import datetime
 from unittest.mock import Mock
 
@@ -5,28 +7,58 @@ import pytest
 from fastapi import HTTPException
 from services.overview_service import OverviewService
 
+from app.player_directory import PlayerDirectory
+
 
 @pytest.fixture
 def overview_service():
     service = OverviewService()
     service.repository = Mock()
+    service.directory = service.leaderboard_service.directory = PlayerDirectory(
+        lambda: {1: "Ann", 2: "Bob", 3: "Cat", 4: "Dan"}
+    )
+    service.leaderboard_service.repository = Mock()
+    service.format_service.repository = Mock()
+    service.format_service.repository.get_format_rounds.return_value = [
+        {
+            "format_id": 1,
+            "name": "default",
+            "round": "Round 1",
+            "phase": "League Phase",
+            "position": 1,
+            "expected_matches": 10,
+        },
+        {
+            "format_id": 1,
+            "name": "default",
+            "round": "Round 2",
+            "phase": "League Phase",
+            "position": 2,
+            "expected_matches": 15,
+        },
+        {
+            "format_id": 1,
+            "name": "default",
+            "round": "Knockout",
+            "phase": "Knockout Phase",
+            "position": 3,
+            "expected_matches": 4,
+        },
+    ]
+    service.leaderboard_service.repository.get_player_aggregates.return_value = []
     return service
 
 
 @pytest.fixture
 def sample_overview_data():
     return {
-        "progress": {
-            "matches_played": 10,
-            "total_expected_matches": 29,
-            "completion_percentage": 34.5,
-            "current_phase": "League Phase",
-        },
+        "progress": [{"round": "Round 1", "matches_played": 10}],
         "stats": {"total_matches": 10, "total_goals": 25, "avg_goals_per_match": 2.5},
-        "top_scorer": {"player_name": "John Doe", "goals_scored": 5, "matches_played": 10, "goals_per_game": 0.5},
         "latest_match": {
-            "team1_display_name": "Team A",
-            "team2_display_name": "Team B",
+            "team1_player1_id": 1,
+            "team1_player2_id": None,
+            "team2_player1_id": 2,
+            "team2_player2_id": None,
             "team1_goals": 3,
             "team2_goals": 2,
             "match_type": "1v1",
@@ -37,23 +69,21 @@ def sample_overview_data():
 class TestOverviewService:
     def test_get_overview_stats_success(self, overview_service, sample_overview_data):
         # Mock individual repository methods
-        overview_service.repository.get_tournament_progress.return_value = sample_overview_data["progress"]
+        overview_service.repository.get_completed_matches_by_round.return_value = sample_overview_data["progress"]
         overview_service.repository.get_basic_tournament_stats.return_value = sample_overview_data["stats"]
-        overview_service.repository.get_top_scorer.return_value = sample_overview_data["top_scorer"]
         overview_service.repository.get_latest_match.return_value = sample_overview_data["latest_match"]
         overview_service.repository.get_highest_scoring_match.return_value = None
         overview_service.repository.get_current_streak.return_value = None
-        overview_service.repository.get_best_defense.return_value = None
-        overview_service.repository.get_clean_sheets.return_value = None
 
         result = overview_service.get_overview_stats()
 
         assert result["progress"]["matchesPlayed"] == 10
         assert result["stats"]["totalMatches"] == 10
-        assert len(overview_service.repository.get_tournament_progress.call_args_list) == 1
+        assert result["progress"]["percentage"] == 34.5
+        assert len(overview_service.repository.get_completed_matches_by_round.call_args_list) == 1
 
     def test_get_overview_stats_repository_error(self, overview_service):
-        overview_service.repository.get_tournament_progress.side_effect = Exception("Database error")
+        overview_service.repository.get_completed_matches_by_round.side_effect = Exception("Database error")
 
         with pytest.raises(HTTPException) as exc:
             overview_service.get_overview_stats()
@@ -63,14 +93,11 @@ class TestOverviewService:
 
     def test_get_overview_stats_no_data(self, overview_service):
         # Mock all repository methods to return None
-        overview_service.repository.get_tournament_progress.return_value = None
+        overview_service.repository.get_completed_matches_by_round.return_value = []
         overview_service.repository.get_basic_tournament_stats.return_value = None
-        overview_service.repository.get_top_scorer.return_value = None
         overview_service.repository.get_latest_match.return_value = None
         overview_service.repository.get_highest_scoring_match.return_value = None
         overview_service.repository.get_current_streak.return_value = None
-        overview_service.repository.get_best_defense.return_value = None
-        overview_service.repository.get_clean_sheets.return_value = None
 
         result = overview_service.get_overview_stats()
 
@@ -79,53 +106,175 @@ class TestOverviewService:
         assert result["topScorer"] is None
 
     def test_get_tournament_progress_partial(self, overview_service):
-        overview_service.repository.get_tournament_progress.return_value = {
-            "matches_played": 15,
-            "total_expected_matches": 29,
-            "completion_percentage": 51.7,
-            "current_phase": "League Phase",
-        }
+        overview_service.repository.get_completed_matches_by_round.return_value = [
+            {"round": "Round 1", "matches_played": 10},
+            {"round": "Round 2", "matches_played": 5},
+        ]
 
         overview_service.repository.get_basic_tournament_stats.return_value = None
-        overview_service.repository.get_top_scorer.return_value = None
         overview_service.repository.get_latest_match.return_value = None
         overview_service.repository.get_highest_scoring_match.return_value = None
         overview_service.repository.get_current_streak.return_value = None
-        overview_service.repository.get_best_defense.return_value = None
-        overview_service.repository.get_clean_sheets.return_value = None
 
         result = overview_service.get_overview_stats()
 
         assert result["progress"]["matchesPlayed"] == 15
         assert result["progress"]["currentPhase"] == "League Phase"
+        assert result["progress"]["phaseTotalMatches"] == 25
+        assert [r["matchesPlayed"] for r in result["progress"]["rounds"]] == [10, 5, 0]
 
-    def test_get_top_scorer_zero_goals(self, overview_service):
-        overview_service.repository.get_tournament_progress.return_value = None
+    def test_get_tournament_progress_knockout_phase(self, overview_service):
+        overview_service.repository.get_completed_matches_by_round.return_value = [
+            {"round": "Round 1", "matches_played": 10},
+            {"round": "Round 2", "matches_played": 15},
+            {"round": "Knockout", "matches_played": 1},
+        ]
+        overview_service.repository.get_basic_tournament_stats.return_value = None
+        overview_service.repository.get_latest_match.return_value = None
+        overview_service.repository.get_highest_scoring_match.return_value = None
+        overview_service.repository.get_current_streak.return_value = None
+
+        result = overview_service.get_overview_stats()
+
+        assert result["progress"]["currentPhase"] == "Knockout Phase"
+        assert result["progress"]["phasePercentage"] == 25.0
+        assert result["progress"]["phaseTotalMatches"] == 29
+
+    def test_get_tournament_progress_ignores_rounds_outside_the_format(self, overview_service):
+        overview_service.repository.get_completed_matches_by_round.return_value = [
+            {"round": "Round 1", "matches_played": 12},
+            {"round": "Round 2", "matches_played": 15},
+            {"round": "Knockout", "matches_played": 4},
+            {"round": "Friendly", "matches_played": 7},
+        ]
+        overview_service.repository.get_basic_tournament_stats.return_value = None
+        overview_service.repository.get_latest_match.return_value = None
+        overview_service.repository.get_highest_scoring_match.return_value = None
+        overview_service.repository.get_current_streak.return_value = None
+
+        result = overview_service.get_overview_stats()
+
+        assert result["progress"]["matchesPlayed"] == 29
+        assert result["progress"]["percentage"] == 100.0
+        assert result["progress"]["phasePercentage"] == 100.0
+
+    def test_missing_format_is_a_404(self, overview_service):
+        overview_service.format_service.repository.get_format_rounds.return_value = []
+
+        with pytest.raises(HTTPException) as exc:
+            overview_service.get_overview_stats(7)
+
+        assert exc.value.status_code == 404
+
+    def test_format_change_drops_cached_overview(self, overview_service):
+        overview_service.repository.get_completed_matches_by_round.return_value = []
+        overview_service.repository.get_basic_tournament_stats.return_value = None
+        overview_service.repository.get_latest_match.return_value = None
+        overview_service.repository.get_highest_scoring_match.return_value = None
+        overview_service.repository.get_current_streak.return_value = None
+
+        overview_service.get_overview_stats()
+        overview_service.cache.handle_change({"table": "tournament_formats", "id": 1, "operation": "UPDATE"})
+        overview_service.get_overview_stats()
+
+        assert overview_service.format_service.repository.get_format_rounds.call_count == 2
+
+    def test_format_is_loaded_once(self, overview_service):
+        overview_service.repository.get_completed_matches_by_round.return_value = []
         overview_service.repository.get_basic_tournament_stats.return_value = None
-        overview_service.repository.get_top_scorer.return_value = {
-            "player_name": "New Player",
-            "goals_scored": 0,
-            "matches_played": 5,
-            "goals_per_game": 0,
-        }
         overview_service.repository.get_latest_match.return_value = None
         overview_service.repository.get_highest_scoring_match.return_value = None
         overview_service.repository.get_current_streak.return_value = None
-        overview_service.repository.get_best_defense.return_value = None
-        overview_service.repository.get_clean_sheets.return_value = None
+
+        overview_service.get_overview_stats()
+        overview_service.cache.invalidate("matches")
+        overview_service.get_overview_stats()
+
+        assert overview_service.repository.get_completed_matches_by_round.call_count == 2
+        overview_service.format_service.repository.get_format_rounds.assert_called_once_with(1)
+
+    def test_leaders_come_from_one_aggregate(self, overview_service):
+        overview_service.repository.get_completed_matches_by_round.return_value = []
+        overview_service.repository.get_basic_tournament_stats.return_value = None
+        overview_service.repository.get_latest_match.return_value = None
+        overview_service.repository.get_highest_scoring_match.return_value = None
+        overview_service.repository.get_current_streak.return_value = None
+        log = [
+            {
+                "match_id": i,
+                "match_date": "2024-01-0%d" % i,
+                "match_type": "1v1",
+                "goals_for": 2,
+                "goals_against": 0,
+                "opponent1_id": 2,
+                "opponent2_id": None,
+            }
+            for i in (3, 2, 1)
+        ]
+        overview_service.leaderboard_service.repository.get_player_aggregates.return_value = [
+            {
+                "player_id": 1,
+                "matches_played": 3,
+                "wins": 3,
+                "draws": 0,
+                "losses": 0,
+                "goals_scored": 6,
+                "goals_against": 0,
+                "clean_sheets": 3,
+                "match_log": log,
+            }
+        ]
 
         result = overview_service.get_overview_stats()
 
-        assert result["topScorer"]["name"] == "New Player"
-        assert result["topScorer"]["goals"] == 0
+        assert result["topScorer"]["name"] == "Ann"
+        assert result["topScorer"]["average"] == 2.0
+        assert result["topScorer"]["details"][0]["goals_scored"] == 2
+        assert result["topScorer"]["details"][0]["opponent"] == "Bob"
+        assert result["bestDefense"]["goalsAgainst"] == 0
+        assert result["cleanSheets"]["percentage"] == 100.0
+        assert len(result["cleanSheets"]["matches"]) == 3
+        overview_service.leaderboard_service.repository.get_player_aggregates.assert_called_once_with(1, None, None)
+
+    def test_concurrent_requests_share_one_computation(self, overview_service, sample_overview_data):
+        started = threading.Event()
+
+        def slow_progress(tournament_id):
+            started.set()
+            time.sleep(0.05)
+            return sample_overview_data["progress"]
+
+        overview_service.repository.get_completed_matches_by_round.side_effect = slow_progress
+        overview_service.repository.get_basic_tournament_stats.return_value = sample_overview_data["stats"]
+        overview_service.repository.get_latest_match.return_value = None
+        overview_service.repository.get_highest_scoring_match.return_value = None
+        overview_service.repository.get_current_streak.return_value = None
+        coalesced = overview_service.flight.metrics.get("singleflight_coalesced", "overview")
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(overview_service.get_overview_stats())) for _ in range(6)
+        ]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 6
+        assert all(result is results[0] for result in results)
+        assert overview_service.repository.get_completed_matches_by_round.call_count == 1
+        assert overview_service.flight.metrics.get("singleflight_coalesced", "overview") == coalesced + 5
 
     def test_get_latest_match_different_types(self, overview_service):
-        overview_service.repository.get_tournament_progress.return_value = None
+        overview_service.repository.get_completed_matches_by_round.return_value = []
         overview_service.repository.get_basic_tournament_stats.return_value = None
-        overview_service.repository.get_top_scorer.return_value = None
         overview_service.repository.get_latest_match.return_value = {
-            "team1_display_name": "Solo Player 1",
-            "team2_display_name": "Solo Player 2",
+            "team1_player1_id": 1,
+            "team1_player2_id": None,
+            "team2_player1_id": 2,
+            "team2_player2_id": None,
             "team1_goals": 3,
             "team2_goals": 2,
             "match_type": "1v1",
@@ -133,10 +282,31 @@ class TestOverviewService:
         }
         overview_service.repository.get_highest_scoring_match.return_value = None
         overview_service.repository.get_current_streak.return_value = None
-        overview_service.repository.get_best_defense.return_value = None
-        overview_service.repository.get_clean_sheets.return_value = None
 
         result = overview_service.get_overview_stats()
 
-        assert result["latestMatch"]["team1"] == "Solo Player 1"
+        assert result["latestMatch"]["team1"] == "Ann"
         assert result["latestMatch"]["matchType"] == "1v1"
+
+    def test_highest_scoring_2v2_names_both_players(self, overview_service):
+        overview_service.repository.get_completed_matches_by_round.return_value = []
+        overview_service.repository.get_basic_tournament_stats.return_value = None
+        overview_service.repository.get_latest_match.return_value = None
+        overview_service.repository.get_highest_scoring_match.return_value = {
+            "team1_player1_id": 1,
+            "team1_player2_id": 2,
+            "team2_player1_id": 3,
+            "team2_player2_id": 4,
+            "team1_goals": 5,
+            "team2_goals": 4,
+            "total_goals": 9,
+            "match_type": "2v2",
+            "match_date": datetime(2024, 1, 1),
+        }
+        overview_service.repository.get_current_streak.return_value = None
+
+        result = overview_service.get_overview_stats()
+
+        assert result["highestScoring"]["team1"] == "Ann & Bob"
+        assert result["highestScoring"]["team2"] == "Cat & Dan"
+        assert result["highestScoring"]["totalGoals"] == 9
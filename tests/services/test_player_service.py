@@ -1,15 +1,21 @@
+import json
 from unittest.mock import Mock
 
 import pytest
 from fastapi import HTTPException
-from models import PlayerCreate
+from models import Player, PlayerCreate
+from psycopg2.errors import UndefinedFunction
 from services.player_service import PlayerService
 
+from app.player_directory import PlayerDirectory
+
 
 @pytest.fixture
-def player_service():
+def player_service(monkeypatch):
+    monkeypatch.setattr(PlayerService, "trigram_search", True)
     service = PlayerService()
     service.repository = Mock()
+    service.directory = PlayerDirectory(lambda: {1: "John Doe", 2: "Jane Roe"})
     return service
 
 
@@ -108,3 +114,143 @@ class TestPlayerService:
             player_service.delete_player(1)
         assert exc.value.status_code == 500
         assert "Error deleting player" in str(exc.value.detail)
+
+    def test_get_all_players_is_cached_until_player_created(self, player_service, sample_player):
+        player_service.repository.get_all_players.return_value = [sample_player]
+        player_service.repository.create_player.return_value = {**sample_player, "player_id": 2}
+
+        player_service.get_all_players()
+        player_service.get_all_players()
+        player_service.create_player(PlayerCreate(player_name="Jane Doe"))
+        player_service.get_all_players()
+
+        assert player_service.repository.get_all_players.call_count == 2
+
+    def test_player_writes_reload_the_directory(self, player_service, sample_player):
+        loads = []
+        player_service.directory = PlayerDirectory(lambda: loads.append(1) or {1: "John Doe"})
+        player_service.repository.create_player.return_value = {**sample_player, "player_id": 2}
+        player_service.repository.delete_player.return_value = sample_player
+
+        player_service.directory.names()
+        player_service.create_player(PlayerCreate(player_name="Jane Roe"))
+        player_service.directory.names()
+        player_service.delete_player(1)
+        player_service.directory.names()
+
+        assert len(loads) == 3
+
+    def test_get_all_players_json_sparse_fields(self, player_service, sample_player):
+        player_service.repository.get_all_players.return_value = [
+            {"player_id": 1, "player_name": "John Doe"},
+        ]
+
+        payload = player_service.get_all_players_json(("player_id", "player_name", "wins"))
+
+        assert payload == b'[{"player_name":"John Doe","player_id":1,"wins":0}]'
+        player_service.repository.get_all_players.assert_called_once_with(("player_id", "player_name", "wins"), None)
+
+    def test_get_player_stats_success(self, player_service, sample_player):
+        player_service.repository.get_player_stats.return_value = [
+            {**sample_player, "matches_played": 3, "wins": 2, "losses": 1, "goals_scored": 5, "goal_difference": 2}
+        ]
+
+        result = player_service.get_player_stats(1)
+
+        assert result.matches_played == 3
+        assert result.wins == 2
+        assert result.goal_difference == 2
+        player_service.repository.get_player_stats.assert_called_once_with(1, 1)
+
+    def test_get_player_stats_not_found(self, player_service):
+        player_service.repository.get_player_stats.return_value = []
+
+        with pytest.raises(HTTPException) as exc:
+            player_service.get_player_stats(1)
+        assert exc.value.status_code == 404
+
+    def test_get_player_stats_loaded_across_a_match_change_is_not_cached(self, player_service, sample_player):
+        def load(tournament_id, player_id):
+            # A score update commits while the aggregate is running
+            player_service.cache.invalidate("matches", 7)
+            return [sample_player]
+
+        player_service.repository.get_player_stats.side_effect = load
+
+        player_service.get_player_stats(1)
+        player_service.get_player_stats(1)
+
+        assert player_service.repository.get_player_stats.call_count == 2
+
+    def test_get_all_players_json_with_stats_uses_single_query(self, player_service, sample_player):
+        player_service.repository.get_player_stats.return_value = [
+            {**sample_player, "wins": 4},
+            {**sample_player, "player_id": 2, "player_name": "Jane Doe", "wins": 1},
+        ]
+
+        payload = player_service.get_all_players_json(("player_id", "wins"), include_stats=True)
+
+        assert payload == b'[{"player_id":1,"wins":4},{"player_id":2,"wins":1}]'
+        player_service.repository.get_player_stats.assert_called_once_with(1)
+        player_service.repository.get_player_by_id.assert_not_called()
+
+    def test_get_players_by_ids_uses_cache_and_one_query(self, player_service, sample_player):
+        player_service.cache.set(("players", 2), Player(**{**sample_player, "player_id": 2, "player_name": "Jane"}))
+        player_service.repository.get_players_by_ids.return_value = [sample_player]
+
+        payload = player_service.get_players_by_ids_json([2, 9, 1], ("player_id", "player_name"))
+
+        assert json.loads(payload) == {
+            "players": [{"player_id": 2, "player_name": "Jane"}, {"player_id": 1, "player_name": "John Doe"}],
+            "missing_ids": [9],
+        }
+        player_service.repository.get_players_by_ids.assert_called_once_with([9, 1])
+
+    def test_get_players_by_ids_does_not_cache_players_changed_mid_query(self, player_service, sample_player):
+        def load(player_ids):
+            player_service.cache.invalidate("players", 1)
+            return [sample_player, {**sample_player, "player_id": 2, "player_name": "Jane"}]
+
+        player_service.repository.get_players_by_ids.side_effect = load
+
+        player_service.get_players_by_ids_json([1, 2])
+
+        assert player_service.cache.get(("players", 1)) is None
+        assert player_service.cache.get(("players", 2)).player_name == "Jane"
+
+    def test_search_players_uses_trigram_search(self, player_service):
+        player_service.repository.search_players.return_value = [{"player_id": 1, "player_name": "John Doe"}]
+
+        result = json.loads(player_service.search_players_json(" jon ", 5))
+
+        assert result == [{"player_id": 1, "player_name": "John Doe"}]
+        player_service.repository.search_players.assert_called_once_with("jon", 5)
+
+    def test_search_players_falls_back_when_pg_trgm_is_missing(self, player_service):
+        player_service.repository.search_players.side_effect = UndefinedFunction("operator does not exist")
+
+        assert player_service.search_players("ja", 5) == [{"player_id": 2, "player_name": "Jane Roe"}]
+        # Later searches go straight to the directory
+        assert player_service.search_players("jo", 5) == [{"player_id": 1, "player_name": "John Doe"}]
+        assert player_service.repository.search_players.call_count == 1
+        assert PlayerService.trigram_search is False
+
+    def test_search_players_error(self, player_service):
+        player_service.repository.search_players.side_effect = Exception("Database error")
+
+        with pytest.raises(HTTPException) as exc_info:
+            player_service.search_players("jo", 5)
+        assert exc_info.value.status_code == 500
+
+    def test_get_player_by_id_loaded_across_a_player_change_is_not_cached(self, player_service, sample_player):
+        def load(player_id):
+            # The player is renamed while the old row is being read
+            player_service.cache.invalidate("players", player_id)
+            return sample_player
+
+        player_service.repository.get_player_by_id.side_effect = load
+
+        player_service.get_player_by_id(1)
+        player_service.get_player_by_id(1)
+
+        assert player_service.repository.get_player_by_id.call_count == 2
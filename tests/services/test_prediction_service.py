@@ -0,0 +1,138 @@
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from app.player_directory import PlayerDirectory
+from app.services.prediction_service import (
+    PredictionService,
+    ScoringModel,
+    TournamentSimulator,
+    _pools,
+    run_simulation,
+    shutdown_pools,
+)
+
+
+def match(round_name, team1, team2, goals=None):
+    match_type = "2v2" if len(team1) == 2 else "1v1"
+    return {
+        "round": round_name,
+        "match_type": match_type,
+        "status": "SCHEDULED" if goals is None else "COMPLETED",
+        "team1_player1_id": team1[0],
+        "team1_player2_id": team1[1] if match_type == "2v2" else None,
+        "team2_player1_id": team2[0],
+        "team2_player2_id": team2[1] if match_type == "2v2" else None,
+        "team1_goals": goals[0] if goals else None,
+        "team2_goals": goals[1] if goals else None,
+    }
+
+
+@pytest.fixture
+def prediction_service():
+    service = PredictionService()
+    service.repository = Mock()
+    service.directory = PlayerDirectory(lambda: {1: "Ann", 2: "Bob", 3: "Cat", 4: "Dan"})
+    return service
+
+
+class TestTournamentSimulator:
+    def test_base_table_uses_standings_points_rules(self):
+        completed = [
+            match("Round 1", (1,), (2,), (2, 1)),
+            match("Round 1", (3,), (4,), (1, 1)),
+            match("Round 2", (1, 3), (2, 4), (0, 2)),
+            match("Final", (1,), (2,), (5, 0)),
+        ]
+
+        simulator = TournamentSimulator([1, 2, 3, 4], completed, [])
+
+        # Round 1: win 6, draw 2; Round 2: win 3; other rounds score nothing
+        assert simulator.base_points.tolist() == [6, 3, 2, 5]
+        assert simulator.base_goal_difference.tolist() == [-1, 1, -2, 2]
+
+    def test_no_remaining_fixtures_is_deterministic(self):
+        completed = [match("Round 1", (1,), (2,), (3, 0))]
+        simulator = TournamentSimulator([1, 2], completed, [])
+
+        counts, points = simulator.simulate(500, seed=1)
+
+        assert counts.tolist() == [[500, 0], [0, 500]]
+        assert points.tolist() == [3000, 0]
+
+    def test_counts_cover_every_position_once_per_iteration(self):
+        fixtures = [match("Round 1", (a,), (b,)) for a, b in [(1, 2), (1, 3), (2, 3)]]
+        simulator = TournamentSimulator([1, 2, 3], [], fixtures)
+
+        counts, _ = simulator.simulate(1000, seed=7)
+
+        assert counts.sum(axis=0).tolist() == [1000, 1000, 1000]
+        assert counts.sum(axis=1).tolist() == [1000, 1000, 1000]
+
+    def test_chunked_iterations_cover_every_iteration(self):
+        fixtures = [match("Round 1", (a,), (b,)) for a, b in [(1, 2), (1, 3), (2, 3)]]
+        simulator = TournamentSimulator([1, 2, 3], [], fixtures)
+
+        counts, points = simulator.simulate(1001, seed=7, chunk_size=100)
+        whole, _ = simulator.simulate(1001, seed=7, chunk_size=1001)
+
+        assert counts.sum(axis=0).tolist() == [1001, 1001, 1001]
+        assert points.sum() > 0
+        # Same distribution either way, only the draws differ
+        assert abs(counts - whole).max() < 150
+
+    def test_process_pool_splits_iterations(self):
+        fixtures = [match("Round 2", (1, 2), (3, 4))]
+        simulator = TournamentSimulator([1, 2, 3, 4], [], fixtures)
+
+        counts, _ = run_simulation(simulator, 1001, workers=2, seed=3)
+        again, _ = run_simulation(simulator, 1001, workers=2, seed=3)
+
+        assert counts.sum() == 1001 * 4
+        assert (again == counts).all()
+        # Both runs shared one pool
+        assert list(_pools) == [2]
+        shutdown_pools()
+        assert not _pools
+
+    def test_stronger_attack_expects_more_goals(self):
+        model = ScoringModel([match("Round 1", (1,), (2,), (4, 0)), match("Round 1", (1,), (2,), (3, 1))])
+
+        assert model.expected_goals((1,), (2,)) > model.mean_goals > model.expected_goals((2,), (1,))
+
+
+class TestPredictionService:
+    def test_get_predictions(self, prediction_service):
+        prediction_service.repository.get_simulation_source.return_value = [
+            match("Round 1", (1,), (2,), (5, 0)),
+            match("Round 1", (3,), (4,), (0, 0)),
+            match("Round 1", (1,), (3,)),
+            match("Round 1", (2,), (4,)),
+        ]
+
+        result = prediction_service.get_predictions(2000)
+
+        assert result["iterations"] == 2000
+        assert result["remaining_matches"] == 2
+        assert result["players"][0]["player_name"] == "Ann"
+        assert result["players"][0]["current_points"] == 6
+        assert sum(p["title_probability"] for p in result["players"]) == pytest.approx(1.0)
+        assert all(np.isclose(sum(p["position_probabilities"]), 1.0) for p in result["players"])
+
+    def test_results_are_cached(self, prediction_service):
+        prediction_service.repository.get_simulation_source.return_value = []
+
+        prediction_service.get_predictions(1000)
+        prediction_service.get_predictions(1000)
+
+        prediction_service.repository.get_simulation_source.assert_called_once()
+
+    def test_repository_error(self, prediction_service):
+        prediction_service.repository.get_simulation_source.side_effect = Exception("Database error")
+
+        with pytest.raises(HTTPException) as exc_info:
+            prediction_service.get_predictions(1000)
+
+        assert exc_info.value.status_code == 500
@@ -0,0 +1,163 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException
+
+from app.metrics import metrics
+from app.models import RatingType
+from app.services.rating_service import EloEngine, RatingService, team_key
+
+
+def make_match(match_id, match_type="1v1", goals=(1, 0), players=(1, None, 2, None), **overrides):
+    match = {
+        "id": match_id,
+        "match_date": datetime(2024, 1, match_id),
+        "match_type": match_type,
+        "team1_player1_id": players[0],
+        "team1_player2_id": players[1],
+        "team2_player1_id": players[2],
+        "team2_player2_id": players[3],
+        "team1_goals": goals[0],
+        "team2_goals": goals[1],
+        "status": "COMPLETED",
+    }
+    match.update(overrides)
+    return match
+
+
+@pytest.fixture
+def engine():
+    return EloEngine(k_factor=32, initial_rating=1500)
+
+
+@pytest.fixture
+def rating_service():
+    service = RatingService()
+    service.repository = Mock()
+    return service
+
+
+class TestEloEngine:
+    def test_equal_ratings_win_moves_half_k(self, engine):
+        ratings = {}
+
+        changes = engine.rate_match(make_match(1), ratings)
+
+        assert ratings[("player", "1")] == pytest.approx(1516)
+        assert ratings[("player", "2")] == pytest.approx(1484)
+        assert [(c[0], c[1]) for c in changes] == [("player", "1"), ("player", "2")]
+        assert changes[0][2] == 1500
+
+    def test_draw_between_equals_changes_nothing(self, engine):
+        ratings = {}
+
+        engine.rate_match(make_match(1, goals=(2, 2)), ratings)
+
+        assert ratings[("player", "1")] == pytest.approx(1500)
+        assert ratings[("player", "2")] == pytest.approx(1500)
+
+    def test_upset_moves_more_than_expected_win(self, engine):
+        ratings = {("player", "1"): 1400, ("player", "2"): 1600}
+
+        engine.rate_match(make_match(1), ratings)
+
+        assert ratings[("player", "1")] - 1400 > 16
+        assert ratings[("player", "1")] + ratings[("player", "2")] == pytest.approx(3000)
+
+    def test_2v2_rates_players_on_team_average_and_partnerships_separately(self, engine):
+        ratings = {("player", "1"): 1600, ("player", "2"): 1400}
+
+        changes = engine.rate_match(make_match(1, "2v2", (3, 1), (2, 1, 3, 4)), ratings)
+
+        # Team 1 averages 1500, same as team 2, so every player on it gains half of K
+        assert ratings[("player", "1")] == pytest.approx(1616)
+        assert ratings[("player", "2")] == pytest.approx(1416)
+        assert ratings[("player", "3")] == pytest.approx(1484)
+        assert ratings[("team", "1-2")] == pytest.approx(1516)
+        assert ratings[("team", "3-4")] == pytest.approx(1484)
+        assert len(changes) == 6
+
+    def test_team_key_ignores_slot_order(self):
+        assert team_key([4, 3]) == team_key([3, 4]) == "3-4"
+
+
+class TestRatingService:
+    @pytest.mark.asyncio
+    async def test_new_result_replays_from_itself(self, rating_service):
+        match = make_match(5)
+
+        await rating_service.on_match_written(None, match)
+
+        rating_service.repository.replay_from.assert_called_once_with(match["match_date"], 5, rating_service.engine)
+
+    @pytest.mark.asyncio
+    async def test_scheduled_match_is_not_rated(self, rating_service):
+        await rating_service.on_match_written(None, make_match(5, goals=(None, None), status="SCHEDULED"))
+
+        rating_service.repository.replay_from.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_edit_replays_from_earliest_position(self, rating_service):
+        before = make_match(3)
+        after = make_match(9, id=3)
+
+        await rating_service.on_match_written(before, after)
+
+        rating_service.repository.replay_from.assert_called_once_with(before["match_date"], 3, rating_service.engine)
+
+    @pytest.mark.asyncio
+    async def test_deleting_completed_match_replays_from_it(self, rating_service):
+        deleted = make_match(4)
+
+        await rating_service.on_match_written(deleted, None)
+
+        rating_service.repository.replay_from.assert_called_once_with(deleted["match_date"], 4, rating_service.engine)
+
+    @pytest.mark.asyncio
+    async def test_replay_failure_does_not_raise(self, rating_service):
+        rating_service.repository.replay_from.side_effect = Exception("db down")
+
+        before = metrics.get("rating_replay_failures")
+
+        await rating_service.on_match_written(None, make_match(1))
+
+        assert metrics.get("rating_replay_failures") == before + 1
+
+    def test_rebuild_replays_everything(self, rating_service):
+        rating_service.repository.replay_from.return_value = 12
+
+        assert rating_service.rebuild() == {"replayed": 12}
+        rating_service.repository.replay_from.assert_called_once_with(None, None, rating_service.engine)
+
+    def test_rebuild_failure_is_reported(self, rating_service):
+        rating_service.repository.replay_from.side_effect = Exception("db down")
+
+        with pytest.raises(HTTPException) as exc_info:
+            rating_service.rebuild()
+        assert exc_info.value.status_code == 500
+
+    def test_get_leaderboard(self, rating_service):
+        rating_service.repository.get_leaderboard.return_value = [
+            {
+                "entity_type": "player",
+                "entity_key": "1",
+                "player_ids": [1],
+                "name": "Ann",
+                "rating": 1516.0,
+                "matches_played": 1,
+            }
+        ]
+
+        ratings = rating_service.get_leaderboard(RatingType.PLAYER, 10)
+
+        assert ratings[0].name == "Ann"
+        rating_service.repository.get_leaderboard.assert_called_once_with("player", 10)
+
+    def test_get_history_not_found(self, rating_service):
+        rating_service.repository.get_history.return_value = []
+
+        with pytest.raises(HTTPException) as exc_info:
+            rating_service.get_history(RatingType.TEAM, "1-2")
+
+        assert exc_info.value.status_code == 404
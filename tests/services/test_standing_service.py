@@ -1,3 +1,5 @@
+import asyncio
+import time
 from unittest.mock import patch
 
 import pytest
@@ -80,6 +82,33 @@ async def test_get_standings_repository_error(standing_service):
         assert str(exc_info.value) == "Database error"
 
 
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_computation(standing_service, mock_repository_data):
+    round1_data, round2_data = mock_repository_data
+
+    executed = standing_service.flight.metrics.get("singleflight_executed", "standings")
+    coalesced = standing_service.flight.metrics.get("singleflight_coalesced", "standings")
+
+    def slow_round1(tournament_id):
+        # Blocks like the real query, until every other request is waiting on it
+        deadline = time.monotonic() + 5
+        while (
+            standing_service.flight.metrics.get("singleflight_coalesced", "standings") < coalesced + 19
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.005)
+        return round1_data
+
+    with patch.object(
+        standing_service.repository, "get_round1_standings", side_effect=slow_round1
+    ) as mock_round1, patch.object(standing_service.repository, "get_round2_standings", return_value=round2_data):
+        results = await asyncio.gather(*(standing_service.get_standings() for _ in range(20)))
+
+    assert mock_round1.call_count == 1
+    assert all(result is results[0] for result in results)
+    assert standing_service.flight.metrics.get("singleflight_executed", "standings") == executed + 1
+
+
 def test_calculate_tournament_standings(standing_service, mock_repository_data):
     round1_data, round2_data = mock_repository_data
 
@@ -0,0 +1,82 @@
+from unittest.mock import Mock
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.player_directory import PlayerDirectory
+from app.services.stats_service import StatsService
+
+
+@pytest.fixture
+def stats_service():
+    service = StatsService()
+    service.repository = Mock()
+    service.directory = PlayerDirectory(lambda: {1: "Ann", 2: "Bob", 3: "Cat", 4: "Dan"})
+    return service
+
+
+@pytest.fixture
+def source():
+    matches = [
+        ("1v1", 1, None, 2, None, 3, 1),
+        ("1v1", 2, None, 1, None, 2, 2),
+        ("1v1", 3, None, 1, None, 0, 1),
+        ("2v2", 1, 2, 3, 4, 1, 0),
+        ("2v2", 4, 3, 2, 1, 2, 2),
+    ]
+    return matches
+
+
+class TestStatsService:
+    def test_head_to_head_1v1_matrix(self, stats_service, source):
+        stats_service.repository.get_head_to_head_source.return_value = source
+
+        singles = stats_service.get_head_to_head()["1v1"]
+
+        assert singles["size"] == 3
+        assert [p["player_name"] for p in singles["players"]] == ["Ann", "Bob", "Cat"]
+        # Ann (row 0) vs Bob (col 1): two games, one win, one draw, 5 goals
+        assert singles["played"][0 * 3 + 1] == 2
+        assert singles["wins"][0 * 3 + 1] == 1
+        assert singles["draws"][0 * 3 + 1] == 1
+        assert singles["goals"][0 * 3 + 1] == 5
+        # Bob's losses to Ann are Ann's wins over Bob (the transposed cell)
+        assert singles["wins"][1 * 3 + 0] == 0
+        assert singles["goals"][1 * 3 + 0] == 3
+        assert singles["wins"][0 * 3 + 2] == 1
+        assert singles["played"][0] == 0
+
+    def test_head_to_head_partnerships_ignore_slot_order(self, stats_service, source):
+        stats_service.repository.get_head_to_head_source.return_value = source
+
+        doubles = stats_service.get_head_to_head()["2v2"]
+
+        assert doubles["size"] == 2
+        assert doubles["teams"] == [
+            {"player_ids": [1, 2], "name": "Ann & Bob"},
+            {"player_ids": [3, 4], "name": "Cat & Dan"},
+        ]
+        assert doubles["played"] == [0, 2, 2, 0]
+        assert doubles["wins"] == [0, 1, 0, 0]
+        assert doubles["draws"] == [0, 1, 1, 0]
+        assert doubles["goals"] == [0, 3, 2, 0]
+
+    def test_head_to_head_json_is_cached(self, stats_service, source):
+        stats_service.repository.get_head_to_head_source.return_value = source
+
+        first = stats_service.get_head_to_head_json()
+        second = stats_service.get_head_to_head_json()
+        stats_service.cache.invalidate("matches", 10)
+        stats_service.get_head_to_head_json()
+
+        assert first is second
+        assert orjson.loads(first)["1v1"]["size"] == 3
+        assert stats_service.repository.get_head_to_head_source.call_count == 2
+
+    def test_head_to_head_error(self, stats_service):
+        stats_service.repository.get_head_to_head_source.side_effect = Exception("Database error")
+
+        with pytest.raises(HTTPException) as exc:
+            stats_service.get_head_to_head_json()
+        assert exc.value.status_code == 500
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.admission import AdmissionControlMiddleware, ConcurrencyLimiter, TokenBucketLimiter
+from app.metrics import Metrics
+
+release_overview = threading.Event()
+
+
+def create_app(limiter, registry, rate_limiter=None):
+    app = FastAPI()
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        limiters={"/overview": limiter},
+        rate_limiter=rate_limiter,
+        retry_after=2,
+        registry=registry,
+    )
+
+    @app.get("/overview")
+    def overview():
+        release_overview.wait(5)
+        return {"ok": True}
+
+    @app.get("/players/{player_id}")
+    def player(player_id: int):
+        return {"player_id": player_id}
+
+    return app
+
+
+@pytest.fixture
+def registry():
+    return Metrics()
+
+
+@pytest.fixture(autouse=True)
+def reset_overview():
+    release_overview.clear()
+    yield
+    release_overview.set()
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_full_queue_sheds_with_retry_after(registry):
+    limiter = ConcurrencyLimiter("/overview", max_concurrent=1, max_queue=1, queue_timeout=5, registry=registry)
+    client = TestClient(create_app(limiter, registry))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        running = pool.submit(client.get, "/overview")
+        wait_until(lambda: limiter.active == 1)
+        queued = pool.submit(client.get, "/overview")
+        wait_until(lambda: limiter.queued == 1)
+
+        shed = client.get("/overview")
+        cheap = client.get("/players/7")
+        release_overview.set()
+
+        assert running.result().status_code == 200
+        assert queued.result().status_code == 200
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "2"
+    assert cheap.status_code == 200
+    assert registry.get("admission_shed", "/overview") == 1
+    assert registry.get("admission_queued", "/overview") == 1
+    assert limiter.active == 0
+
+
+def test_queued_request_is_shed_after_timeout(registry):
+    limiter = ConcurrencyLimiter("/overview", max_concurrent=1, max_queue=4, queue_timeout=0.05, registry=registry)
+    client = TestClient(create_app(limiter, registry))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        running = pool.submit(client.get, "/overview")
+        wait_until(lambda: limiter.active == 1)
+
+        timed_out = client.get("/overview")
+        release_overview.set()
+        assert running.result().status_code == 200
+
+    assert timed_out.status_code == 503
+    assert limiter.queued == 0
+    assert limiter.active == 0
+
+
+def test_rate_limited_client_gets_429(registry):
+    release_overview.set()
+    limiter = ConcurrencyLimiter("/overview", max_concurrent=4, max_queue=4, queue_timeout=1, registry=registry)
+    client = TestClient(create_app(limiter, registry, TokenBucketLimiter(rate=0.5, burst=2, max_clients=10)))
+
+    statuses = [client.get("/overview").status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+    assert registry.get("admission_rate_limited", "/overview") == 1
+    assert client.get("/players/1").status_code == 200
+
+
+class TestConcurrencyLimiter:
+    def test_release_hands_slot_to_oldest_waiter(self):
+        async def scenario():
+            limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=2, queue_timeout=1, registry=Metrics())
+            assert await limiter.acquire()
+            order = []
+
+            async def wait(name):
+                assert await limiter.acquire()
+                order.append(name)
+                limiter.release()
+
+            tasks = [asyncio.ensure_future(wait("first")), asyncio.ensure_future(wait("second"))]
+            await asyncio.sleep(0)
+            limiter.release()
+            await asyncio.gather(*tasks)
+            return order, limiter.active
+
+        assert asyncio.run(scenario()) == (["first", "second"], 0)
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        async def scenario():
+            limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queue=2, queue_timeout=1, registry=Metrics())
+            await limiter.acquire()
+            task = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            limiter.release()
+            return limiter.queued, limiter.active
+
+        assert asyncio.run(scenario()) == (0, 0)
+
+
+class TestTokenBucketLimiter:
+    def test_refills_over_time(self):
+        limiter = TokenBucketLimiter(rate=100, burst=1, max_clients=10)
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("a") > 0
+        time.sleep(0.02)
+        assert limiter.acquire("a") == 0
+
+    def test_clients_have_separate_buckets(self):
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=10)
+
+        assert limiter.acquire("a") == 0
+        assert limiter.acquire("b") == 0
+        assert limiter.acquire("a") > 0
@@ -0,0 +1,109 @@
+import pytest
+
+from app.cache import ResultCache
+
+
+@pytest.fixture
+def cache():
+    return ResultCache(ttl=60)
+
+
+def test_get_or_set_loads_once(cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return [1, 2, 3]
+
+    assert cache.get_or_set("key", loader) == [1, 2, 3]
+    assert cache.get_or_set("key", loader) == [1, 2, 3]
+    assert len(calls) == 1
+
+
+def test_row_change_only_drops_affected_entries(cache):
+    cache.set("standings", "table", tags=[("matches",)])
+    cache.set(("players", 1), "player 1", tags=[("players", 1)])
+    cache.set(("players", 2), "player 2", tags=[("players", 2)])
+
+    cache.invalidate("players", 1)
+
+    assert cache.get(("players", 1)) is None
+    assert cache.get(("players", 2)) == "player 2"
+    assert cache.get("standings") == "table"
+
+
+def test_row_change_drops_table_wide_entries(cache):
+    cache.set("players:all", ["player 1"], tags=[("players",)])
+
+    cache.invalidate("players", 5)
+
+    assert cache.get("players:all") is None
+
+
+def test_table_change_drops_row_entries(cache):
+    cache.set(("players", 1), "player 1", tags=[("players", 1)])
+    cache.set("standings", "table", tags=[("matches",)])
+
+    cache.handle_change({"table": "players", "id": None, "operation": "VERSION"})
+
+    assert cache.get(("players", 1)) is None
+    assert cache.get("standings") == "table"
+
+
+def test_resync_clears_everything(cache):
+    cache.set("standings", "table", tags=[("matches",)])
+
+    cache.handle_change({"table": "*", "id": None, "operation": "RESYNC"})
+
+    assert len(cache) == 0
+
+
+def test_expired_entries_are_reloaded():
+    cache = ResultCache(ttl=-1)
+    cache.set("key", "stale")
+
+    assert cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_async(cache):
+    async def loader():
+        return "value"
+
+    assert await cache.get_or_set_async("key", loader, tags=[("matches",)]) == "value"
+    cache.invalidate("matches", 3)
+    assert cache.get("key") is None
+
+
+def test_result_loaded_across_an_invalidation_is_not_stored(cache):
+    def loader():
+        # A write lands while the old rows are being read
+        cache.invalidate("players", 1)
+        return "stale"
+
+    assert cache.get_or_set(("players", 1), loader, tags=[("players", 1)]) == "stale"
+    assert cache.get(("players", 1)) is None
+
+    assert cache.get_or_set("players:all", lambda: cache.invalidate("players", 2) or "stale", [("players",)]) == "stale"
+    assert cache.get("players:all") is None
+
+
+def test_unrelated_invalidation_does_not_block_storing(cache):
+    def loader():
+        cache.invalidate("players", 2)
+        cache.invalidate("matches")
+        return "player 1"
+
+    cache.get_or_set(("players", 1), loader, tags=[("players", 1)])
+
+    assert cache.get(("players", 1)) == "player 1"
+
+
+@pytest.mark.asyncio
+async def test_get_or_set_async_skips_results_loaded_across_a_clear(cache):
+    async def loader():
+        cache.clear()
+        return "stale"
+
+    assert await cache.get_or_set_async("key", loader, tags=[("matches",)]) == "stale"
+    assert cache.get("key") is None
@@ -0,0 +1,85 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, accepted_encodings
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+LARGE_BODY = "x" * 1000
+
+
+@app.get("/large")
+async def large():
+    return PlainTextResponse(LARGE_BODY)
+
+
+@app.get("/small")
+async def small():
+    return PlainTextResponse("ok")
+
+
+@app.get("/stream")
+async def stream():
+    async def events():
+        yield b"data: 1\n\n"
+        yield b"data: 2\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def raw_get(client, path, accept_encoding):
+    # Use a stream so httpx hands back the body exactly as sent
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_brotli_preferred_when_accepted(client):
+    brotli = pytest.importorskip("brotli")
+    response, body = raw_get(client, "/large", "gzip, br")
+
+    assert response.headers["content-encoding"] == "br"
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert brotli.decompress(body).decode() == LARGE_BODY
+
+
+def test_gzip_fallback(client):
+    response, body = raw_get(client, "/large", "gzip")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(body)
+    assert gzip.decompress(body).decode() == LARGE_BODY
+
+
+def test_small_responses_are_not_compressed(client):
+    response, body = raw_get(client, "/small", "gzip, br")
+
+    assert "content-encoding" not in response.headers
+    assert body == b"ok"
+
+
+def test_event_streams_are_not_compressed(client):
+    response, body = raw_get(client, "/stream", "gzip, br")
+
+    assert "content-encoding" not in response.headers
+    assert body == b"data: 1\n\ndata: 2\n\n"
+
+
+def test_identity_when_nothing_accepted(client):
+    response, body = raw_get(client, "/large", "identity")
+
+    assert "content-encoding" not in response.headers
+    assert body.decode() == LARGE_BODY
+
+
+def test_accepted_encodings_skips_refused():
+    assert accepted_encodings("gzip;q=1.0, br;q=0, deflate") == ["gzip", "deflate"]
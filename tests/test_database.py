@@ -0,0 +1,66 @@
+from unittest.mock import Mock, patch
+
+import psycopg2
+import pytest
+
+from app.database import ReplicaRouter, primary_pinned
+
+
+@pytest.fixture
+def router():
+    router = ReplicaRouter(host="replica", max_lag=2, check_interval=60)
+    router._checkout = Mock(return_value="replica connection")
+    router._lag_within_limit = Mock(return_value=True)
+    return router
+
+
+@pytest.fixture
+def primary():
+    with patch("app.database.get_connection", return_value="primary connection") as get_connection:
+        yield get_connection
+
+
+def test_reads_go_to_replica(router, primary):
+    assert router.get_read_connection() == "replica connection"
+    assert router.get_read_connection() == "replica connection"
+    primary.assert_not_called()
+    # Lag is checked once per interval, not per query
+    router._lag_within_limit.assert_called_once()
+
+
+def test_without_replica_reads_go_to_primary(primary):
+    assert ReplicaRouter(host=None).get_read_connection() == "primary connection"
+
+
+def test_pinned_request_reads_from_primary(router, primary):
+    token = primary_pinned.set(True)
+    try:
+        assert router.get_read_connection() == "primary connection"
+    finally:
+        primary_pinned.reset(token)
+    router._checkout.assert_not_called()
+
+
+def test_lagging_replica_falls_back_to_primary(router, primary):
+    router._lag_within_limit.return_value = False
+
+    assert router.get_read_connection() == "primary connection"
+    router._checkout.assert_not_called()
+
+
+def test_recent_change_reads_from_primary(router, primary):
+    router.note_change({"table": "matches", "id": 1})
+
+    assert router.get_read_connection() == "primary connection"
+
+    router._recent_change_until = 0
+    assert router.get_read_connection() == "replica connection"
+
+
+def test_unreachable_replica_falls_back_until_next_check(router, primary):
+    router._checkout.side_effect = psycopg2.OperationalError("connection refused")
+
+    assert router.get_read_connection() == "primary connection"
+    assert router.get_read_connection() == "primary connection"
+    # Marked unusable after the first failure, so the second read does not try the replica again
+    assert router._checkout.call_count == 1
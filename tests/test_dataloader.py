@@ -0,0 +1,50 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.dataloader import DataLoader
+
+
+def test_loads_in_one_iteration_share_a_batch():
+    batch_fn = AsyncMock(return_value={1: "a", 2: "b"})
+    loader = DataLoader(batch_fn)
+
+    async def scenario():
+        return await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+
+    assert asyncio.run(scenario()) == ["a", "b", "a"]
+    batch_fn.assert_awaited_once_with([1, 2])
+
+
+def test_load_many_keeps_order_and_resolves_missing_to_none():
+    batch_fn = AsyncMock(return_value={3: "c", 1: "a"})
+    loader = DataLoader(batch_fn)
+
+    assert asyncio.run(loader.load_many([1, 2, 3])) == ["a", None, "c"]
+
+
+def test_sequential_loads_are_separate_batches():
+    batch_fn = AsyncMock(side_effect=[{1: "old"}, {1: "new"}])
+    loader = DataLoader(batch_fn)
+
+    async def scenario():
+        return await loader.load(1), await loader.load(1)
+
+    assert asyncio.run(scenario()) == ("old", "new")
+    assert batch_fn.await_count == 2
+
+
+def test_batch_error_reaches_every_caller():
+    loader = DataLoader(AsyncMock(side_effect=RuntimeError("database down")))
+
+    async def scenario():
+        return await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_load_outside_a_running_loop_fails():
+    with pytest.raises(RuntimeError):
+        DataLoader(AsyncMock())._enqueue(1)
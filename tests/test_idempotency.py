@@ -0,0 +1,179 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.idempotency import IdempotencyMiddleware, IdempotencyStore
+from app.metrics import Metrics
+
+calls = {"matches": 0, "score": 0, "failures": 0}
+
+
+def create_app(store, registry, **options):
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=store, registry=registry, **options)
+
+    @app.post("/matches")
+    def create_match(payload: dict):
+        calls["matches"] += 1
+        time.sleep(payload.get("delay", 0))
+        return {"id": calls["matches"], **payload}
+
+    @app.put("/matches/{match_id}/score")
+    async def update_score(match_id: int):
+        calls["score"] += 1
+        if calls["score"] == 1:
+            raise HTTPException(status_code=503, detail="unavailable")
+        return {"id": match_id}
+
+    @app.post("/other")
+    async def other():
+        calls["matches"] += 1
+        return {"id": calls["matches"]}
+
+    return app
+
+
+@pytest.fixture
+def registry():
+    return Metrics()
+
+
+@pytest.fixture
+def client(registry):
+    for name in calls:
+        calls[name] = 0
+    return TestClient(create_app(IdempotencyStore(ttl=60, max_keys=100), registry))
+
+
+def test_retry_replays_stored_response(client, registry):
+    first = client.post("/matches", json={"round": "Round 1"}, headers={"Idempotency-Key": "a"})
+    retry = client.post("/matches", json={"round": "Round 1"}, headers={"Idempotency-Key": "a"})
+
+    assert retry.status_code == first.status_code == 200
+    assert retry.json() == first.json() == {"id": 1, "round": "Round 1"}
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert calls["matches"] == 1
+    assert registry.get("idempotency", "replayed") == 1
+
+
+def test_requests_without_key_are_not_deduplicated(client):
+    client.post("/matches", json={})
+    client.post("/matches", json={})
+
+    assert calls["matches"] == 2
+
+
+def test_other_routes_ignore_the_key(client):
+    client.post("/other", headers={"Idempotency-Key": "a"})
+    client.post("/other", headers={"Idempotency-Key": "a"})
+
+    assert calls["matches"] == 2
+
+
+def test_key_reused_with_different_body_is_rejected(client):
+    client.post("/matches", json={"round": "Round 1"}, headers={"Idempotency-Key": "a"})
+
+    response = client.post("/matches", json={"round": "Round 2"}, headers={"Idempotency-Key": "a"})
+
+    assert response.status_code == 422
+    assert calls["matches"] == 1
+
+
+def test_server_errors_are_not_stored(client):
+    first = client.put("/matches/3/score", headers={"Idempotency-Key": "s"})
+    retry = client.put("/matches/3/score", headers={"Idempotency-Key": "s"})
+
+    assert first.status_code == 503
+    assert retry.status_code == 200
+    assert "idempotent-replayed" not in retry.headers
+    assert calls["score"] == 2
+
+
+def test_concurrent_duplicates_write_once(client, registry):
+    def post():
+        return client.post("/matches", json={"delay": 0.2}, headers={"Idempotency-Key": "c"})
+
+    # One event loop for every request, as in a server worker
+    with client, ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: post(), range(4)))
+
+    assert calls["matches"] == 1
+    assert {response.json()["id"] for response in responses} == {1}
+    assert registry.get("idempotency", "waited") + registry.get("idempotency", "replayed") >= 3
+
+
+def test_duplicate_waits_are_bounded(registry):
+    for name in calls:
+        calls[name] = 0
+    client = TestClient(create_app(IdempotencyStore(ttl=60, max_keys=100), registry, wait_timeout=0.05))
+
+    def post():
+        return client.post("/matches", json={"delay": 0.5}, headers={"Idempotency-Key": "w"})
+
+    with client, ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(post)
+        time.sleep(0.1)
+        duplicate = pool.submit(post).result()
+
+    assert duplicate.status_code == 409
+    assert first.result().status_code == 200
+    assert calls["matches"] == 1
+    assert registry.get("idempotency", "wait_timeout") == 1
+
+
+def test_overlong_key_is_rejected(client):
+    response = client.post("/matches", json={}, headers={"Idempotency-Key": "k" * 256})
+
+    assert response.status_code == 400
+    assert calls["matches"] == 0
+
+
+class TestIdempotencyStore:
+    def test_expired_keys_are_evicted(self):
+        store = IdempotencyStore(ttl=0.01, max_keys=10)
+        entry, _ = store.begin("a", "f")
+        store.complete("a", entry, (200, [], b"{}"))
+
+        time.sleep(0.02)
+
+        assert store.begin("a", "f")[1] is True
+
+    def test_oldest_keys_are_evicted_beyond_max_keys(self):
+        store = IdempotencyStore(ttl=60, max_keys=2)
+        for key in ("a", "b", "c"):
+            entry, _ = store.begin(key, "f")
+            store.complete(key, entry, (200, [], b"{}"))
+
+        assert len(store) == 2
+        assert store.begin("a", "f")[1] is True
+
+    def test_in_flight_keys_are_not_evicted(self):
+        store = IdempotencyStore(ttl=60, max_keys=2)
+        store.begin("a", "f")
+        entry, _ = store.begin("b", "f")
+        store.complete("b", entry, (200, [], b"{}"))
+
+        store.begin("c", "f")
+        store.begin("d", "f")
+
+        # "b" was the only completed key; "a" is still running, so a duplicate of it must wait, not run
+        assert store.begin("a", "f")[1] is False
+        assert store.begin("b", "f")[1] is True
+        assert len(store) == 4
+
+    def test_only_one_concurrent_caller_owns_a_key(self):
+        store = IdempotencyStore(ttl=60, max_keys=10)
+        barrier = threading.Barrier(8)
+
+        def begin():
+            barrier.wait()
+            return store.begin("a", "f")[1]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            owners = list(pool.map(lambda _: begin(), range(8)))
+
+        assert owners.count(True) == 1
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock, Mock, patch
+
+from app.notifications import RESYNC_CHANGE, ChangeListener, VersionPoller, create_change_feed
+
+
+def mock_connection(rows):
+    conn = MagicMock()
+    conn.cursor.return_value.fetchall.return_value = rows
+    return conn
+
+
+def test_listener_dispatches_parsed_payload():
+    listener = ChangeListener()
+    handler = Mock()
+    listener.subscribe(handler)
+
+    listener.dispatch_payload('{"table": "matches", "id": 3, "operation": "UPDATE"}')
+
+    handler.assert_called_once_with({"table": "matches", "id": 3, "operation": "UPDATE"})
+
+
+def test_listener_ignores_malformed_payload():
+    listener = ChangeListener()
+    handler = Mock()
+    listener.subscribe(handler)
+
+    listener.dispatch_payload("not json")
+
+    handler.assert_not_called()
+
+
+def test_failing_handler_does_not_block_others():
+    listener = ChangeListener()
+    listener.subscribe(Mock(side_effect=RuntimeError("boom")))
+    handler = Mock()
+    listener.subscribe(handler)
+
+    listener.dispatch({"table": "players", "id": 1, "operation": "DELETE"})
+
+    handler.assert_called_once()
+
+
+def test_poller_dispatches_changed_tables_only():
+    poller = VersionPoller()
+    handler = Mock()
+    poller.subscribe(handler)
+
+    with patch("app.notifications.get_connection") as get_connection:
+        get_connection.return_value = mock_connection([("matches", 1), ("players", 1)])
+        poller.poll()
+        get_connection.return_value = mock_connection([("matches", 2), ("players", 1)])
+        poller.poll()
+
+    handler.assert_called_once_with({"table": "matches", "id": None, "operation": "VERSION"})
+
+
+def test_poller_resyncs_after_failure():
+    poller = VersionPoller()
+    handler = Mock()
+    poller.subscribe(handler)
+    poller.versions = {"matches": 1}
+    poller._resync = True
+
+    with patch("app.notifications.get_connection", return_value=mock_connection([("matches", 1)])):
+        poller.poll()
+
+    handler.assert_called_once_with(RESYNC_CHANGE)
+
+
+def test_create_change_feed_modes():
+    assert isinstance(create_change_feed("listen"), ChangeListener)
+    assert isinstance(create_change_feed("poll"), VersionPoller)
+    assert create_change_feed("off") is None
@@ -0,0 +1,79 @@
+from unittest.mock import Mock
+
+from app.player_directory import PlayerDirectory
+
+
+def test_names_are_loaded_once():
+    loader = Mock(return_value={1: "Ann", 2: "Bob"})
+    directory = PlayerDirectory(loader)
+
+    assert directory.get(1) == "Ann"
+    assert directory.get(2) == "Bob"
+    loader.assert_called_once()
+
+
+def test_unknown_id_reloads_once():
+    loader = Mock(side_effect=[{1: "Ann"}, {1: "Ann", 2: "Bob"}])
+    directory = PlayerDirectory(loader)
+    directory.get(1)
+
+    assert directory.get(2) == "Bob"
+    assert loader.call_count == 2
+
+
+def test_team_name():
+    directory = PlayerDirectory(lambda: {1: "Ann", 2: "Bob"})
+
+    assert directory.team_name((1, None)) == "Ann"
+    assert directory.team_name((1, 2)) == "Ann & Bob"
+    assert directory.team_name((None, None)) is None
+
+
+def test_with_names_fills_every_slot():
+    directory = PlayerDirectory(lambda: {1: "Ann", 2: "Bob", 3: "Cat", 4: "Dan"})
+
+    row = directory.with_names(
+        {"id": 7, "team1_player1_id": 1, "team1_player2_id": 2, "team2_player1_id": 3, "team2_player2_id": 4}
+    )
+
+    assert row["id"] == 7
+    assert row["team1_player2_name"] == "Bob"
+    assert row["team1_display_name"] == "Ann & Bob"
+    assert row["team2_display_name"] == "Cat & Dan"
+
+
+def test_players_change_invalidates():
+    loader = Mock(return_value={1: "Ann"})
+    directory = PlayerDirectory(loader)
+    directory.get(1)
+
+    directory.handle_change({"table": "matches", "id": 3})
+    directory.get(1)
+    assert loader.call_count == 1
+
+    directory.handle_change({"table": "players", "id": 1})
+    directory.get(1)
+    assert loader.call_count == 2
+
+
+def test_search_ranks_name_prefix_before_word_prefix():
+    directory = PlayerDirectory(lambda: {1: "Sam Smith", 2: "Anna Samuels", 3: "samir", 4: "Bob"})
+
+    assert directory.search("sam", 10) == [
+        {"player_id": 1, "player_name": "Sam Smith"},
+        {"player_id": 3, "player_name": "samir"},
+        {"player_id": 2, "player_name": "Anna Samuels"},
+    ]
+    assert directory.search("SAM  sm", 10) == [{"player_id": 1, "player_name": "Sam Smith"}]
+    assert directory.search("sam", 1) == [{"player_id": 1, "player_name": "Sam Smith"}]
+    assert directory.search("zed", 10) == []
+
+
+def test_search_index_follows_reloads():
+    loader = Mock(side_effect=[{1: "Ann"}, {1: "Ann", 2: "Annie"}])
+    directory = PlayerDirectory(loader)
+    assert [player["player_id"] for player in directory.search("ann", 10)] == [1]
+
+    directory.invalidate()
+
+    assert [player["player_id"] for player in directory.search("ann", 10)] == [1, 2]
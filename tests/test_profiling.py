@@ -0,0 +1,100 @@
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.metrics import Metrics
+from app.profiling import ProfileStore, ProfilingMiddleware
+
+pytest.importorskip("pyinstrument")
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def create_app(store, registry, **options):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, store=store, registry=registry, interval=0.0001, **options)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"item_id": item_id, "total": busy(50_000)}
+
+    return app
+
+
+@pytest.fixture
+def store():
+    return ProfileStore()
+
+
+@pytest.fixture
+def registry():
+    return Metrics()
+
+
+def test_unflagged_requests_are_not_profiled(store, registry):
+    client = TestClient(create_app(store, registry))
+
+    response = client.get("/items/1", params={"profile": "0"})
+
+    assert response.json()["item_id"] == 1
+    assert store.summary() == {}
+    assert registry.snapshot() == {}
+
+
+@pytest.mark.parametrize("request_options", [{"headers": {"X-Profile": "1"}}, {"params": {"profile": "1"}}])
+def test_flagged_request_returns_speedscope_profile(store, registry, request_options):
+    client = TestClient(create_app(store, registry))
+
+    response = client.get("/items/1", **request_options)
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    profile = response.json()
+    assert profile["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    assert any(frame["name"] == "busy" for frame in profile["shared"]["frames"])
+    assert store.summary()["GET /items/{item_id}"]["requests"] == 1
+    assert registry.get("profiled_requests", "GET /items/{item_id}") == 1
+
+
+def test_flagged_request_with_output_dir_stores_profile(store, registry, tmp_path):
+    client = TestClient(create_app(store, registry, output_dir=str(tmp_path)))
+
+    response = client.get("/items/3", headers={"X-Profile": "1"})
+
+    assert response.json()["item_id"] == 3
+    profile_file = response.headers["x-profile-file"]
+    assert os.path.dirname(profile_file) == str(tmp_path)
+    with open(profile_file) as f:
+        assert "busy" in json.dumps(json.load(f)["shared"])
+
+
+def test_sampled_requests_are_aggregated_per_route(store, registry):
+    client = TestClient(create_app(store, registry, sample_rate=1.0))
+
+    for item_id in (1, 2, 3):
+        assert client.get(f"/items/{item_id}").json()["item_id"] == item_id
+
+    summary = store.summary()
+    assert list(summary) == ["GET /items/{item_id}"]
+    assert summary["GET /items/{item_id}"]["requests"] == 3
+    assert summary["GET /items/{item_id}"]["samples"] > 0
+    assert b"busy" in store.speedscope("GET /items/{item_id}")
+    assert store.speedscope("GET /missing") is None
+
+
+def test_only_recent_sessions_are_kept_per_route(registry):
+    store = ProfileStore(max_sessions=2)
+    client = TestClient(create_app(store, registry, sample_rate=1.0))
+
+    for item_id in range(5):
+        client.get(f"/items/{item_id}")
+
+    summary = store.summary()["GET /items/{item_id}"]
+    assert summary["requests"] == 5
+    assert summary["profiled"] == 2
+    assert b"busy" in store.speedscope("GET /items/{item_id}")
@@ -0,0 +1,84 @@
+import time
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.database import primary_pinned
+from app.read_your_writes import PIN_COOKIE, PIN_HEADER, PrimaryPinningMiddleware
+
+app = FastAPI()
+app.add_middleware(PrimaryPinningMiddleware, pin_seconds=5)
+
+
+@app.get("/read")
+async def read():
+    return {"pinned": primary_pinned.get()}
+
+
+@app.get("/read-sync")
+def read_sync():
+    return {"pinned": primary_pinned.get()}
+
+
+@app.post("/write")
+async def write():
+    return {"pinned": primary_pinned.get()}
+
+
+@app.post("/failed-write")
+async def failed_write():
+    raise HTTPException(status_code=400, detail="invalid")
+
+
+def test_reads_are_not_pinned_by_default():
+    client = TestClient(app)
+
+    assert client.get("/read").json() == {"pinned": False}
+    assert client.get("/read-sync").json() == {"pinned": False}
+
+
+def test_write_pins_the_client_to_the_primary():
+    # The cookie is Secure, so it only comes back over https
+    client = TestClient(app, base_url="https://testserver")
+
+    response = client.post("/write")
+
+    assert response.json() == {"pinned": True}
+    assert int(response.cookies[PIN_COOKIE]) > time.time()
+    assert client.get("/read").json() == {"pinned": True}
+    assert client.get("/read-sync").json() == {"pinned": True}
+
+
+def test_pin_cookie_is_sent_cross_site():
+    cookie = TestClient(app).post("/write").headers["set-cookie"]
+
+    assert "SameSite=None" in cookie
+    assert "Secure" in cookie
+
+
+def test_pin_header_is_honoured_without_the_cookie():
+    response = TestClient(app).post("/write")
+    client = TestClient(app)
+
+    assert client.get("/read").json() == {"pinned": False}
+    assert client.get("/read", headers={PIN_HEADER: response.headers[PIN_HEADER]}).json() == {"pinned": True}
+    assert client.get("/read", headers={PIN_HEADER: str(int(time.time()) - 1)}).json() == {"pinned": False}
+
+
+def test_expired_or_invalid_pin_is_ignored():
+    client = TestClient(app)
+
+    client.cookies.set(PIN_COOKIE, str(int(time.time()) - 1))
+    assert client.get("/read").json() == {"pinned": False}
+    client.cookies.set(PIN_COOKIE, "soon")
+    assert client.get("/read").json() == {"pinned": False}
+
+
+def test_failed_write_does_not_pin():
+    client = TestClient(app)
+
+    response = client.post("/failed-write")
+
+    assert response.status_code == 400
+    assert PIN_COOKIE not in response.cookies
+    assert PIN_HEADER not in response.headers
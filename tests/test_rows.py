@@ -0,0 +1,64 @@
+import pickle
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import Player
+from app.rows import row_class
+from app.serialization import RowEncoder
+
+COLUMNS = ("player_id", "player_name", "created_at", "updated_at")
+VALUES = (1, "John Doe", datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+
+def make_row(columns=COLUMNS, values=VALUES):
+    return row_class(columns)(values)
+
+
+def test_row_behaves_like_a_dict():
+    row = make_row()
+
+    assert row["player_name"] == "John Doe"
+    assert row.get("missing", 0) == 0
+    assert "player_id" in row
+    assert list(row) == list(COLUMNS)
+    assert dict(row) == dict(zip(COLUMNS, VALUES))
+    assert row == dict(zip(COLUMNS, VALUES))
+    assert {**row, "position": 1}["position"] == 1
+
+
+def test_row_class_is_shared_per_shape():
+    assert type(make_row()) is type(make_row())
+    assert type(make_row()) is not type(make_row(("player_id",), (1,)))
+
+
+def test_rows_have_no_instance_dict():
+    assert not hasattr(make_row(), "__dict__")
+
+
+def test_duplicate_columns_resolve_to_last():
+    row = make_row(("id", "match_date", "match_date"), (1, "first", "second"))
+
+    assert row["match_date"] == "second"
+    assert len(row) == 2
+
+
+def test_missing_key_raises_key_error():
+    try:
+        make_row()["missing"]
+    except KeyError as e:
+        assert e.args == ("missing",)
+    else:
+        raise AssertionError("expected KeyError")
+
+
+def test_row_feeds_models_and_encoders():
+    row = make_row()
+
+    assert Player(**row).player_name == "John Doe"
+    assert jsonable_encoder([row])[0]["player_name"] == "John Doe"
+    assert b'"player_name":"John Doe"' in RowEncoder(Player).encode([row])
+
+
+def test_row_pickles_as_dict():
+    assert pickle.loads(pickle.dumps(make_row())) == dict(zip(COLUMNS, VALUES))
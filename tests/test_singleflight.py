@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from app.metrics import Metrics
+from app.singleflight import SingleFlight
+
+
+@pytest.fixture
+def flight():
+    return SingleFlight("test", Metrics())
+
+
+def test_concurrent_threads_share_one_call(flight):
+    calls = []
+    started = threading.Event()
+
+    def loader():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {"rows": 3}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", loader))) for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"rows": 3}] * 8
+    assert all(result is results[0] for result in results)
+    assert flight.metrics.get("singleflight_executed", "test") == 1
+    assert flight.metrics.get("singleflight_coalesced", "test") == 7
+
+
+def test_exception_reaches_every_waiter_and_is_not_kept(flight):
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("database down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["database down"] * 3
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_sequential_calls_each_execute(flight):
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.metrics.get("singleflight_coalesced", "test") == 0